@@ -3,11 +3,15 @@ __version__ = "0.11.5"
 import logging
 from typing import TYPE_CHECKING
 
-from .classifiers import ClassifyFooter, ClassifyMain
+from .blobs import BlobStore
+from .classifiers import ClassificationCache, ClassifyFooter, ClassifyMain
 from .extractors import Extractor
+from .extractors.extra_features import register_feature, unregister_feature
 from .extractors.extractor_serp_features import FeatureExtractor
 from .locations import download_locations, update_locations_file
-from .parsers.parse_serp import parse_serp
+from .parsers.budget import ParseTimeout
+from .parsers.cache import ParseCache
+from .parsers.parse_serp import classify_serp, parse_serp, parse_serps
 from .utils import load_html, load_soup, make_soup
 
 # Own only the package logger: the NullHandler keeps unconfigured (parse-only) use
@@ -18,13 +22,21 @@ if TYPE_CHECKING:
     from .searchers import SearchEngine
 
 __all__ = [
+    "BlobStore",
+    "ClassificationCache",
     "ClassifyFooter",
     "ClassifyMain",
     "Extractor",
     "FeatureExtractor",
+    "ParseCache",
+    "ParseTimeout",
     "download_locations",
     "update_locations_file",
+    "classify_serp",
     "parse_serp",
+    "parse_serps",
+    "register_feature",
+    "unregister_feature",
     "SearchEngine",
     "load_html",
     "load_soup",
@@ -0,0 +1,173 @@
+"""Per-document index built from the extractor's single pre-order walk.
+
+Several pipeline stages used to walk the tree on their own: the extractor's
+position map (``soup.css('*')``), the classifier's per-component signal scan
+(``cmpt.css('*')``), ``is_hidden``'s ancestor climb per parsed item, and the AI
+overview's ancestor-path sort key. ``DocumentIndex`` keeps the one document walk
+the extractor already does and answers all four from it:
+
+- ``position`` / ``span`` -- pre-order start and subtree end (reorder, sorting).
+- ``subtree`` -- a component's elements as a slice of the walk, replacing a
+  fresh ``cmpt.css('*')`` (the classifier's signal sets are built from it).
+- ``is_hidden`` -- inline ``display:none`` subtrees, collected once as ranges.
+
+The walk is taken *before* extraction (ad positions must be snapshotted before
+the ads are pulled out), and extraction then detaches subtrees -- the ads
+containers and the RHS column. Plan 044 found that a stale pre-extraction slice
+bleeds detached RHS classes into the main components it used to sit under, so
+extraction detaches through ``DocumentIndex.detach``, which records the
+detached range: ``subtree`` skips detached ranges nested under the queried
+root, and ``is_hidden`` ignores a hidden ancestor cut off by a detach. With
+those two rules every answer matches a fresh walk of the post-extraction tree
+by construction (detaching never reorders the surviving elements).
+
+Positions are keyed by ``mem_id``, and selectolax reuses the ``mem_id`` of a
+freed node. Parse-time mutations of the parsed document only destroy or
+detach nodes (``general`` and ``ai_overview`` decompose, ``DocumentIndex.detach``
+removes): that never changes the ancestry or relative order of survivors, and
+it never allocates a node that could take a freed node's key, so positions and
+hidden ranges stay valid for the whole parse. New nodes are only created in
+other documents -- ``notices`` reparses a node into its own tree
+(``_slx.reparse_fragment``) and edits that copy -- and a node from another
+document can hold a stale key, so every lookup first checks that the node
+belongs to the indexed document. The element list itself is dropped
+(``release``) once classification is done, so the index never touches a node a
+parser destroyed. Nodes the index doesn't know (another document, a call
+outside ``parse_serp``) get ``None`` back and callers fall back to walking the
+tree.
+
+The index belongs to the parse's ``ParseContext`` (``_parse_context``), which
+is how the classifiers and parsers reach it.
+"""
+
+from __future__ import annotations
+
+import bisect
+
+from selectolax.lexbor import LexborNode as Node
+
+
+def last_descendant(elem: Node) -> Node:
+    """The last element of ``elem.css('*')`` (self + descendants, pre-order)
+    without materializing the whole subtree.
+
+    The last node a pre-order walk visits is reached by repeatedly descending to
+    the last *element* child (selectolax pseudo-nodes -- text/comment -- carry a
+    ``-``-prefixed or empty tag and are excluded from ``css('*')``, so they are
+    skipped here too). Returns ``elem`` itself when it has no element children,
+    matching ``elem.css('*')[-1]`` for a leaf.
+    """
+    node = elem
+    while True:
+        last: Node | None = None
+        for ch in node.iter(include_text=False):
+            if ch.tag and not ch.tag.startswith("-"):
+                last = ch
+        if last is None:
+            return node
+        node = last
+
+
+def hides(node: Node) -> bool:
+    """True if ``node``'s own inline ``style`` contains ``display:none``
+    (whitespace-tolerant)."""
+    style = (node.attributes.get("style") or "").lower().replace(" ", "")
+    return "display:none" in style
+
+
+class DocumentIndex:
+    """Positions, subtree slices, and hidden ranges from one document walk."""
+
+    def __init__(self, soup: Node | None = None) -> None:
+        self.elements: list[Node] | None = None
+        self.positions: dict[int, int] = {}
+        self.parser = None
+        self.detached: list[tuple[int, int]] = []
+        self.hidden: list[tuple[int, int]] = []
+        self._hidden_starts: list[int] = []
+        if soup is not None:
+            self.build(soup)
+
+    def build(self, soup: Node) -> None:
+        """Walk ``soup`` once (pre-order) and index it."""
+        elements = soup.css("*")
+        self.elements = elements
+        self.parser = soup.parser
+        self.positions = positions = {el.mem_id: i for i, el in enumerate(elements)}
+        self.detached = []
+        # ``[style]`` narrows the hidden scan to styled elements in C; the few
+        # that hide get their subtree range via the right-spine descent.
+        self.hidden = [
+            (positions[el.mem_id], positions[last_descendant(el).mem_id])
+            for el in soup.css("[style]")
+            if hides(el)
+        ]
+        self._hidden_starts = [start for start, _ in self.hidden]
+
+    def release(self) -> None:
+        """Drop the element list; positions and hidden ranges stay usable."""
+        self.elements = None
+
+    def position(self, node: Node) -> int | None:
+        """Pre-order position of ``node`` in the indexed walk, or None (also
+        for a node of another document, whose ``mem_id`` may be a stale key)."""
+        if node.parser is not self.parser:
+            return None
+        return self.positions.get(node.mem_id)
+
+    def span(self, node: Node) -> tuple[int, int] | None:
+        """``(start, end)`` positions of ``node``'s current subtree, or None.
+
+        ``end`` is the position of the subtree's last element, so every
+        descendant ``d`` satisfies ``start <= position(d) <= end``.
+        """
+        start = self.position(node)
+        if start is None:
+            return None
+        return start, self.positions.get(last_descendant(node).mem_id, start)
+
+    def detach(self, node: Node) -> None:
+        """Detach ``node`` from its parent (keeping it alive) and record the
+        detached range so later lookups reflect the restructured tree."""
+        span = self.span(node)
+        node.remove(recursive=False)
+        if span is not None:
+            self.detached.append(span)
+
+    def subtree(self, node: Node) -> list[Node] | None:
+        """``node.css('*')`` (self + descendants, pre-order) from the index, or
+        None when the node is unknown or the element list was released."""
+        if self.elements is None:
+            return None
+        span = self.span(node)
+        if span is None:
+            return None
+        start, end = span
+        cuts = sorted((s, e) for s, e in self.detached if start < s <= end)
+        if not cuts:
+            return self.elements[start : end + 1]
+        out: list[Node] = []
+        pos = start
+        for s, e in cuts:
+            if s > pos:
+                out.extend(self.elements[pos:s])
+            pos = max(pos, e + 1)
+        out.extend(self.elements[pos : end + 1])
+        return out
+
+    def is_hidden(self, node: Node) -> bool | None:
+        """``_slx.is_hidden`` from the index, or None when the node is unknown."""
+        pos = self.position(node)
+        if pos is None:
+            return None
+        # Hidden ranges are in document order, so only those starting at or
+        # before ``pos`` can contain it; a SERP carries a few dozen at most.
+        for i in range(bisect.bisect_right(self._hidden_starts, pos) - 1, -1, -1):
+            start, end = self.hidden[i]
+            if end < pos:
+                continue
+            # The hiding element is still an ancestor unless a detach between
+            # it and the node cut the node's subtree loose.
+            if not any(start < s <= pos <= e for s, e in self.detached):
+                return True
+        return False
@@ -0,0 +1,102 @@
+"""Per-parse state shared by extraction, classification, and the parsers.
+
+One ``parse_serp`` (or ``classify_serp``) call builds one ``ParseContext`` and
+hands it to the ``Extractor``; everything the pipeline memoizes for that one
+document hangs off it instead of a module-level cache:
+
+- ``raw_html`` -- the input markup (``str`` or undecoded ``bytes``), so the AI
+  overview parser reads its payloads without serializing the document.
+- ``index`` -- the ``DocumentIndex`` built by extraction's document walk.
+- ``payloads`` -- the AI overview ``PayloadIndex``, scanned on first use and
+  shared by every AI overview component of the page.
+- ``texts`` -- ``get_text`` results keyed by node (``_slx.cached_text``), for
+  text read more than once per parse (header labels are read by both the
+  header classifier and the classification-cache fingerprint).
+- ``timer``, ``budget``, ``classify_cache`` -- the parse's stage timer, time
+  budget, and optional cross-SERP ``ClassificationCache``.
+
+The state lives exactly as long as the parse: ``release`` drops the node-keyed
+parts once classification is done (parsers decompose nodes, and selectolax
+reuses the ``mem_id`` of a freed node), and leaving ``active`` drops the rest,
+so nothing outlives the call or leaks across the SERPs of a batch or across
+threads.
+
+Component parsers keep their ``parse_x(elem, sub_rank)`` signature, so the
+leaves that need the context (``is_hidden``, ``cached_text``, the AI overview
+payloads, the classifier's index lookups) read the active one from the
+``parse_context`` context variable that ``active`` publishes. Outside a parse it is None and
+those callers fall back to walking the tree.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from ._document_index import DocumentIndex
+from .parsers.budget import NULL_BUDGET, ParseBudget
+from .parsers.timings import NULL_TIMER, StageTimer
+
+if TYPE_CHECKING:
+    from .classifiers.cache import ClassificationCache
+    from .parsers.components._ai_overview_payloads import PayloadIndex
+
+
+class ParseContext:
+    """State scoped to one parse of one SERP.
+
+    Args:
+        raw_html: The input markup, or None for ``Node`` input.
+        timer: Stage timer for the parse (disabled by default).
+        budget: Time budget for the parse (unbounded by default).
+        classify_cache: Optional cross-SERP ``ClassificationCache``.
+    """
+
+    def __init__(
+        self,
+        raw_html: str | bytes | None = None,
+        timer: StageTimer = NULL_TIMER,
+        budget: ParseBudget = NULL_BUDGET,
+        classify_cache: ClassificationCache | None = None,
+    ) -> None:
+        self.raw_html = raw_html
+        self.index = DocumentIndex()
+        self.timer = timer
+        self.budget = budget
+        self.classify_cache = classify_cache
+        self.payloads: PayloadIndex | None = None
+        # ``(mem_id, separator, strip) -> text``; None once released.
+        self.texts: dict[tuple[int, str, bool], str | None] | None = {}
+
+    def release(self) -> None:
+        """Drop the node-keyed state before parsers start mutating the DOM;
+        index positions and hidden ranges stay usable."""
+        self.index.release()
+        self.texts = None
+
+    def close(self) -> None:
+        """Drop everything the parse memoized."""
+        self.release()
+        self.raw_html = None
+        self.payloads = None
+
+    @contextmanager
+    def active(self) -> Iterator[ParseContext]:
+        """Publish this context to the parse's leaves; closed on exit."""
+        token = parse_context.set(self)
+        try:
+            yield self
+        finally:
+            parse_context.reset(token)
+            self.close()
+
+
+parse_context: ContextVar[ParseContext | None] = ContextVar("parse_context", default=None)
+
+
+def active_index() -> DocumentIndex | None:
+    """The active parse's document index, or None outside a parse."""
+    ctx = parse_context.get()
+    return ctx.index if ctx is not None else None
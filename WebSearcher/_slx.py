@@ -14,8 +14,10 @@ call:
 - ``walk_descendants`` -- pre-order DFS over a node's subtree.
   Necessary because ``Node.traverse(...)`` walks the *entire document* from
   this point forward, not just the subtree.
-- ``is_hidden`` -- ancestor walk for inline ``display:none`` (the static-HTML
-  lazy-render pattern); backs the ``visible`` flag on parsed items.
+- ``is_hidden`` -- inline ``display:none`` on the node or an ancestor (the
+  static-HTML lazy-render pattern); backs the ``visible`` flag on parsed items.
+  Answered from the active ``DocumentIndex`` when there is one, else by an
+  ancestor walk.
 - ``subtree_first`` / ``subtree_css`` -- descendants-only queries (bs4
   ``find``/``find_all`` semantics; selectolax ``.css`` matches self too).
 - ``next_sibling`` / ``previous_sibling`` / ``next_siblings`` -- text-inclusive,
@@ -35,6 +37,9 @@ from collections.abc import Iterator
 from selectolax.lexbor import LexborHTMLParser as HTMLParser
 from selectolax.lexbor import LexborNode as Node
 
+from ._document_index import hides
+from ._parse_context import active_index, parse_context
+
 # Text under these never contributes to get_text (matches bs4+lxml).
 _SKIP_TEXT_TAGS = frozenset({"script", "style", "template"})
 
@@ -85,12 +90,12 @@ def node_string(node: Node) -> str | None:
 def make_soup(html: str | bytes | Node) -> Node:
     """Parse HTML and return its root ``<html>`` ``Node``.
 
-    Accepts an existing ``Node`` and returns it unchanged. Bytes are decoded as
-    UTF-8 (replace errors)."""
+    Accepts an existing ``Node`` and returns it unchanged. Bytes go to lexbor
+    undecoded; it reads them as UTF-8 and replaces invalid sequences with
+    U+FFFD, exactly as ``bytes.decode("utf-8", errors="replace")`` would, so
+    the tree matches a parse of the decoded string without the full copy."""
     if isinstance(html, Node):
         return html
-    if isinstance(html, bytes):
-        html = html.decode("utf-8", errors="replace")
     root = HTMLParser(html).root
     if root is None:
         raise ValueError("could not parse HTML into a root node")
@@ -135,6 +140,22 @@ def get_text(node: Node | None, separator: str = "", strip: bool = False) -> str
     return separator.join(parts)
 
 
+def cached_text(node: Node, separator: str = "", strip: bool = False) -> str | None:
+    """``get_text``, memoized on the active ``ParseContext`` for text read more
+    than once per parse. Only valid while the DOM is unmutated, so the memo is
+    dropped before the parsers run; then (and outside a parse) this is plain
+    ``get_text``."""
+    ctx = parse_context.get()
+    texts = ctx.texts if ctx is not None else None
+    if texts is None:
+        return get_text(node, separator, strip)
+    key = (node.mem_id, separator, strip)
+    if key in texts:
+        return texts[key]
+    text = texts[key] = get_text(node, separator, strip)
+    return text
+
+
 def has_text(node: Node | None) -> bool:
     """True if ``node``'s subtree contains at least one non-whitespace text
     fragment (short-circuits)."""
@@ -211,10 +232,19 @@ def is_hidden(node: Node | None) -> bool:
     Does NOT catch CSS-rule-based hiding (a stylesheet ``.cls{display:none}``)
     or JS-driven runtime hiding -- both out of scope (they would require a CSS
     or JS engine). Returns ``False`` for ``None`` so parsers can chain
-    ``css_first`` + ``is_hidden`` without a guard."""
+    ``css_first`` + ``is_hidden`` without a guard.
+
+    During ``parse_serp`` the answer comes from the document index's hidden
+    ranges (a lookup instead of an ancestor climb per item)."""
+    if node is None:
+        return False
+    index = active_index()
+    if index is not None:
+        hidden = index.is_hidden(node)
+        if hidden is not None:
+            return hidden
     while node is not None:
-        style = (node.attributes.get("style") or "").lower().replace(" ", "")
-        if "display:none" in style:
+        if hides(node):
             return True
         node = node.parent
     return False
@@ -0,0 +1,242 @@
+"""Dictionary-compressed SERP archives with random access by ``serp_id``.
+
+Google SERPs share most of their bytes -- inline scripts, CSS, page chrome --
+but compressing each one on its own can't exploit that, and compressing a
+whole crawl file as one stream gives up random access. An archive trains a
+zstd dictionary on a sample of the crawl and compresses every record as its
+own frame against it, so one SERP is read back with a seek and a single
+frame decompression, without touching the others.
+
+Layout (integers little-endian)::
+
+    MAGIC | dictionary | frame ... | index | footer
+
+The index is a zstd-compressed orjson object of parallel lists (``serp_id``,
+``qry``, ``offset``, ``length``), one entry per frame in write order. The
+footer is the dictionary's and index's offsets and lengths (four ``u64``)
+followed by ``MAGIC`` again. A file whose footer is missing was not closed.
+
+    write_archive(utils.iter_lines("serps.json"), "crawl.wsa")
+    with ArchiveReader("crawl.wsa") as archive:
+        record = archive.get(serp_id)
+
+Requires the ``zstd`` extra: ``pip install "WebSearcher[zstd]"``.
+
+    python -m WebSearcher.archive serps.json.zst crawl.wsa
+"""
+
+import argparse
+import itertools
+import logging
+import struct
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+import orjson
+
+from . import __version__, utils
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"WSARCHV1"
+ARCHIVE_SUFFIX = ".wsa"
+_FOOTER = struct.Struct("<4Q")
+
+DEFAULT_DICT_SIZE = 112_640  # zstd's default (110 KiB)
+DEFAULT_SAMPLES = 256
+DEFAULT_LEVEL = 10
+
+
+def train_dictionary(samples: Iterable[bytes], dict_size: int = DEFAULT_DICT_SIZE) -> bytes:
+    """A zstd dictionary trained on ``samples`` (encoded records), or ``b""``
+    when there are too few to train on (frames are then compressed plainly)."""
+    zstandard = utils.import_zstandard()
+    data: list = list(samples)
+    try:
+        return zstandard.train_dictionary(dict_size, data).as_bytes()
+    except zstandard.ZstdError as e:
+        log.warning(f"no dictionary trained from {len(data)} samples: {e}")
+        return b""
+
+
+class ArchiveWriter:
+    """Write records to an archive, one dictionary-compressed frame each.
+
+    Args:
+        path: Output file (overwritten).
+        dictionary: Raw dictionary bytes (see ``train_dictionary``); ``b""``
+            for none.
+        level: zstd compression level.
+    """
+
+    def __init__(self, path: str | Path, dictionary: bytes = b"", level: int = DEFAULT_LEVEL):
+        zstandard = utils.import_zstandard()
+        self.path = Path(path)
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        self._compressor = zstandard.ZstdCompressor(
+            level=level, dict_data=dict_data, write_checksum=True
+        )
+        self._index: dict[str, list] = {"serp_id": [], "qry": [], "offset": [], "length": []}
+        self._file: BinaryIO | None = open(self.path, "wb")
+        self._file.write(MAGIC)
+        self._dict_span = (self._file.tell(), len(dictionary))
+        self._file.write(dictionary)
+        self.n_records = 0
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write(self, record: dict) -> None:
+        """Compress ``record`` as one frame and index it by ``serp_id``/``qry``."""
+        if self._file is None:
+            raise ValueError(f"write to closed ArchiveWriter: {self.path}")
+        frame = self._compressor.compress(orjson.dumps(record))
+        self._index["serp_id"].append(record.get("serp_id"))
+        self._index["qry"].append(record.get("qry"))
+        self._index["offset"].append(self._file.tell())
+        self._index["length"].append(len(frame))
+        self._file.write(frame)
+        self.n_records += 1
+
+    def write_all(self, records: Iterable[dict]) -> None:
+        for record in records:
+            self.write(record)
+
+    def close(self) -> None:
+        """Write the index and footer. Safe to call twice."""
+        if self._file is None:
+            return
+        index = utils.import_zstandard().ZstdCompressor().compress(orjson.dumps(self._index))
+        index_offset = self._file.tell()
+        self._file.write(index)
+        self._file.write(_FOOTER.pack(*self._dict_span, index_offset, len(index)))
+        self._file.write(MAGIC)
+        self._file.close()
+        self._file = None
+
+
+def write_archive(
+    records: Iterable[dict],
+    path: str | Path,
+    samples: int = DEFAULT_SAMPLES,
+    dict_size: int = DEFAULT_DICT_SIZE,
+    level: int = DEFAULT_LEVEL,
+) -> int:
+    """Archive ``records``, training the dictionary on the first ``samples``
+    of them; returns the records written. Only the sample is held in memory."""
+    records = iter(records)
+    head = list(itertools.islice(records, samples))
+    dictionary = train_dictionary([orjson.dumps(r) for r in head], dict_size)
+    with ArchiveWriter(path, dictionary, level) as writer:
+        writer.write_all(itertools.chain(head, records))
+    return writer.n_records
+
+
+class ArchiveReader:
+    """Random and sequential access to an archive's records.
+
+    Opening reads only the footer, dictionary, and index; ``get`` then reads
+    and decompresses the one frame it needs.
+    """
+
+    def __init__(self, path: str | Path):
+        zstandard = utils.import_zstandard()
+        self.path = Path(path)
+        self._file: BinaryIO = open(self.path, "rb")
+        try:
+            if self._file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"not a WebSearcher archive: {self.path}")
+            size = self._file.seek(0, 2)
+            self._file.seek(max(size - _FOOTER.size - len(MAGIC), len(MAGIC)))
+            tail = self._file.read()
+            if len(tail) != _FOOTER.size + len(MAGIC) or tail[_FOOTER.size :] != MAGIC:
+                raise ValueError(f"archive has no footer (not closed?): {self.path}")
+            dict_offset, dict_length, index_offset, index_length = _FOOTER.unpack(
+                tail[: _FOOTER.size]
+            )
+            dictionary = self._read(dict_offset, dict_length)
+            index = orjson.loads(
+                zstandard.ZstdDecompressor().decompress(self._read(index_offset, index_length))
+            )
+        except BaseException:
+            self._file.close()
+            raise
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        self._decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+        self.serp_ids: list[str | None] = index["serp_id"]
+        self.queries: list[str | None] = index["qry"]
+        self._spans = list(zip(index["offset"], index["length"]))
+        self._positions: dict[str | None, int] = {}
+        for i, serp_id in enumerate(self.serp_ids):
+            self._positions.setdefault(serp_id, i)
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __contains__(self, serp_id: str) -> bool:
+        return serp_id in self._positions
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def _read(self, offset: int, length: int) -> bytes:
+        self._file.seek(offset)
+        return self._file.read(length)
+
+    def record(self, i: int) -> dict:
+        """The ``i``-th record in write order."""
+        return orjson.loads(self._decompressor.decompress(self._read(*self._spans[i])))
+
+    def get(self, serp_id: str) -> dict:
+        """The (first) record with ``serp_id``; ``KeyError`` if there is none."""
+        return self.record(self._positions[serp_id])
+
+    def find(self, qry: str) -> list[dict]:
+        """Every record for query ``qry``, in write order."""
+        return [self.record(i) for i, q in enumerate(self.queries) if q == qry]
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Build an archive from a crawl file of SERP records."""
+    p = argparse.ArgumentParser(
+        prog="WebSearcher.archive",
+        description="Pack a save_serp crawl file into a dictionary-compressed archive.",
+    )
+    p.add_argument("input", type=Path, help="SERP records (.json, or .json.zst/.gz/.br/.bz2)")
+    p.add_argument("output", type=Path, help="Archive to write (.wsa)")
+    p.add_argument(
+        "--samples", type=int, default=DEFAULT_SAMPLES, help="Records to train the dictionary on"
+    )
+    p.add_argument(
+        "--dict-size", type=int, default=DEFAULT_DICT_SIZE, help="Dictionary size (bytes)"
+    )
+    p.add_argument("--level", type=int, default=DEFAULT_LEVEL, help="zstd compression level")
+    args = p.parse_args(argv)
+
+    n = write_archive(
+        utils.iter_lines(args.input),
+        args.output,
+        samples=args.samples,
+        dict_size=args.dict_size,
+        level=args.level,
+    )
+    size = args.output.stat().st_size
+    print(f"WebSearcher {__version__} | archived {n:,} records -> {args.output} ({size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Content-addressed storage for raw SERP HTML.
+
+Each distinct page is stored once, compressed, under its ``utils.hash_id``
+digest, so retries, re-collections, and repeated queries that return
+byte-identical markup cost one blob between them. ``save_serp(blob_dir=...)``
+writes the page here and the JSON-lines record carries only its
+``html_hash``, which keeps metadata scans of ``serps.json`` off the markup.
+
+Blobs are sharded two levels deep by digest prefix (``ab/cd/abcd....html.br``)
+to keep directories small, and written to a temp file then renamed, so a blob
+that exists is complete and concurrent writers of the same page don't collide.
+
+    store = BlobStore("data/blobs")
+    digest = store.put(html)
+    records = store.with_html(utils.iter_lines("serps.json"))
+"""
+
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import brotli
+
+from . import utils
+
+BLOB_CODECS = ("br", "zst")
+
+# Blobs are written once and read many times, so spend more on compression
+# than the streaming line-file levels do.
+BROTLI_QUALITY = 9
+ZSTD_LEVEL = 10
+
+
+class BlobStore:
+    """SERP HTML stored once per distinct page, keyed by its hash.
+
+    Args:
+        root: Store directory, created by the first ``put``. Reading from a
+            store that doesn't exist raises ``FileNotFoundError`` rather than
+            reporting every page missing.
+        codec: Compression for new blobs: ``"br"`` (brotli) or ``"zst"``
+            (zstd, needs the ``zstd`` extra). Blobs of either codec are read.
+    """
+
+    def __init__(self, root: str | Path, codec: str = "br"):
+        if codec not in BLOB_CODECS:
+            raise ValueError(f"codec must be one of {BLOB_CODECS}, got {codec!r}")
+        self.root = Path(root)
+        self.codec = codec
+
+    def path(self, digest: str, codec: str | None = None) -> Path:
+        """Where the blob for ``digest`` is (or would be) stored."""
+        return self.root / digest[:2] / digest[2:4] / f"{digest}.html.{codec or self.codec}"
+
+    def _find(self, digest: str) -> Path | None:
+        for codec in (self.codec, *BLOB_CODECS):
+            fp = self.path(digest, codec)
+            if fp.exists():
+                return fp
+        return None
+
+    def __contains__(self, digest: str) -> bool:
+        return self._find(digest) is not None
+
+    def put(self, html: str | bytes) -> str:
+        """Store ``html`` unless an identical page is already stored; return its digest."""
+        digest = utils.hash_id(html)
+        if self._find(digest) is not None:
+            return digest
+        data = html.encode("utf-8") if isinstance(html, str) else html
+        if self.codec == "br":
+            blob = brotli.compress(data, quality=BROTLI_QUALITY)
+        else:
+            blob = utils.import_zstandard().ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        fp = self.path(digest)
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=fp.parent, prefix=f".{digest}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as outfile:
+                outfile.write(blob)
+            os.replace(tmp, fp)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return digest
+
+    def get(self, digest: str) -> str:
+        """The stored HTML for ``digest``; ``KeyError`` if there is none."""
+        fp = self._find(digest)
+        if fp is None:
+            if not self.root.is_dir():
+                raise FileNotFoundError(f"no blob store at {self.root}")
+            raise KeyError(digest)
+        blob = fp.read_bytes()
+        if fp.suffix == ".br":
+            data = brotli.decompress(blob)
+        else:
+            data = utils.import_zstandard().ZstdDecompressor().decompress(blob)
+        return data.decode("utf-8")
+
+    def with_html(self, records: Iterable[dict]) -> Iterator[dict]:
+        """``records`` with each ``html_hash`` resolved back into ``html``
+        (records that carry their own ``html`` pass through unchanged)."""
+        for record in records:
+            digest = record.get("html_hash")
+            if digest is not None and "html" not in record:
+                record = {**record, "html": self.get(digest)}
+            yield record
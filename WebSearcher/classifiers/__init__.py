@@ -1,7 +1,12 @@
+from .cache import ClassificationCache
 from .footer import ClassifyFooter
 from .main import ClassifyMain
+from .stats import ClassifierStats, collect_classifier_stats
 
 __all__ = [
+    "ClassificationCache",
+    "ClassifierStats",
     "ClassifyFooter",
     "ClassifyMain",
+    "collect_classifier_stats",
 ]
@@ -0,0 +1,133 @@
+"""Bounded cross-SERP cache of ``ClassifyMain`` results, keyed on structure.
+
+Components recur with identical structure across SERPs -- the same class
+tokens, tag skeleton, and heading text -- and classify identically every time.
+A ``ClassificationCache`` maps a cheap structural fingerprint of a component
+(``main._structural_fingerprint``) to the type the full chain gave it, so a
+batch reparse runs the chain once per shape rather than once per component.
+
+The fingerprint is a summary, not the whole component: a classifier that keys
+on a signal it leaves out (e.g. ``twitter_type``'s full-text match) could see
+two components share a fingerprint and a type they shouldn't. ``verify`` guards
+that: that fraction of hits is re-run through the full chain, and any
+divergence is logged, recorded in ``divergences``, and evicted (the chain's
+answer is returned). Run a sample with ``verify=1.0`` before trusting a cache
+on a new corpus.
+
+    cache = ClassificationCache(verify=0.01)
+    for parsed in ws.parse_serps(records, classify_cache=cache): ...
+
+``parse_serps`` workers each keep their own cache: the object pickles as its
+settings and reattaches to one per-process instance. The first chunk a worker
+receives creates that instance and the module holds it for the life of the
+process, so it persists across the chunks the worker parses (under fork, spawn,
+and forkserver alike). Its counters (and divergence log lines) stay in that
+worker.
+"""
+
+import logging
+import random
+import uuid
+import weakref
+from collections import OrderedDict, deque
+from collections.abc import Callable
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAXSIZE = 100_000
+
+# Divergences kept for inspection (all are counted and logged).
+_MAX_DIVERGENCES = 100
+
+# One instance per token per process, so a cache unpickled in a worker for
+# every chunk is the same object each time. Caches created here are tracked
+# weakly (they belong to the caller); copies attached on unpickling are held
+# strongly, since the executor drops each chunk's arguments -- the only other
+# reference -- once the chunk is done.
+_INSTANCES: "weakref.WeakValueDictionary[str, ClassificationCache]" = weakref.WeakValueDictionary()
+_ATTACHED: "dict[str, ClassificationCache]" = {}
+
+
+def _attach(token: str, maxsize: int, verify: float) -> "ClassificationCache":
+    cache = _INSTANCES.get(token)
+    if cache is None:
+        cache = _ATTACHED[token] = ClassificationCache(maxsize, verify, token=token)
+    return cache
+
+
+class ClassificationCache:
+    """LRU of ``fingerprint -> type`` with sampled verification.
+
+    Args:
+        maxsize: Fingerprints kept; least recently used are evicted past it.
+        verify: Fraction (0-1) of hits re-checked against the full chain.
+        seed: Seed for the verification sampler (reproducible samples).
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        verify: float = 0.0,
+        seed: int | None = None,
+        token: str | None = None,
+    ):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be >= 1, got {maxsize}")
+        if not 0.0 <= verify <= 1.0:
+            raise ValueError(f"verify must be between 0 and 1, got {verify}")
+        self.maxsize = maxsize
+        self.verify = verify
+        self.token = token or uuid.uuid4().hex
+        self.hits = 0
+        self.misses = 0
+        self.verified = 0
+        self.divergences: deque[dict] = deque(maxlen=_MAX_DIVERGENCES)
+        self.n_divergences = 0
+        self._entries: OrderedDict[int, str] = OrderedDict()
+        self._rng = random.Random(seed)
+        _INSTANCES[self.token] = self
+
+    def __reduce__(self):
+        return _attach, (self.token, self.maxsize, self.verify)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def classify(self, fingerprint: int, run_chain: Callable[[], str]) -> str:
+        """Cached type for ``fingerprint``, else ``run_chain()`` (stored)."""
+        entries = self._entries
+        cached = entries.get(fingerprint)
+        if cached is None:
+            self.misses += 1
+            cmpt_type = run_chain()
+            entries[fingerprint] = cmpt_type
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+            return cmpt_type
+        self.hits += 1
+        entries.move_to_end(fingerprint)
+        if self.verify and self._rng.random() < self.verify:
+            self.verified += 1
+            actual = run_chain()
+            if actual != cached:
+                self.n_divergences += 1
+                self.divergences.append(
+                    {"fingerprint": fingerprint, "cached": cached, "actual": actual}
+                )
+                log.warning(f"classification cache divergence: cached {cached}, chain {actual}")
+                del entries[fingerprint]
+                return actual
+        return cached
+
+    def report(self) -> dict:
+        """Counters: hits, misses, size, verified hits, and divergences."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "verified": self.verified,
+            "divergences": self.n_divergences,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -2,6 +2,7 @@ from selectolax.lexbor import LexborNode as Node
 
 from .._slx import class_tokens, get_text
 from .main import ClassifyMain
+from .stats import classifier_stats
 
 
 class ClassifyFooter:
@@ -27,10 +28,14 @@ class ClassifyFooter:
             ]
 
         cmpt_type = "unknown"
-        for classifier in classifier_list:
-            cmpt_type = classifier(node)
-            if cmpt_type != "unknown":
-                break
+        stats = classifier_stats.get()
+        if stats is not None:
+            cmpt_type = stats.run_chain("footer", classifier_list, node)
+        else:
+            for classifier in classifier_list:
+                cmpt_type = classifier(node)
+                if cmpt_type != "unknown":
+                    break
 
         # Fall back to main classifier
         if cmpt_type == "unknown":
@@ -1,44 +1,19 @@
+import functools
+from collections.abc import Callable
 from typing import Any
+from urllib.parse import urlsplit
 
 from selectolax.lexbor import LexborNode as Node
 
-from .._slx import _iter_text_fragments, class_tokens, get_text
+from .._parse_context import parse_context
+from .._slx import _iter_text_fragments, cached_text, class_tokens, get_text
 from ..parsers.component_types import header_text_to_type
+from .stats import classifier_stats
 
 _VIDEO_CLASSES = {"VibNM", "mLmaBd", "RzdJxc", "sHEJob"}
 _LOCAL_CLASSES = {"Qq3Lb", "VkpGBb"}
 
 
-# Tag names and ids the classifier chain actually gates on. The chain consults
-# ``signals.names``/``signals.ids`` for only this fixed handful of tokens, so
-# ``_ComponentSignals`` keeps just these rather than every element's tag/id --
-# one frozenset membership test per element instead of growing a set ~2.5M times
-# per corpus pass. NOTE: any new precondition that tests ``s.names``/``s.ids``
-# for a token MUST register it here, or the precondition will silently never
-# fire (the token never enters the set). The 87-snapshot suite pins the existing
-# tokens. ``classes`` is consulted broadly (incl. intersection with
-# ``_VIDEO_CLASSES``/``_LOCAL_CLASSES``) so it must stay complete.
-_NAME_SIGNALS: frozenset[str] = frozenset(
-    {
-        "g-scrolling-carousel",
-        "g-tray-header",
-        "block-component",
-        "h2",
-        "promo-throttler",
-        "product-viewer-group",
-        "g-more-link",
-    }
-)
-_ID_SIGNALS: frozenset[str] = frozenset(
-    {
-        "imagebox_bigimages",
-        "iur",
-        "knowledge-finance-wholepage__entity-summary",
-        "eer-masthead",
-    }
-)
-
-
 class _ComponentSignals:
     """One-pass summary of a component's gating class names, ids, and tag names.
 
@@ -47,12 +22,18 @@ class _ComponentSignals:
     with set lookups. Preconditions are necessary conditions only, so a skip can
     never change a classification (pinned by the snapshot suite). ``names`` and
     ``ids`` are filtered to ``_NAME_SIGNALS``/``_ID_SIGNALS`` -- the only tokens
-    the chain ever tests -- while ``classes`` is kept in full.
+    the chain's gates test, derived from them in ``_build_dispatch`` -- so one
+    frozenset membership test per element replaces growing a set ~2.5M times per
+    corpus pass. ``classes`` is kept in full.
+
+    ``elements`` is the component's ``css('*')`` when the caller already has it
+    -- ``parse_serp`` takes it as a slice of the document index's walk instead
+    of materializing a fresh subtree walk per component.
     """
 
     __slots__ = ("classes", "ids", "names")
 
-    def __init__(self, cmpt: Node) -> None:
+    def __init__(self, cmpt: Node, elements: list[Node] | None = None) -> None:
         classes: set[str] = set()
         ids: set[str] = set()
         names: set[str] = set()
@@ -62,7 +43,7 @@ class _ComponentSignals:
         # The leading truthiness guard narrows ``str | None`` -> ``str`` for the
         # type checker and short-circuits the (common) no-id element before the
         # membership test; only interest-set tokens reach ``set.add``.
-        for el in cmpt.css("*"):
+        for el in cmpt.css("*") if elements is None else elements:
             name = el.tag
             if name and name in _NAME_SIGNALS:
                 names.add(name)
@@ -93,6 +74,56 @@ _HEADER_CSS_BY_LEVEL: dict[int, str] = {
 }
 
 
+# ``local_results``' "locations" is the lone suffix marker: a heading *ending*
+# in it claims the component before any prefix marker is tried, at every
+# heading level.
+_SUFFIX_MARKER = ("locations", "local_results")
+
+
+class _HeaderTrie:
+    """Prefix trie over one heading level's ``header_texts`` markers.
+
+    Replaces a ``startswith`` per registered marker (~110 at level 2, growing
+    with each coverage pass) with one walk down the heading text. When several
+    markers prefix the text ("Noticias" / "Noticias Locales"), the one
+    registered first wins -- the same answer the marker-by-marker loop gave.
+    """
+
+    __slots__ = ("root",)
+
+    def __init__(self, markers: dict[str, str]) -> None:
+        # Each node is ``{char: child}``; a marker ending at a node stores its
+        # ``(registration rank, type)`` under the ``None`` key.
+        self.root: dict = {}
+        for rank, (marker, label) in enumerate(markers.items()):
+            if marker == _SUFFIX_MARKER[0]:
+                continue
+            node = self.root
+            for ch in marker:
+                node = node.setdefault(ch, {})
+            node.setdefault(None, (rank, label))
+
+    def match(self, text: str) -> str:
+        """Type of the earliest-registered marker ``text`` starts with, or unknown."""
+        if text.endswith(_SUFFIX_MARKER[0]):
+            return _SUFFIX_MARKER[1]
+        node = self.root
+        best: tuple[int, str] | None = node.get(None)
+        for ch in text:
+            node = node.get(ch)
+            if node is None:
+                break
+            hit = node.get(None)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
+        return best[1] if best is not None else "unknown"
+
+
+@functools.cache
+def _header_trie(level: int) -> _HeaderTrie:
+    return _HeaderTrie(header_text_to_type(level))
+
+
 class ClassifyMainHeader:
     """Classify a main-section component by its h2/h3 header text."""
 
@@ -114,18 +145,12 @@ class ClassifyMainHeader:
 
     @staticmethod
     def _classify_header(node: Node, level: int) -> str:
-        """Check text in common headers for dict matches."""
-        markers = header_text_to_type(level)
+        """Check text in common headers for registered marker prefixes."""
+        trie = _header_trie(level)
         for header in node.css(_HEADER_CSS_BY_LEVEL[level]):
-            text = (get_text(header) or "").strip()
-            # local_results' "locations" is the lone endswith marker.
-            if text.endswith("locations"):
-                return "local_results"
-            for marker, label in markers.items():
-                if marker == "locations":
-                    continue
-                if text.startswith(marker):
-                    return label
+            label = trie.match((cached_text(header) or "").strip())
+            if label != "unknown":
+                return label
         return "unknown"
 
 
@@ -135,92 +160,31 @@ class ClassifyMain:
     @staticmethod
     def classify(cmpt) -> str:
         node: Node = cmpt
-        signals = _ComponentSignals(node)
-
-        # Preconditions test ``s.classes`` freely, but any ``s.names``/``s.ids``
-        # token must also live in ``_NAME_SIGNALS``/``_ID_SIGNALS`` (see above) or
-        # the precondition silently never fires.
-        component_classifiers = [
-            (ClassifyMain.locations, None),
-            (ClassifyMain.top_stories, lambda s: "g-scrolling-carousel" in s.names),
-            (ClassifyMain.discussions_and_forums, lambda s: "IFnjPb" in s.classes),
-            # Structural-first: ITWcLb rows type a buying_guide before the
-            # English-only header-text path, so a localized/reworded heading
-            # ("Buying guide: ...") still classifies.
-            (ClassifyMain.buying_guide, lambda s: "ITWcLb" in s.classes),
-            # Structural-first: a left-bar/inline dictionary panel (``dob-modules``,
-            # no ``kp-blk``/``ULSxyf`` wrapper) is a ``knowledge`` panel whose
-            # "Dictionary" label sits in a non-heading span; type it structurally
-            # so ``parse_knowledge_panel``'s ``_subtype_dictionary`` recovers it,
-            # before the header-text path (which would miss it) reaches unknown.
-            (ClassifyMain.dictionary_panel, None),
-            # NOTE: ``most_read_articles`` has no unique structural signal -- it is
-            # classified purely by its English header "Most-read articles" via
-            # ``ClassifyMainHeader`` below, so a localized heading is unclassifiable.
-            # Unlike buying_guide/products it cannot be made structural-first.
-            (ClassifyMainHeader.classify, None),
-            (ClassifyMain.news_quotes, lambda s: "g-tray-header" in s.names),
-            (ClassifyMain.img_cards, lambda s: "block-component" in s.names),
-            (ClassifyMain.images, lambda s: "imagebox_bigimages" in s.ids or "iur" in s.ids),
-            (ClassifyMain.ai_overview, lambda s: "Fzsovc" in s.classes or "h2" in s.names),
-            # available_on's full-component ``get_text`` fallback (the
-            # ``/Available on`` substring path) fires 0x across the corpus; the
-            # real cases are caught by its cheap ``span.mgAbYb`` heading. Gating on
-            # that class stops the expensive fallback from running on the ~10
-            # non-available_on components/SERP that otherwise reach this classifier
-            # (plan 036 Lever 3). Tradeoff: a non-mgAbYb component carrying
-            # ``/Available on`` text would no longer be typed available_on --
-            # unobserved on the corpus, accepted as evidence-backed dead code.
-            (ClassifyMain.available_on, lambda s: "mgAbYb" in s.classes),
-            (ClassifyMain.knowledge_panel, None),
-            (ClassifyMain.knowledge_block, lambda s: "block-component" in s.names),
-            (ClassifyMain.banner, lambda s: "uzjuFc" in s.classes),
-            (
-                ClassifyMain.finance_panel,
-                lambda s: "knowledge-finance-wholepage__entity-summary" in s.ids,
-            ),
-            (ClassifyMain.map_result, lambda s: "lu_map_section" in s.classes),
-            (ClassifyMain.general_questions, lambda s: "ifM9O" in s.classes),
-            (ClassifyMain.short_videos, lambda s: "IFnjPb" in s.classes),
-            (ClassifyMain.videos, lambda s: bool(s.classes & _VIDEO_CLASSES)),
-            (ClassifyMain.knowledge_subcard, lambda s: "JNkvid" in s.classes),
-            (ClassifyMain.twitter, None),
-            (ClassifyMain.flights, None),
-            (ClassifyMain.promo, lambda s: "promo-throttler" in s.names),
-            (
-                ClassifyMain.products,
-                lambda s: (
-                    "product-viewer-group" in s.names
-                    or "g-more-link" in s.names
-                    or "gON1yc" in s.classes
-                ),
-            ),
-            (
-                ClassifyMain.election,
-                lambda s: (
-                    "eer-rc-b" in s.classes or "eer-rc-i" in s.classes or "eer-masthead" in s.ids
-                ),
-            ),
-            (ClassifyMain.general, None),
-            (ClassifyMain.people_also_ask, None),
-            (ClassifyMain.knowledge_box, None),
-            (ClassifyMain.local_results, lambda s: bool(s.classes & _LOCAL_CLASSES)),
-            # End-of-chain rules: each keys on a signal that also lives inside
-            # components other classifiers own (knowledge panels embed lab/
-            # attribute modules and AI-overview controllers; kp hotel sections
-            # carry travel links), so they may only claim components nothing
-            # above typed.
-            (ClassifyMain.knowledge_submodule, None),
-            (ClassifyMain.hotel_carousel, None),
-            (ClassifyMain.gallery, None),
-            (ClassifyMain.images_strip, None),
-            (ClassifyMain.ai_overview_banner, lambda s: "hdzaWe" in s.classes),
-        ]
-
-        for classifier, precondition in component_classifiers:
-            if precondition is not None and not precondition(signals):
-                continue
-            cmpt_type = classifier(node)
+        ctx = parse_context.get()
+        signals = _ComponentSignals(node, ctx.index.subtree(node) if ctx is not None else None)
+        cache = ctx.classify_cache if ctx is not None else None
+        if cache is not None:
+            hits = cache.hits
+            cmpt_type = cache.classify(
+                _structural_fingerprint(node, signals),
+                lambda: ClassifyMain._run_chain(node, signals),
+            )
+            stats = classifier_stats.get()
+            if stats is not None and cache.hits > hits:
+                stats.count_cache_hit("main")
+            return cmpt_type
+        return ClassifyMain._run_chain(node, signals)
+
+    @staticmethod
+    def _run_chain(node: Node, signals: _ComponentSignals) -> str:
+        # Only classifiers whose gate the component satisfies (plus the ungated
+        # ones) run, in chain order -- see ``_CHAIN``.
+        candidates = _candidates(signals)
+        stats = classifier_stats.get()
+        if stats is not None:
+            return stats.run_chain("main", _CHAIN_CLASSIFIERS, node, candidates)
+        for pos in candidates:
+            cmpt_type = _CHAIN[pos][0](node)
             if cmpt_type != "unknown":
                 return cmpt_type
         return "unknown"
@@ -686,3 +650,177 @@ class ClassifyMain:
                 else "twitter_result"
             )
         return cmpt_type
+
+
+# Classifier chain -------------------------------------------------------------
+
+# A gate is a classifier's precondition: the classifier runs only if the
+# component carries ANY of the listed class tokens, tag names, or ids (None =
+# always run). Gates are necessary conditions, so skipping a gated classifier
+# never changes a classification.
+Gate = dict[str, tuple[str, ...]]
+
+
+def _gate(classes: tuple[str, ...] = (), names: tuple[str, ...] = (), ids: tuple[str, ...] = ()):
+    return {"classes": classes, "names": names, "ids": ids}
+
+
+# In precedence order: the first classifier to return a type wins.
+_CHAIN: tuple[tuple[Callable[[Node], str], Gate | None], ...] = (
+    (ClassifyMain.locations, None),
+    (ClassifyMain.top_stories, _gate(names=("g-scrolling-carousel",))),
+    (ClassifyMain.discussions_and_forums, _gate(classes=("IFnjPb",))),
+    # Structural-first: ITWcLb rows type a buying_guide before the English-only
+    # header-text path, so a localized/reworded heading ("Buying guide: ...")
+    # still classifies.
+    (ClassifyMain.buying_guide, _gate(classes=("ITWcLb",))),
+    # Structural-first: a left-bar/inline dictionary panel (``dob-modules``, no
+    # ``kp-blk``/``ULSxyf`` wrapper) is a ``knowledge`` panel whose "Dictionary"
+    # label sits in a non-heading span; type it structurally so
+    # ``parse_knowledge_panel``'s ``_subtype_dictionary`` recovers it, before the
+    # header-text path (which would miss it) reaches unknown.
+    (ClassifyMain.dictionary_panel, None),
+    # NOTE: ``most_read_articles`` has no unique structural signal -- it is
+    # classified purely by its English header "Most-read articles" via
+    # ``ClassifyMainHeader`` below, so a localized heading is unclassifiable.
+    # Unlike buying_guide/products it cannot be made structural-first.
+    (ClassifyMainHeader.classify, None),
+    (ClassifyMain.news_quotes, _gate(names=("g-tray-header",))),
+    (ClassifyMain.img_cards, _gate(names=("block-component",))),
+    (ClassifyMain.images, _gate(ids=("imagebox_bigimages", "iur"))),
+    (ClassifyMain.ai_overview, _gate(classes=("Fzsovc",), names=("h2",))),
+    # available_on's full-component ``get_text`` fallback (the ``/Available on``
+    # substring path) fires 0x across the corpus; the real cases are caught by
+    # its cheap ``span.mgAbYb`` heading. Gating on that class stops the expensive
+    # fallback from running on the ~10 non-available_on components/SERP that
+    # otherwise reach this classifier (plan 036 Lever 3). Tradeoff: a non-mgAbYb
+    # component carrying ``/Available on`` text would no longer be typed
+    # available_on -- unobserved on the corpus, accepted as evidence-backed dead
+    # code.
+    (ClassifyMain.available_on, _gate(classes=("mgAbYb",))),
+    (ClassifyMain.knowledge_panel, None),
+    (ClassifyMain.knowledge_block, _gate(names=("block-component",))),
+    (ClassifyMain.banner, _gate(classes=("uzjuFc",))),
+    (ClassifyMain.finance_panel, _gate(ids=("knowledge-finance-wholepage__entity-summary",))),
+    (ClassifyMain.map_result, _gate(classes=("lu_map_section",))),
+    (ClassifyMain.general_questions, _gate(classes=("ifM9O",))),
+    (ClassifyMain.short_videos, _gate(classes=("IFnjPb",))),
+    (ClassifyMain.videos, _gate(classes=tuple(sorted(_VIDEO_CLASSES)))),
+    (ClassifyMain.knowledge_subcard, _gate(classes=("JNkvid",))),
+    (ClassifyMain.twitter, None),
+    (ClassifyMain.flights, None),
+    (ClassifyMain.promo, _gate(names=("promo-throttler",))),
+    (
+        ClassifyMain.products,
+        _gate(classes=("gON1yc",), names=("product-viewer-group", "g-more-link")),
+    ),
+    (ClassifyMain.election, _gate(classes=("eer-rc-b", "eer-rc-i"), ids=("eer-masthead",))),
+    (ClassifyMain.general, None),
+    (ClassifyMain.people_also_ask, None),
+    (ClassifyMain.knowledge_box, None),
+    (ClassifyMain.local_results, _gate(classes=tuple(sorted(_LOCAL_CLASSES)))),
+    # End-of-chain rules: each keys on a signal that also lives inside components
+    # other classifiers own (knowledge panels embed lab/attribute modules and
+    # AI-overview controllers; kp hotel sections carry travel links), so they may
+    # only claim components nothing above typed.
+    (ClassifyMain.knowledge_submodule, None),
+    (ClassifyMain.hotel_carousel, None),
+    (ClassifyMain.gallery, None),
+    (ClassifyMain.images_strip, None),
+    (ClassifyMain.ai_overview_banner, _gate(classes=("hdzaWe",))),
+)
+
+
+def _build_dispatch(chain) -> tuple[frozenset[int], dict[str, dict[str, frozenset[int]]]]:
+    """Index the chain's gates: ``(ungated positions, {kind: {token: positions}})``."""
+    ungated: set[int] = set()
+    index: dict[str, dict[str, set[int]]] = {"classes": {}, "names": {}, "ids": {}}
+    for pos, (_, gate) in enumerate(chain):
+        if gate is None:
+            ungated.add(pos)
+            continue
+        for kind, tokens in gate.items():
+            for token in tokens:
+                index[kind].setdefault(token, set()).add(pos)
+    frozen = {kind: {t: frozenset(p) for t, p in by.items()} for kind, by in index.items()}
+    return frozenset(ungated), frozen
+
+
+_CHAIN_CLASSIFIERS = tuple(classifier for classifier, _ in _CHAIN)
+_UNGATED, _GATE_INDEX = _build_dispatch(_CHAIN)
+# The tag names and ids ``_ComponentSignals`` collects: exactly those some gate tests.
+_NAME_SIGNALS: frozenset[str] = frozenset(_GATE_INDEX["names"])
+_ID_SIGNALS: frozenset[str] = frozenset(_GATE_INDEX["ids"])
+
+
+def _candidates(signals: _ComponentSignals) -> list[int]:
+    """Chain positions to try for a component, in precedence order: the ungated
+    classifiers plus every classifier one of the component's signals opens."""
+    positions = set(_UNGATED)
+    for kind, present in (
+        ("classes", signals.classes),
+        ("names", signals.names),
+        ("ids", signals.ids),
+    ):
+        by_token = _GATE_INDEX[kind]
+        for token in by_token.keys() & present:
+            positions.update(by_token[token])
+    return sorted(positions)
+
+
+# Structural fingerprint -------------------------------------------------------
+
+# Text the chain compares against fixed labels: both levels' header selectors,
+# bare ``h2`` (ai_overview, flights), any ``role="heading"``, and the labelled
+# spans/trays (available_on, news_quotes, images_strip). Organic result titles
+# (plain ``h3``) stay out, so results from different sites share a fingerprint.
+_FINGERPRINT_TEXT_CSS = ", ".join(
+    [
+        *_HEADER_CSS_BY_LEVEL.values(),
+        "h2",
+        '[role="heading"]',
+        "span.mgAbYb",
+        "g-tray-header",
+        "h3.bNg8Rb",
+    ]
+)
+
+
+def _href_shape(href: str | None) -> str:
+    """Google-internal links keep host + first path segments (hotel pages,
+    travel search); every external link collapses to one token."""
+    parts = urlsplit(href or "")
+    if parts.netloc and "google." not in parts.netloc:
+        return "ext"
+    return parts.netloc + "/".join(parts.path.split("/")[:4])
+
+
+def _structural_fingerprint(node: Node, signals: _ComponentSignals) -> int:
+    """Hash of the structure ``ClassifyMain`` reads, for ``ClassificationCache``.
+
+    Root tag and identifying attributes; the subtree's class tokens and gated
+    tag names/ids (from ``signals``, already collected); labelled heading text;
+    the ``data-attrid``/``jscontroller`` values; and link shapes. Full-text
+    matches (``twitter_type``, ``knowledge_box``'s first text) are left out --
+    the cache's ``verify`` mode catches a shape they would split. So are
+    per-render tracking ids (``data-hveid``, ``data-ved``), which differ for
+    the same shape at every rank and on every SERP: only the one ``data-hveid``
+    value ``knowledge_box`` tests for goes in, as a flag.
+    """
+    attrs = node.attrs
+    return hash(
+        (
+            node.tag,
+            attrs.get("class"),
+            attrs.get("id"),
+            attrs.get("jscontroller"),
+            attrs.get("data-hveid") == "CAMQAA",
+            frozenset(signals.classes),
+            frozenset(signals.names),
+            frozenset(signals.ids),
+            tuple((cached_text(el) or "").strip() for el in node.css(_FINGERPRINT_TEXT_CSS)),
+            frozenset(el.attrs.get("data-attrid") for el in node.css("[data-attrid]")),
+            frozenset(el.attrs.get("jscontroller") for el in node.css("[jscontroller]")),
+            frozenset(_href_shape(a.attrs.get("href")) for a in node.css("a[href]")),
+        )
+    )
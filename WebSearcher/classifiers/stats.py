@@ -0,0 +1,115 @@
+"""Opt-in hit/skip/time statistics for the classifier chains.
+
+The ``ClassifyMain`` chain (and ``ClassifyFooter``'s short list ahead of it) is
+ordered by hand; these counters are the data for reordering it and for finding
+classifiers that cost time but never fire. Per classifier, per chain:
+
+- ``reached``: the chain got as far as this classifier for a component.
+- ``skipped``: reached, but its gate (precondition) was closed, so it never ran.
+- ``matched``: ran and returned a type, ending the chain.
+- ``unknown``: ran and returned ``"unknown"``.
+- ``seconds``: cumulative time spent running it.
+
+``reached == skipped + matched + unknown`` always holds. A component answered
+by a ``ClassificationCache`` never runs the chain, so it is counted once in
+``cache_hits`` (per chain) instead; a hit the cache re-verifies also runs, and
+counts, the chain.
+
+Collection is off by default -- the chains check one context variable per
+component -- and is switched on for a block with ``collect_classifier_stats``,
+which aggregates over every SERP parsed inside it, including those
+``parse_serps`` hands to worker processes (each chunk's counts come back with
+its results and are merged in):
+
+    with collect_classifier_stats() as stats:
+        for html in htmls:
+            ws.parse_serp(html)
+    stats.rows()
+"""
+
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from selectolax.lexbor import LexborNode as Node
+
+COUNTERS = ("reached", "skipped", "matched", "unknown")
+
+
+class ClassifierStats:
+    """Counters and timings per ``(chain, classifier)``, in first-reached order."""
+
+    def __init__(self) -> None:
+        self.counts: dict[str, dict[str, dict]] = {}
+        self.cache_hits: dict[str, int] = {}
+
+    def _row(self, chain: str, name: str) -> dict:
+        rows = self.counts.setdefault(chain, {})
+        row = rows.get(name)
+        if row is None:
+            row = rows[name] = {**dict.fromkeys(COUNTERS, 0), "seconds": 0.0}
+        return row
+
+    def run_chain(
+        self,
+        chain: str,
+        classifiers: Sequence[Callable[[Node], str]],
+        node: Node,
+        candidates: Iterable[int] | None = None,
+    ) -> str:
+        """Run ``classifiers`` in order on ``node`` like the uninstrumented
+        chain, counting as it goes. ``candidates`` are the positions whose gate
+        is open (None = all)."""
+        open_positions = None if candidates is None else set(candidates)
+        for pos, classifier in enumerate(classifiers):
+            row = self._row(chain, classifier.__qualname__)
+            row["reached"] += 1
+            if open_positions is not None and pos not in open_positions:
+                row["skipped"] += 1
+                continue
+            start = time.perf_counter()
+            cmpt_type = classifier(node)
+            row["seconds"] += time.perf_counter() - start
+            if cmpt_type != "unknown":
+                row["matched"] += 1
+                return cmpt_type
+            row["unknown"] += 1
+        return "unknown"
+
+    def count_cache_hit(self, chain: str) -> None:
+        """Count a component of ``chain`` typed by the classification cache."""
+        self.cache_hits[chain] = self.cache_hits.get(chain, 0) + 1
+
+    def merge(self, other: "ClassifierStats") -> None:
+        """Add ``other``'s counts into these (e.g. from another process)."""
+        for chain, rows in other.counts.items():
+            for name, counts in rows.items():
+                row = self._row(chain, name)
+                for key, value in counts.items():
+                    row[key] += value
+        for chain, hits in other.cache_hits.items():
+            self.cache_hits[chain] = self.cache_hits.get(chain, 0) + hits
+
+    def rows(self) -> list[dict]:
+        """One flat dict per ``(chain, classifier)``."""
+        return [
+            {"chain": chain, "classifier": name, **counts}
+            for chain, rows in self.counts.items()
+            for name, counts in rows.items()
+        ]
+
+
+classifier_stats: ContextVar[ClassifierStats | None] = ContextVar("classifier_stats", default=None)
+
+
+@contextmanager
+def collect_classifier_stats(stats: ClassifierStats | None = None) -> Iterator[ClassifierStats]:
+    """Collect classifier statistics for every classification in the block,
+    into ``stats`` (to keep aggregating) or a fresh ``ClassifierStats``."""
+    stats = stats if stats is not None else ClassifierStats()
+    token = classifier_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        classifier_stats.reset(token)
@@ -21,6 +21,9 @@ def _add_engine_args(p: argparse.ArgumentParser) -> None:
     p.add_argument(
         "--no-ai-expand", dest="ai_expand", action="store_false", help="Do not expand AI overviews"
     )
+    p.add_argument(
+        "--blobs", action="store_true", help="Store SERP HTML once per page in {data-dir}/blobs"
+    )
 
 
 def _add_search_args(p: argparse.ArgumentParser) -> None:
@@ -36,6 +39,7 @@ def _run_search(args: argparse.Namespace) -> None:
         args.method,
         data_dir=args.data_dir,
         ai_expand=args.ai_expand,
+        blobs=args.blobs,
     )
     se.close()
 
@@ -55,7 +59,7 @@ def main(argv: list[str] | None = None) -> None:
     p_show.add_argument(
         "--data-dir",
         default=None,
-        help="Directory containing serps.json (default: current version)",
+        help="Directory containing serps.json or serps.wsa (default: current version)",
     )
     p_show.add_argument(
         "--list", dest="list_queries", action="store_true", help="List saved queries"
@@ -115,6 +119,7 @@ def main(argv: list[str] | None = None) -> None:
             data_dir=args.data_dir,
             ai_expand=args.ai_expand,
             delay=args.delay,
+            blobs=args.blobs,
         )
         se.close()
     elif args.command == "headers":
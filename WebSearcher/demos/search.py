@@ -55,11 +55,16 @@ def search(
     method: str = "patchright",
     data_dir: str | None = None,
     ai_expand: bool = True,
+    blobs: bool = False,
 ):
-    """Search and parse a single query (patchright or requests), saving serps/parsed/searches."""
+    """Search and parse a single query (patchright or requests), saving serps/parsed/searches.
+
+    With ``blobs``, SERP HTML goes to a ``BlobStore`` in ``{data_dir}/blobs``.
+    """
     data_path = Path(data_dir) if data_dir else _default_data_dir()
     data_path.mkdir(parents=True, exist_ok=True)
     fps = {k: data_path / f"{k}.json" for k in ("serps", "parsed", "searches")}
+    blob_dir = data_path / "blobs" if blobs else ""
 
     header = f"WebSearcher v{ws.__version__}\nSearch Query: {query}\n"
     header += f"Output Dir: {data_path}\n"
@@ -68,7 +73,7 @@ def search(
     se = ws.SearchEngine(method=method)
     se.search(query, ai_expand=ai_expand)
     se.parse_serp()
-    se.save_serp(append_to=fps["serps"])
+    se.save_serp(append_to=fps["serps"], blob_dir=blob_dir)
     se.save_search(append_to=fps["searches"])
     se.save_parsed(append_to=fps["parsed"])
 
@@ -82,15 +87,18 @@ def searches(
     data_dir: str | None = None,
     ai_expand: bool = True,
     delay: float = 30.0,
+    blobs: bool = False,
 ):
     """Search a battery of queries spanning SERP component types, reusing one browser session.
 
     Saves serps/parsed/searches like ``search``. Pass ``types`` to limit to specific QUERIES
     groups. Handles CAPTCHAs (waits 5 min and retries once) and jitters the inter-query delay.
+    With ``blobs``, each distinct SERP's HTML is stored once in ``{data_dir}/blobs``.
     """
     data_path = Path(data_dir) if data_dir else _default_data_dir()
     data_path.mkdir(parents=True, exist_ok=True)
     fps = {k: data_path / f"{k}.json" for k in ("serps", "parsed", "searches")}
+    blob_dir = data_path / "blobs" if blobs else ""
 
     if types:
         queries = [q for t in types if t in QUERIES for q in QUERIES[t]]
@@ -103,7 +111,7 @@ def searches(
     for i, qry in enumerate(queries):
         se.search(qry, ai_expand=ai_expand)
         se.parse_serp()
-        se.save_serp(append_to=fps["serps"])
+        se.save_serp(append_to=fps["serps"], blob_dir=blob_dir)
         se.save_search(append_to=fps["searches"])
 
         if se.parsed.features.get("captcha"):
@@ -111,7 +119,7 @@ def searches(
             time.sleep(300)
             se.search(qry, ai_expand=ai_expand)
             se.parse_serp()
-            se.save_serp(append_to=fps["serps"])
+            se.save_serp(append_to=fps["serps"], blob_dir=blob_dir)
             se.save_search(append_to=fps["searches"])
             if se.parsed.features.get("captcha"):
                 print("CAPTCHA still present, stopping.")
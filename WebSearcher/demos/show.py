@@ -1,15 +1,20 @@
 """Offline demo: show the parsed-results table for a saved SERP, selected by query.
 
 Loads ``{data_dir}/serps.json`` (the output of ``ws-demo search``), finds the record
-whose ``qry`` matches, parses its stored HTML fresh, and prints a ``type``/``title``/``url``
-table. Runtime-deps-only (stdlib table helper, no polars), so it runs on a plain
-``pip install WebSearcher``.
+whose ``qry`` matches, parses its stored HTML fresh (from ``{data_dir}/blobs`` for a
+capture saved with ``--blobs``), and prints a ``type``/``title``/``url`` table. A
+capture packed into ``{data_dir}/serps.wsa`` (``python -m WebSearcher.archive``) is
+read from the archive instead, decompressing only the matching SERP. Runtime-deps-only
+(stdlib table helper, no polars), so it runs on a plain ``pip install WebSearcher``
+(archives also need the ``zstd`` extra).
 """
 
 import json
 from pathlib import Path
 
 import WebSearcher as ws
+from WebSearcher.archive import ARCHIVE_SUFFIX, ArchiveReader
+from WebSearcher.blobs import BlobStore
 
 from ._common import _default_data_dir, _print_results_table
 
@@ -58,11 +63,14 @@ def show(
     """
     ddir = Path(data_dir) if data_dir else _default_data_dir()
     fp = ddir / "serps.json"
+    archive_fp = (ddir / "serps").with_suffix(ARCHIVE_SUFFIX)
+    if not fp.exists() and archive_fp.exists():
+        return _show_archived(query, archive_fp, list_queries, details, max_width)
     if not fp.exists():
         print(f'Not found: {fp}\nRun `ws-demo search "{query or "your query"}"` first.')
         return None
 
-    queries: list[str] = []
+    queries: list[str | None] = []
     html: str | None = None
     url: str | None = None
     with open(fp) as f:
@@ -76,7 +84,42 @@ def show(
             if query and qry == query:
                 html = rec.get("html")
                 url = rec.get("url")
+                if html is None and rec.get("html_hash"):
+                    html = BlobStore(ddir / "blobs").get(rec["html_hash"])
 
+    return _show_parsed(query, queries, html, url, list_queries, details, max_width)
+
+
+def _show_archived(
+    query: str | None,
+    fp: Path,
+    list_queries: bool,
+    details: bool,
+    max_width: int,
+) -> dict | None:
+    """``show`` from an archive (``WebSearcher.archive``): the query list comes
+    from its index, and only the matching SERP is decompressed."""
+    with ArchiveReader(fp) as archive:
+        queries = archive.queries
+        last = None
+        if query and not list_queries:
+            last = next((i for i in reversed(range(len(queries))) if queries[i] == query), None)
+        rec = archive.record(last) if last is not None else {}
+    html = rec.get("html")
+    if html is None and rec.get("html_hash"):
+        html = BlobStore(fp.parent / "blobs").get(rec["html_hash"])
+    return _show_parsed(query, queries, html, rec.get("url"), list_queries, details, max_width)
+
+
+def _show_parsed(
+    query: str | None,
+    queries: list[str | None],
+    html: str | None,
+    url: str | None,
+    list_queries: bool,
+    details: bool,
+    max_width: int,
+) -> dict | None:
     if list_queries or not query:
         for q in queries:
             print(q)
@@ -2,7 +2,9 @@ import logging
 
 from selectolax.lexbor import LexborNode as Node
 
+from .._parse_context import ParseContext
 from ..parsers.component_list import ComponentList
+from ..parsers.timings import StageTimer
 from .extractor_footer import ExtractorFooter
 from .extractor_header import ExtractorHeader
 from .extractor_main import ExtractorMain
@@ -12,31 +14,38 @@ log = logging.getLogger(__name__)
 
 
 class Extractor:
-    def __init__(self, soup: Node):
+    def __init__(self, soup: Node, context: ParseContext | None = None):
         self.soup: Node = soup
+        self.context = context if context is not None else ParseContext()
         self.components = ComponentList()
-        self.rhs_handler = ExtractorRightHandSide(self.soup, self.components)
+        # The context's index, built by ``extract_components``; handlers that
+        # detach subtrees record them here so post-extraction lookups see the
+        # restructured tree.
+        self.index = self.context.index
+        self.rhs_handler = ExtractorRightHandSide(self.soup, self.components, self.index)
         self.header_handler = ExtractorHeader(self.soup, self.components)
-        self.main_handler = ExtractorMain(self.soup, self.components)
+        self.main_handler = ExtractorMain(self.soup, self.components, self.index)
         self.footer_handler = ExtractorFooter(self.soup, self.components)
 
-    def extract_components(self):
+    def extract_components(self, timer: StageTimer | None = None):
+        timer = timer or self.context.timer
         log.debug(f"Extracting Components {'-' * 50}")
-        dom_positions = self._get_dom_positions(self.soup)
-        self.rhs_handler.extract()
-        self.header_handler.extract()
-        self.main_handler.extract()
-        self.footer_handler.extract()
-        self.rhs_handler.append()
-        self.components.reorder_by_dom_position(dom_positions)
+        # The one document walk, taken before extraction so detached ads keep
+        # their original positions for the reorder below. ``parse_serp`` may
+        # have taken it already, to run registered feature probes first.
+        if self.index.elements is None:
+            with timer.stage("extract", "index"):
+                self.index.build(self.soup)
+        with timer.stage("extract", "rhs"):
+            self.rhs_handler.extract()
+        with timer.stage("extract", "header"):
+            self.header_handler.extract()
+        with timer.stage("extract", "main"):
+            self.main_handler.extract()
+        with timer.stage("extract", "footer"):
+            self.footer_handler.extract()
+        with timer.stage("extract", "rhs"):
+            self.rhs_handler.append()
+        with timer.stage("extract", "reorder"):
+            self.components.reorder_by_dom_position(self.index)
         log.debug(f"total components: {self.components.cmpt_rank_counter:,}")
-
-    @staticmethod
-    def _get_dom_positions(soup: Node) -> dict[int, int]:
-        """Map ``mem_id -> pre-order position`` for every element in the document.
-
-        Just the starts; downstream code (``reorder_by_dom_position``) computes
-        ``end`` ranges per main-component element on demand instead of walking
-        ``.parent`` for every element of the document.
-        """
-        return {t.mem_id: i for i, t in enumerate(soup.css("*"))}
@@ -0,0 +1,254 @@
+"""User-registered SERP features, computed in ``FeatureExtractor``'s pass.
+
+Page-level features of an analysis's own (a script marker, an ad count, a
+layout flag) are registered once and then computed by every
+``FeatureExtractor.extract_features`` call -- so by every ``parse_serp`` and
+``parse_serps`` -- against the raw markup and soup it already holds, instead of
+a second scan of the HTML after the parse. Values land in
+``SERPFeatures.extra`` (``parsed["features"]["extra"]``), keyed by name.
+
+A feature is one of three probes:
+
+- ``pattern``: a regex over the raw markup. ``bytes`` input is scanned
+  undecoded through a bytes twin of the pattern when that scan is certain to
+  agree with the ``str`` one (``_bytes_twin``), and decoded once for the rest.
+  ``Node`` input has no raw markup; the soup is serialized once for all
+  pattern features.
+- ``css``: a selector over the parsed soup.
+- ``func``: ``func(soup, index)`` returning the value. ``index`` is the parse's
+  ``DocumentIndex`` (None outside ``parse_serp``).
+
+Inside ``parse_serp`` the soup probes run first, on the document as parsed --
+before extraction detaches the ads and right-hand column and before the
+component parsers decompose nodes -- so they see what a separate scan of the
+HTML would. Leave the soup unmodified: extraction runs on it next.
+
+``value`` picks what a pattern or css probe reports: ``"exists"`` (bool),
+``"count"`` (matches), or ``"first"`` (the first match's group 1, else its
+whole text). A probe that raises is logged and reports None -- except for a
+``ParseTimeout``: probes run inside the parse's ``timeout=`` budget, and one
+that runs past it ends the parse like any other stage.
+
+    register_feature("has_knowledge_js", pattern=r"kno-fiu")
+    register_feature("n_ads", css='div[data-text-ad]', value="count")
+
+The registry is per process; ``parse_serps`` workers inherit it under the
+default ``fork`` start method, so register at import time of a module the
+workers also import when using another. Registered features are part of the
+``ParseCache`` key (``extra_features_fingerprint``); a ``func`` is keyed by
+its qualified name, not its source.
+"""
+
+import hashlib
+import logging
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from selectolax.lexbor import LexborNode as Node
+
+from .._document_index import DocumentIndex
+from .._slx import get_text
+from ..parsers.budget import ParseTimeout
+
+log = logging.getLogger(__name__)
+
+FeatureValue = Literal["exists", "count", "first"]
+FEATURE_VALUES = ("exists", "count", "first")
+
+
+@dataclass(frozen=True)
+class SERPFeature:
+    name: str
+    pattern: re.Pattern[str] | None = None
+    css: str | None = None
+    func: Callable[[Node, DocumentIndex | None], Any] | None = None
+    value: FeatureValue = "exists"
+    pattern_bytes: re.Pattern[bytes] | None = field(default=None, repr=False, compare=False)
+
+
+EXTRA_FEATURES: dict[str, SERPFeature] = {}
+
+
+# Escapes whose bytes meaning matches their str meaning only under re.ASCII
+# (the str versions also match non-ASCII word/digit/space characters).
+_ASCII_ONLY_ESCAPES = frozenset("wdsbB")
+# Group openers after "(?" that don't change flags.
+_PLAIN_GROUPS = (":", "=", "!", "<=", "<!", "P<", "P=", "#")
+
+
+def _escape_is_safe(c: str, ascii_flag: bool) -> bool:
+    if not c.isalnum():
+        return True  # an escaped literal: \. \- \/
+    if c in "AZ" or c in "123456789":
+        return True  # string anchors, backreferences
+    return ascii_flag and c in _ASCII_ONLY_ESCAPES
+
+
+def _bytes_safe(pattern: str, flags: int) -> bool:
+    r"""True if ``pattern`` finds the same matches in UTF-8 bytes as in the
+    decoded text. It must be ASCII, so it only matches ASCII bytes -- which
+    never occur inside a multi-byte sequence -- and contain nothing that
+    matches "any character" or depends on Unicode character classes: no ``.``,
+    negated classes, ``\W``/``\S``/``\D``, code-point escapes (``\xe9``), or
+    scoped flags, and -- without ``re.ASCII`` -- no ``\w``/``\d``/``\s``/``\b``
+    or IGNORECASE (which folds e.g. ``k`` to the Kelvin sign). Anything not
+    recognized counts as unsafe."""
+    if not pattern.isascii():
+        return False
+    ascii_flag = bool(flags & re.ASCII)
+    if flags & re.IGNORECASE and not ascii_flag:
+        return False
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            if i + 1 >= n or not _escape_is_safe(pattern[i + 1], ascii_flag):
+                return False
+            i += 2
+        elif c == ".":
+            return False
+        elif c == "[":
+            i += 1
+            if i < n and pattern[i] == "^":
+                return False
+            start = i
+            while i < n and (pattern[i] != "]" or i == start):
+                if pattern[i] == "\\":
+                    if i + 1 >= n or not _escape_is_safe(pattern[i + 1], ascii_flag):
+                        return False
+                    i += 1
+                i += 1
+            i += 1
+        elif c == "(" and pattern.startswith("?", i + 1):
+            if not pattern.startswith(_PLAIN_GROUPS, i + 2):
+                return False
+            i += 2
+        else:
+            i += 1
+    return True
+
+
+def _bytes_twin(rx: re.Pattern[str]) -> re.Pattern[bytes] | None:
+    """The pattern compiled for ``bytes`` input, or None when a bytes scan
+    could disagree with the ``str`` one (see ``_bytes_safe``)."""
+    if not _bytes_safe(rx.pattern, rx.flags):
+        return None
+    return re.compile(rx.pattern.encode(), rx.flags & ~re.UNICODE)
+
+
+def register_feature(
+    name: str,
+    *,
+    pattern: str | re.Pattern[str] | None = None,
+    css: str | None = None,
+    func: Callable[[Node, DocumentIndex | None], Any] | None = None,
+    value: FeatureValue | None = None,
+    replace: bool = False,
+) -> SERPFeature:
+    """Register a feature computed on every SERP; exactly one of ``pattern``,
+    ``css``, or ``func``. Re-registering a name raises unless ``replace``."""
+    if sum(probe is not None for probe in (pattern, css, func)) != 1:
+        raise ValueError(f"feature {name!r} needs exactly one of pattern, css, or func")
+    if name in EXTRA_FEATURES and not replace:
+        raise ValueError(f"feature {name!r} is already registered")
+    if value is not None and func is not None:
+        raise ValueError(f"feature {name!r}: value applies to pattern and css probes only")
+    value = value or "exists"
+    if value not in FEATURE_VALUES:
+        raise ValueError(f"feature {name!r}: value must be one of {FEATURE_VALUES}, got {value!r}")
+    rx = re.compile(pattern) if isinstance(pattern, str) else pattern
+    feature = SERPFeature(
+        name=name,
+        pattern=rx,
+        css=css,
+        func=func,
+        value=value,
+        pattern_bytes=_bytes_twin(rx) if rx is not None else None,
+    )
+    EXTRA_FEATURES[name] = feature
+    return feature
+
+
+def unregister_feature(name: str) -> None:
+    """Remove a registered feature (missing names are ignored)."""
+    EXTRA_FEATURES.pop(name, None)
+
+
+def extra_features_fingerprint() -> str:
+    """Digest of the registry, for keys of cached parses ('' when empty)."""
+    if not EXTRA_FEATURES:
+        return ""
+    h = hashlib.sha256()
+    for feature in EXTRA_FEATURES.values():
+        func = feature.func
+        probe = (
+            f"{func.__module__}.{func.__qualname__}"
+            if func is not None
+            else repr((feature.pattern, feature.css))
+        )
+        h.update(f"{feature.name}={feature.value}:{probe};".encode())
+    return h.hexdigest()
+
+
+# Probes -----------------------------------------------------------------------
+
+
+def _pattern_value(rx: re.Pattern, text: str | bytes, value: FeatureValue) -> Any:
+    if value == "count":
+        return sum(1 for _ in rx.finditer(text))
+    match = rx.search(text)
+    if value == "exists":
+        return match is not None
+    if match is None:
+        return None
+    found = match.group(1) if rx.groups else match.group(0)
+    return found.decode("utf-8", errors="replace") if isinstance(found, bytes) else found
+
+
+def _css_value(soup: Node, selector: str, value: FeatureValue) -> Any:
+    if value == "count":
+        return len(soup.css(selector))
+    node = soup.css_first(selector)
+    if value == "exists":
+        return node is not None
+    return get_text(node, strip=True) if node is not None else None
+
+
+def _markup(raw_html: str | bytes | None, soup: Node) -> str:
+    """The markup as ``str`` for patterns without a bytes twin (or Node input)."""
+    if isinstance(raw_html, bytes):
+        return raw_html.decode("utf-8", errors="replace")
+    if raw_html is not None:
+        return raw_html
+    return soup.html or ""
+
+
+def extract_extra_features(
+    raw_html: str | bytes | None, soup: Node, index: DocumentIndex | None = None
+) -> dict[str, Any]:
+    """Every registered feature's value for one SERP, in registration order."""
+    extra: dict[str, Any] = {}
+    decoded: str | None = None
+    for name, feature in EXTRA_FEATURES.items():
+        try:
+            if feature.func is not None:
+                extra[name] = feature.func(soup, index)
+            elif feature.css is not None:
+                extra[name] = _css_value(soup, feature.css, feature.value)
+            elif feature.pattern is not None:
+                if isinstance(raw_html, bytes) and feature.pattern_bytes is not None:
+                    text: str | bytes = raw_html
+                    rx: re.Pattern = feature.pattern_bytes
+                else:
+                    if decoded is None:
+                        decoded = _markup(raw_html, soup)
+                    text, rx = decoded, feature.pattern
+                extra[name] = _pattern_value(rx, text, feature.value)
+        except ParseTimeout:
+            raise  # the parse's time budget, not the probe, ran out
+        except Exception:
+            log.exception(f"extra feature {name!r} failed")
+            extra[name] = None
+    return extra
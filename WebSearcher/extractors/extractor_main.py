@@ -4,6 +4,7 @@ from typing import Any
 
 from selectolax.lexbor import LexborNode as Node
 
+from .._document_index import DocumentIndex
 from .._slx import _iter_text_fragments, class_tokens, get_text, has_text, subtree_css
 
 log = logging.getLogger(__name__)
@@ -84,9 +85,11 @@ def _find_all_with_class(node: Node, css: str, *, filter_empty: bool = True) ->
 
 
 class ExtractorMain:
-    def __init__(self, soup: Node | None, components):
+    def __init__(self, soup: Node | None, components, index: DocumentIndex | None = None):
         self.soup: Node | None = soup
         self.components = components
+        # Ads are detached through the index so it can discount them later.
+        self.index = index if index is not None else DocumentIndex()
 
         self.layout_divs: dict[str, Any] = {
             "rso": None,
@@ -154,21 +157,21 @@ class ExtractorMain:
         assert self.soup is not None
         ads = self.soup.css_first('div[id="atvcap"]')
         if ads is not None and (get_text(ads) or ""):
-            ads.remove(recursive=False)
+            self.index.detach(ads)
             self.components.add_component(ads, section="main", type="shopping_ads")
 
     def _ads_top(self):
         assert self.soup is not None
         ads = self.soup.css_first('div[id="tads"]')
         if ads is not None and (get_text(ads) or ""):
-            ads.remove(recursive=False)
+            self.index.detach(ads)
             self.components.add_component(ads, section="main", type="ad")
 
     def _ads_bottom(self):
         assert self.soup is not None
         ads = self.soup.css_first('div[id="tadsb"]')
         if ads is not None and (get_text(ads) or ""):
-            ads.remove(recursive=False)
+            self.index.detach(ads)
             self.components.add_component(ads, section="main", type="ad")
 
     def _main_column(self, drop_tags: set | None = None):
@@ -2,13 +2,16 @@ import logging
 
 from selectolax.lexbor import LexborNode as Node
 
+from .._document_index import DocumentIndex
+
 log = logging.getLogger(__name__)
 
 
 class ExtractorRightHandSide:
-    def __init__(self, soup: Node | None, components):
+    def __init__(self, soup: Node | None, components, index: DocumentIndex | None = None):
         self.soup: Node | None = soup
         self.components = components
+        self.index = index if index is not None else DocumentIndex()
         self.rhs: dict = {}
 
     def extract(self):
@@ -17,7 +20,7 @@ class ExtractorRightHandSide:
         rhs_div = self.soup.css_first('div[id="rhs"]')
         if rhs_div is None:
             return
-        rhs_div.remove(recursive=False)
+        self.index.detach(rhs_div)
         layout, div = self._get_layout(rhs_div)
         if layout:
             log.debug(f"rhs_layout: {layout}")
@@ -1,10 +1,13 @@
 import re
+from collections.abc import Callable
 
 from selectolax.lexbor import LexborNode as Node
 
 from .. import utils
+from .._document_index import DocumentIndex
 from .._slx import get_text
 from ..models.features import SERPFeatures
+from .extra_features import EXTRA_FEATURES, extract_extra_features
 
 # The raw-HTML path searches the original markup. The soup path scopes each probe
 # to the smallest relevant element so the whole document is never re-serialized
@@ -22,6 +25,14 @@ RX_RESULT_COUNT = re.compile(r"([0-9,]+) results")
 RX_RESULT_TIME = re.compile(r"\(([0-9.]+)s?\s*(?:seconds)?\)")
 RX_LANGUAGE = re.compile(r'<html[^>]*\slang="([^"]+)"')
 
+# Bytes twins of the raw-markup patterns: ``parse_serp`` hands ``bytes`` input
+# through undecoded, so the scans run on the buffer and only the matched groups
+# are decoded. The script window is widened to 4 bytes per character (UTF-8's
+# maximum) and cut back to 80 characters after decoding, matching the str form.
+RX_RESULT_STATS_B = re.compile(RX_RESULT_STATS.pattern.encode())
+RX_RESULT_STATS_SCRIPT_B = re.compile(rb'result-stats\\?"?>.{0,320}')
+RX_LANGUAGE_B = re.compile(RX_LANGUAGE.pattern.encode())
+
 # The no-results and query-truncation notices are parsed into `notice` components
 # (see parsers/components/notices.py), not features. server_error stays a flag: it
 # is bare error-page chrome, not a component.
@@ -30,6 +41,79 @@ NOTICE_SERVER_ERROR = (
     "while processing your request."
 )
 INFINITY_SCROLL_SPAN = '<span class="RVQdVd">More results</span>'
+NOTICE_SERVER_ERROR_B = NOTICE_SERVER_ERROR.encode()
+INFINITY_SCROLL_SPAN_B = INFINITY_SCROLL_SPAN.encode()
+
+# Raw-markup scan -----------------------------------------------------------------
+# ``scan_html`` locates every raw-markup feature in one call. Both result-stats
+# patterns contain the literal ``result-stats`` (the div form at a fixed offset),
+# so one substring walk over its occurrences finds the first match of each; the
+# fixed literals are one substring search apiece. A single alternation regex over
+# all six was measured first: CPython's ``re`` loses its literal-prefix search on
+# an alternation and ran ~25x slower than these scans on captured SERPs.
+RESULT_STATS_ANCHOR = "result-stats"
+RESULT_STATS_DIV_OFFSET = len('<div id="')
+
+
+def scan_html(html: str | bytes) -> dict[str, int | None]:
+    """Offset of each raw-markup feature's first match in ``html``, or None.
+
+    ``result_stats`` is the rendered ``#result-stats`` div (``RX_RESULT_STATS``);
+    ``result_stats_script`` its escaped ``<script>`` copy, set only when the div
+    is absent, as the fallback is only read then. ``language`` is the
+    ``<html lang=...>`` tag; ``server_error``, ``infinity_scroll``, and
+    ``captcha`` are their literals.
+    """
+    if isinstance(html, bytes):
+        return _scan(
+            html,
+            RESULT_STATS_ANCHOR.encode(),
+            RX_RESULT_STATS_B,
+            RX_RESULT_STATS_SCRIPT_B,
+            RX_LANGUAGE_B,
+            (NOTICE_SERVER_ERROR_B, INFINITY_SCROLL_SPAN_B, b"CAPTCHA"),
+        )
+    return _scan(
+        html,
+        RESULT_STATS_ANCHOR,
+        RX_RESULT_STATS,
+        RX_RESULT_STATS_SCRIPT,
+        RX_LANGUAGE,
+        (NOTICE_SERVER_ERROR, INFINITY_SCROLL_SPAN, "CAPTCHA"),
+    )
+
+
+def _scan[S: (str, bytes)](
+    html: S,
+    anchor: S,
+    rx_stats: re.Pattern[S],
+    rx_script: re.Pattern[S],
+    rx_lang: re.Pattern[S],
+    literals: tuple[S, S, S],
+) -> dict[str, int | None]:
+    # ``str.find``/``bytes.find``: the two-way substring search, far faster
+    # than a literal ``re`` search over a large buffer.
+    find: Callable[..., int] = html.find
+    stats = script = None
+    pos = find(anchor)
+    while pos != -1:
+        start = pos - RESULT_STATS_DIV_OFFSET
+        if start >= 0 and rx_stats.match(html, start):
+            stats, script = start, None
+            break
+        if script is None and rx_script.match(html, pos):
+            script = pos
+        pos = find(anchor, pos + 1)
+    lang_match = rx_lang.search(html)
+    server_error, infinity_scroll, captcha = (find(literal) for literal in literals)
+    return {
+        "result_stats": stats,
+        "result_stats_script": script,
+        "language": lang_match.start() if lang_match else None,
+        "server_error": None if server_error == -1 else server_error,
+        "infinity_scroll": None if infinity_scroll == -1 else infinity_scroll,
+        "captcha": None if captcha == -1 else captcha,
+    }
 
 
 class FeatureExtractor:
@@ -38,44 +122,96 @@ class FeatureExtractor:
         html_or_soup: str | bytes | Node,
         soup: Node | None = None,
         url: str | None = None,
+        index: DocumentIndex | None = None,
+        extra: dict | None = None,
     ) -> SERPFeatures:
         """Extract SERP features. ``parse_serp`` passes both the raw HTML and
         the already-parsed soup so the regex path skips a re-parse and the
         shared structural probes (lb, captcha) reuse the soup. ``url`` is the
         response's final URL when known -- a ``/sorry/`` redirect marks a
-        CAPTCHA even when the captured HTML is empty."""
+        CAPTCHA even when the captured HTML is empty. Registered extra
+        features (see ``extra_features.py``) run on the same markup and soup;
+        ``index`` is the parse's ``DocumentIndex``, handed to their callables.
+        ``extra`` is their values computed beforehand (``parse_serp`` runs them
+        on the document before extraction and parsing change it)."""
         if isinstance(html_or_soup, Node):
-            raw_html: str | None = None
+            raw_html: str | bytes | None = None
+            scan: dict[str, int | None] = {}
             soup = html_or_soup
             features = FeatureExtractor._extract_from_soup(soup)
         else:
-            raw_html = (
-                html_or_soup
-                if isinstance(html_or_soup, str)
-                else html_or_soup.decode("utf-8", errors="replace")
-            )
+            # Bytes stay bytes: the regex path scans the buffer directly.
+            raw_html = html_or_soup
             if soup is None:
                 soup = utils.make_soup(raw_html)
-            features = FeatureExtractor._extract_from_html(raw_html)
+            scan = scan_html(raw_html)
+            features = FeatureExtractor._extract_from_html(raw_html, scan)
 
         # Structural probes shared by both paths (cheap, scoped lookups).
         lb = soup.css_first('div[id="lb"]')
         features["overlay_precise_location"] = bool(
             lb is not None and "precise location" in (get_text(lb) or "").lower()
         )
-        features["captcha"] = utils.has_captcha(soup, html=raw_html) or utils.is_sorry_redirect(url)
+        # The scan already rules out the common no-captcha case for raw input.
+        if raw_html is not None and scan["captcha"] is None:
+            captcha = False
+        else:
+            captcha = utils.has_captcha(soup)
+        features["captcha"] = captcha or utils.is_sorry_redirect(url)
+        if extra is not None:
+            features["extra"] = extra
+        elif EXTRA_FEATURES:
+            features["extra"] = extract_extra_features(raw_html, soup, index)
         return SERPFeatures(**features)
 
     @staticmethod
-    def _find_result_stats_html(raw_html: str) -> str | None:
+    def extract_blocked_features(
+        raw_html: str | bytes | None, url: str | None = None
+    ) -> SERPFeatures:
+        """Features of a page ``utils.is_blocked`` rules out, from the raw markup
+        alone: what a full parse reports for it, without building a DOM. Such a
+        page has no ``#rso`` (``main_layout="no-rso"``); registered extra
+        features are not computed."""
+        features = FeatureExtractor._extract_from_html(raw_html or "")
+        features["captcha"] = utils.is_captcha_page(raw_html) or utils.is_sorry_redirect(url)
+        return SERPFeatures(**features, main_layout="no-rso")
+
+    @staticmethod
+    def _find_result_stats_html(
+        raw_html: str | bytes, scan: dict[str, int | None] | None = None
+    ) -> str | None:
         """Locate the result-stats markup in the raw SERP HTML: the rendered
         `#result-stats` div when present, else -- as a fallback -- its escaped
-        copy inside an inline `<script>` (see RX_RESULT_STATS_SCRIPT)."""
-        stats_match = RX_RESULT_STATS.search(raw_html)
-        if stats_match:
-            return stats_match.group(0)
-        script_match = RX_RESULT_STATS_SCRIPT.search(raw_html)
-        return script_match.group(0) if script_match else None
+        copy inside an inline `<script>` (see RX_RESULT_STATS_SCRIPT). ``scan``
+        is ``scan_html(raw_html)`` when the caller already has it."""
+        if scan is None:
+            scan = scan_html(raw_html)
+        if isinstance(raw_html, bytes):
+            return FeatureExtractor._find_result_stats_bytes(raw_html, scan)
+        stats_at, script_at = scan["result_stats"], scan["result_stats_script"]
+        if stats_at is not None:
+            stats_match = RX_RESULT_STATS.match(raw_html, stats_at)
+        elif script_at is not None:
+            stats_match = RX_RESULT_STATS_SCRIPT.match(raw_html, script_at)
+        else:
+            return None
+        return stats_match.group(0) if stats_match else None
+
+    @staticmethod
+    def _find_result_stats_bytes(raw_html: bytes, scan: dict[str, int | None]) -> str | None:
+        """``_find_result_stats_html`` over undecoded markup; only the match is decoded."""
+        stats_at, script_at = scan["result_stats"], scan["result_stats_script"]
+        if stats_at is not None:
+            stats_match = RX_RESULT_STATS_B.match(raw_html, stats_at)
+            return stats_match.group(0).decode("utf-8", errors="replace") if stats_match else None
+        script_match = (
+            RX_RESULT_STATS_SCRIPT_B.match(raw_html, script_at) if script_at is not None else None
+        )
+        if not script_match:
+            return None
+        # The marker is ASCII and ends at the first ``>``; keep 80 chars after it.
+        window = script_match.group(0).decode("utf-8", errors="replace")
+        return window[: window.index(">") + 81]
 
     @staticmethod
     def _parse_result_estimate(stats_html: str | None) -> dict:
@@ -92,15 +228,28 @@ class FeatureExtractor:
         }
 
     @staticmethod
-    def _extract_from_html(html: str) -> dict:
-        """Regex over the original markup -- no re-serialization cost."""
-        stats_html = FeatureExtractor._find_result_stats_html(html)
-        lang_match = RX_LANGUAGE.search(html)
+    def _extract_from_html(html: str | bytes, scan: dict[str, int | None] | None = None) -> dict:
+        """Features from the original markup via one ``scan_html`` pass -- no
+        re-serialization cost. ``bytes`` are scanned undecoded; only the
+        extracted fields are decoded."""
+        if scan is None:
+            scan = scan_html(html)
+        stats_html = FeatureExtractor._find_result_stats_html(html, scan)
+        language = None
+        if scan["language"] is not None:
+            if isinstance(html, bytes):
+                lang_match = RX_LANGUAGE_B.match(html, scan["language"])
+                language = (
+                    lang_match.group(1).decode("utf-8", errors="replace") if lang_match else None
+                )
+            else:
+                lang_match = RX_LANGUAGE.match(html, scan["language"])
+                language = lang_match.group(1) if lang_match else None
         return {
             **FeatureExtractor._parse_result_estimate(stats_html),
-            "language": lang_match.group(1) if lang_match else None,
-            "server_error": NOTICE_SERVER_ERROR in html,
-            "infinity_scroll": INFINITY_SCROLL_SPAN in html,
+            "language": language,
+            "server_error": scan["server_error"] is not None,
+            "infinity_scroll": scan["infinity_scroll"] is not None,
         }
 
     @staticmethod
@@ -0,0 +1,192 @@
+"""Columnar output for parsed results: Arrow record batches and Parquet files.
+
+Takes the dicts ``parse_serp``/``parse_serps`` yield and the records
+``SearchEngine.to_record`` builds -- anything with a ``results`` list -- and
+writes one row per result, in the column order ``save_results`` uses: the
+result fields, then the SERP's ``crawl_id``/``serp_id``/``version`` (null when
+the input doesn't carry them). Rows may be dicts or ``ResultRecord``s
+(``output="struct"``).
+
+- ``section``, ``type``, ``sub_type``, ``crawl_id`` and ``version`` are
+  dictionary-encoded: a handful of distinct values over millions of rows.
+- ``details`` is a JSON string column (orjson). Its shape varies by result
+  type, so no single struct type fits it; query it with DuckDB's JSON
+  functions or polars' ``str.json_decode``.
+- Features stay out: they are per SERP, not per result. Join on ``serp_id``.
+
+Rows are buffered column-wise and written a row group at a time
+(``row_group_size`` rows), never per record.
+
+    with ParquetWriter("results.parquet") as writer:
+        for parsed in ws.parse_serps(records):
+            writer.write(parsed)
+
+Requires the ``arrow`` extra: ``pip install "WebSearcher[arrow]"``.
+"""
+
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import orjson
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError as e:
+    raise ImportError('WebSearcher.io requires pyarrow: pip install "WebSearcher[arrow]"') from e
+
+from .models.data import ResultRecord
+
+DEFAULT_ROW_GROUP_SIZE = 100_000
+
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+RESULTS_SCHEMA = pa.schema(
+    [
+        ("section", _CATEGORY),
+        ("cmpt_rank", pa.int32()),
+        ("sub_rank", pa.int32()),
+        ("type", _CATEGORY),
+        ("sub_type", _CATEGORY),
+        ("title", pa.string()),
+        ("url", pa.string()),
+        ("text", pa.string()),
+        ("cite", pa.string()),
+        ("details", pa.string()),
+        ("serp_rank", pa.int32()),
+        ("crawl_id", _CATEGORY),
+        ("serp_id", pa.string()),
+        ("version", _CATEGORY),
+    ]
+)
+
+_RESULT_FIELDS = RESULTS_SCHEMA.names[:11]
+_META_FIELDS = RESULTS_SCHEMA.names[11:]
+
+
+class _ColumnBuffer:
+    """Result rows accumulated column by column."""
+
+    def __init__(self):
+        self.columns: list[list] = [[] for _ in RESULTS_SCHEMA.names]
+        self.n_rows = 0
+
+    def add(self, record: dict) -> None:
+        meta = [record.get(name) for name in _META_FIELDS]
+        columns = self.columns
+        for row in record.get("results") or ():
+            if isinstance(row, ResultRecord):
+                values = [getattr(row, name) for name in _RESULT_FIELDS]
+            else:
+                values = [row.get(name) for name in _RESULT_FIELDS]
+            details = values[9]
+            values[9] = orjson.dumps(details) if details is not None else None
+            for column, value in zip(columns, values + meta):
+                column.append(value)
+            self.n_rows += 1
+
+    def take(self) -> pa.RecordBatch:
+        """The buffered rows as one record batch; the buffer is emptied."""
+        arrays = [
+            pa.array(column, type=field.type) for column, field in zip(self.columns, RESULTS_SCHEMA)
+        ]
+        self.columns = [[] for _ in RESULTS_SCHEMA.names]
+        self.n_rows = 0
+        return pa.RecordBatch.from_arrays(arrays, schema=RESULTS_SCHEMA)
+
+
+def to_record_batch(records: Iterable[dict]) -> pa.RecordBatch:
+    """All of ``records``' results as one record batch."""
+    buffer = _ColumnBuffer()
+    for record in records:
+        buffer.add(record)
+    return buffer.take()
+
+
+def iter_record_batches(
+    records: Iterable[dict], batch_size: int = DEFAULT_ROW_GROUP_SIZE
+) -> Iterator[pa.RecordBatch]:
+    """``records``' results as record batches of about ``batch_size`` rows (a
+    record's results are never split across batches)."""
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    buffer = _ColumnBuffer()
+    for record in records:
+        buffer.add(record)
+        if buffer.n_rows >= batch_size:
+            yield buffer.take()
+    if buffer.n_rows:
+        yield buffer.take()
+
+
+class ParquetWriter:
+    """Write parsed results to a Parquet file, one row group per
+    ``row_group_size`` buffered rows.
+
+    Args:
+        path: Output file (overwritten).
+        row_group_size: Rows buffered before a row group is written.
+        compression: Parquet codec (``"zstd"``, ``"snappy"``, ``"none"``, ...).
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "zstd",
+    ):
+        if row_group_size < 1:
+            raise ValueError(f"row_group_size must be >= 1, got {row_group_size}")
+        self.path = Path(path)
+        self.row_group_size = row_group_size
+        self.n_rows = 0
+        self._buffer = _ColumnBuffer()
+        self._writer: pq.ParquetWriter | None = pq.ParquetWriter(
+            self.path, RESULTS_SCHEMA, compression=compression
+        )
+
+    def __enter__(self) -> "ParquetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write(self, record: dict) -> None:
+        """Buffer one record's results, writing a row group once enough are held."""
+        self._buffer.add(record)
+        if self._buffer.n_rows >= self.row_group_size:
+            self.flush()
+
+    def write_all(self, records: Iterable[dict]) -> None:
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        """Write the buffered rows as a row group (nothing if none are held)."""
+        if not self._buffer.n_rows:
+            return
+        if self._writer is None:
+            raise ValueError(f"write to closed ParquetWriter: {self.path}")
+        batch = self._buffer.take()
+        self._writer.write_batch(batch, row_group_size=batch.num_rows)
+        self.n_rows += batch.num_rows
+
+    def close(self) -> None:
+        """Flush and finalize the file. Safe to call twice."""
+        if self._writer is None:
+            return
+        self.flush()
+        self._writer.close()
+        self._writer = None
+
+
+def write_parquet(
+    records: Iterable[dict],
+    path: str | Path,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    compression: str = "zstd",
+) -> int:
+    """Write ``records``' results to a Parquet file; returns the rows written."""
+    with ParquetWriter(path, row_group_size, compression) as writer:
+        writer.write_all(records)
+    return writer.n_rows
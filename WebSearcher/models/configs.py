@@ -58,6 +58,15 @@ class RequestsConfig(BaseConfig):
         return sesh
 
 
+class WriterConfig(BaseConfig):
+    """Buffering for the files ``SearchEngine.save_*`` append to (see
+    ``utils.RecordWriter``)."""
+
+    flush_every: int = 1
+    flush_interval: float = 5.0
+    fsync: str = "never"
+
+
 class SearchMethod(Enum):
     REQUESTS = "requests"
     PATCHRIGHT = "patchright"
@@ -85,3 +94,4 @@ class SearchConfig(BaseConfig):
     log: LogConfig = Field(default_factory=LogConfig)
     requests: RequestsConfig = Field(default_factory=RequestsConfig)
     patchright: PatchrightConfig = Field(default_factory=PatchrightConfig)
+    writer: WriterConfig = Field(default_factory=WriterConfig)
@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+
 from pydantic import BaseModel, Field, model_validator
 
 # Closed vocabulary of parse-error messages, recorded in a result's
@@ -13,6 +15,7 @@ ERR_NO_SUBCOMPONENTS = "no subcomponents parsed"
 ERR_EXCEPTION = "parsing exception"  # "parsing exception: <traceback>"
 ERR_UNKNOWN_SUBTYPE = "unknown sub_type"  # "unknown sub_type: <value>"
 ERR_NO_HOTELS = "no hotel items found"
+ERR_TIMEOUT = "parsing timeout"  # parser cut off by its time budget (parsers/budget.py)
 
 
 def error_details(error: str) -> dict:
@@ -92,6 +95,46 @@ class BaseResult(BaseModel):
         return self
 
 
+@dataclass(slots=True)
+class ResultRecord:
+    """A parsed result row as a slotted record (``parse_serp(output="struct")``).
+
+    The fields of a dict row, in the same order: ``section`` and ``cmpt_rank``,
+    the :class:`BaseResult` fields, then ``serp_rank``. A record stores them in
+    fixed slots rather than a per-row hash table, a fraction of a dict row's
+    memory when millions of rows are held at once. ``to_dict`` rebuilds the dict
+    row around the same values (``details`` is shared, not copied); orjson
+    serializes a record as that dict.
+    """
+
+    section: str
+    cmpt_rank: int
+    sub_rank: int
+    type: str
+    sub_type: str | None
+    title: str | None
+    url: str | None
+    text: str | None
+    cite: str | None
+    details: dict | None
+    serp_rank: int
+
+    def to_dict(self) -> dict:
+        return {
+            "section": self.section,
+            "cmpt_rank": self.cmpt_rank,
+            "sub_rank": self.sub_rank,
+            "type": self.type,
+            "sub_type": self.sub_type,
+            "title": self.title,
+            "url": self.url,
+            "text": self.text,
+            "cite": self.cite,
+            "details": self.details,
+            "serp_rank": self.serp_rank,
+        }
+
+
 class BaseSERP(BaseModel):
     """
     Represents a complete Search Engine Results Page (SERP).
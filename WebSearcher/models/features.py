@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Any
+
+from pydantic import BaseModel, Field, model_serializer
 
 
 class SERPFeatures(BaseModel):
@@ -17,3 +19,13 @@ class SERPFeatures(BaseModel):
     # Main-section layout label assigned during extraction, e.g. "standard",
     # "standard-overview". None when no layout was detected.
     main_layout: str | None = None
+    # User-registered features (``extractors/extra_features.py``), by name.
+    # Omitted from dumps when none are registered, so saved rows don't change.
+    extra: dict[str, Any] = Field(default_factory=dict)
+
+    @model_serializer(mode="wrap")
+    def _omit_empty_extra(self, handler) -> dict:
+        data = handler(self)
+        if not self.extra:
+            data.pop("extra", None)
+        return data
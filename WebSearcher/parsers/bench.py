@@ -18,12 +18,13 @@ root:
 
     uv run python -m WebSearcher.parsers.bench --iterations 50 --runs 5
     uv run python -m WebSearcher.parsers.bench --profile
+    uv run python -m WebSearcher.parsers.bench --classifier-stats
 """
 
 import argparse
-import bz2
 import cProfile
 import gc
+import itertools
 import logging
 import platform
 import pstats
@@ -38,6 +39,8 @@ from typing import Any
 import orjson
 
 import WebSearcher as ws
+from WebSearcher import utils
+from WebSearcher.classifiers import collect_classifier_stats
 
 REPO_ROOT = Path(__file__).resolve().parent.parent.parent
 FIXTURES_DIR = REPO_ROOT / "tests" / "fixtures"
@@ -48,12 +51,13 @@ SCHEMA_VERSION = 1
 
 
 def load_records(fixtures: list[Path], limit: int | None) -> list[dict]:
-    """Load SERP records from one or more bz2-compressed JSON-lines fixtures."""
-    records: list[dict] = []
-    for path in fixtures:
-        with bz2.open(path, "rt") as f:
-            records.extend(orjson.loads(line) for line in f)
-    return records[:limit] if limit else records
+    """Load SERP records from one or more bz2-compressed JSON-lines fixtures.
+
+    Streams the files and stops reading at ``limit``, so a capped run over a
+    large crawl file never decompresses (or holds) the records past the cap.
+    """
+    records = itertools.chain.from_iterable(utils.iter_lines(path) for path in fixtures)
+    return list(itertools.islice(records, limit))
 
 
 def mad(values: list[float], center: float) -> float:
@@ -246,6 +250,41 @@ def run_profile(
         )
 
 
+def run_classifier_stats(htmls: list[str], meta: dict, save: bool) -> None:
+    """Parse the corpus once with classifier statistics on and report, per
+    classifier in chain order, how often it was reached, gate-skipped, matched,
+    or returned unknown, and the time it spent."""
+    print(f"\nClassifier statistics over {len(htmls)} SERPs\n")
+    with collect_classifier_stats() as stats:
+        for html in htmls:
+            ws.parse_serp(html)
+    rows = stats.rows()
+    header = f"  {'chain':<7}{'classifier':<42}{'reached':>8}{'skipped':>8}{'matched':>8}{'unknown':>8}{'ms':>9}{'us/run':>8}"
+    print(header)
+    for r in rows:
+        ran = r["matched"] + r["unknown"]
+        per_run = r["seconds"] / ran * 1e6 if ran else 0.0
+        print(
+            f"  {r['chain']:<7}{r['classifier']:<42}{r['reached']:>8}{r['skipped']:>8}"
+            f"{r['matched']:>8}{r['unknown']:>8}{r['seconds'] * 1000:>9.2f}{per_run:>8.1f}"
+        )
+    # Ran on components but never typed one: pure cost at this position.
+    idle = [f"{r['chain']}:{r['classifier']}" for r in rows if r["unknown"] and not r["matched"]]
+    if idle:
+        print(f"\nRan but never matched: {', '.join(idle)}")
+
+    if save:
+        record = {
+            **meta,
+            "kind": "classifier_stats",
+            "classifiers": [{**r, "seconds": round(r["seconds"], 6)} for r in rows],
+        }
+        append_result(record)
+        print(
+            f"\nSaved classifier stats row to {RESULTS_PATH.relative_to(REPO_ROOT)} (id={meta['id']})"
+        )
+
+
 def main(argv: list[str] | None = None) -> None:
     """Benchmark or profile parse_serp over the fixture corpus."""
     p = argparse.ArgumentParser(
@@ -265,6 +304,11 @@ def main(argv: list[str] | None = None) -> None:
     )
     p.add_argument("--limit", type=int, default=0, help="Cap number of SERPs (0 = all)")
     p.add_argument("--profile", action="store_true", help="Run cProfile instead of timing")
+    p.add_argument(
+        "--classifier-stats",
+        action="store_true",
+        help="Report per-classifier reached/skipped/matched/unknown counts and time",
+    )
     p.add_argument(
         "--profile-sort", default="tottime", help="cProfile sort key (tottime|cumulative)"
     )
@@ -306,6 +350,10 @@ def main(argv: list[str] | None = None) -> None:
     for html in htmls:
         ws.parse_serp(html)
 
+    if args.classifier_stats:
+        run_classifier_stats(htmls, run_metadata(paths, len(htmls), 1), args.save)
+        return
+
     meta = run_metadata(paths, len(htmls), args.iterations)
 
     if args.profile:
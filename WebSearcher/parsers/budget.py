@@ -0,0 +1,113 @@
+"""Time budgets for ``parse_serp(..., timeout=, component_timeout=)``.
+
+``Component.run_parser`` already turns a parser exception into an error row,
+but a parser stuck in a quadratic walk on a malformed page never raises -- it
+pins a core, and in a ``parse_serps`` batch it holds up its whole chunk. A
+``ParseBudget`` bounds that:
+
+- ``timeout`` is the whole SERP's budget (extraction, classification, and the
+  component parsers). Running out during extraction or classification raises
+  ``ParseTimeout`` -- there is no partial parse to return. Running out during
+  the parse stage cuts off the running parser, and every component not yet
+  parsed gets a timeout error row instead of running.
+- ``component_timeout`` caps each component parser. A parser that exceeds it
+  is cut off and emits an ``ERR_TIMEOUT`` error row, like ``ERR_EXCEPTION``.
+
+Cutting a parser off uses ``SIGALRM`` (``signal.setitimer``), which Python only
+delivers to the main thread -- where ``parse_serps`` workers parse. Elsewhere
+(a thread, Windows, or an application that already armed ``ITIMER_REAL``) the
+budget is checked between stages and components instead: a running parser
+finishes, but nothing starts after the SERP budget is spent. The alarm fires
+between bytecodes, so a single long call into lexbor finishes before it lands.
+"""
+
+import signal
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+class ParseTimeout(TimeoutError):
+    """A parse (or one component's parser) ran past its time budget."""
+
+
+def _on_alarm(signum, frame):
+    raise ParseTimeout("parse time budget exceeded")
+
+
+def _can_alarm() -> bool:
+    """True if an interval timer can interrupt the current parse: the platform
+    has ``setitimer``, we're on the main thread, and no one else's timer is
+    armed (we would clobber it)."""
+    return (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+        and signal.getitimer(signal.ITIMER_REAL)[0] == 0
+    )
+
+
+@contextmanager
+def time_limit(seconds: float | None) -> Iterator[None]:
+    """Raise ``ParseTimeout`` in the block if it runs over ``seconds``.
+
+    ``None`` means no limit. A no-op (the block runs to completion) where the
+    alarm is unavailable -- see the module docstring.
+    """
+    if seconds is None or not _can_alarm():
+        yield
+        return
+    if seconds <= 0:
+        raise ParseTimeout("parse time budget exceeded")
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        # Nested so the handler is restored even if the alarm lands here.
+        try:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        finally:
+            signal.signal(signal.SIGALRM, previous)
+
+
+class ParseBudget:
+    """A SERP-wide deadline plus a per-component cap (seconds; None = unbounded)."""
+
+    def __init__(self, timeout: float | None = None, component_timeout: float | None = None):
+        for name, value in (("timeout", timeout), ("component_timeout", component_timeout)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be > 0, got {value}")
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.component_timeout = component_timeout
+        self.timed_out = False
+
+    def remaining(self) -> float | None:
+        """Seconds left on the SERP budget, or None when unbounded."""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def check(self) -> None:
+        """Raise ``ParseTimeout`` if the SERP budget is spent (the cooperative
+        check between stages)."""
+        if self.expired():
+            self.timed_out = True
+            raise ParseTimeout("parse time budget exceeded")
+
+    def serp(self):
+        """Limit a block to the rest of the SERP budget."""
+        return time_limit(self.remaining())
+
+    def component(self):
+        """Limit one component parser to its cap or the rest of the SERP
+        budget, whichever is sooner."""
+        limits = [s for s in (self.component_timeout, self.remaining()) if s is not None]
+        return time_limit(min(limits) if limits else None)
+
+
+NULL_BUDGET = ParseBudget()
@@ -0,0 +1,182 @@
+"""On-disk, content-addressed cache of ``parse_serp`` output.
+
+Re-running the same analysis over the same crawl reparses identical HTML every
+time. ``ParseCache`` stores each parse's ``{"features", "results"}`` in a SQLite
+file keyed on a hash of the raw HTML (plus the response URL, which feeds the
+captcha flag) and the parser fingerprint -- ``WebSearcher.__version__`` joined
+with a digest of the parser registry and the parse-pipeline source. A hit
+returns the stored parse without building a DOM; any parser change (a release,
+or a local edit in a dev checkout) changes the fingerprint, so stale entries
+are never served and simply age out under the LRU bound.
+
+    cache = ParseCache("~/.cache/websearcher/parse.sqlite")
+    parsed = ws.parse_serp(html, cache=cache)
+
+Entries hold the JSON round-trip of the parse -- exactly what ``save_*``
+writes -- so a cached ``details`` payload carries lists where a fresh parse may
+carry tuples. Only raw HTML (``str``/``bytes``) is cached; a pre-built ``Node``
+has no stable key and always parses fresh.
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+import orjson
+
+from .. import __version__
+from ..extractors.extra_features import extra_features_fingerprint
+from .component_types import COMPONENT_TYPES
+from .components import PARSERS
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GiB of stored parses
+
+# Packages / modules whose source determines parse output. Edits anywhere in
+# them change the fingerprint; searchers, demos, and locations do not.
+_FINGERPRINT_SOURCES = ("parsers", "classifiers", "extractors", "models", "_slx.py", "utils.py")
+
+# Evicting needs a ``SUM(size)`` scan, so it runs once per this many writes
+# rather than on every put.
+_EVICT_EVERY = 64
+
+
+@functools.cache
+def parser_fingerprint() -> str:
+    """Digest of everything that determines ``parse_serp`` output.
+
+    Joins ``__version__``, the parser registry (type name -> entry parser) and
+    the component-type registry, and the source of the parse-pipeline modules.
+    Computed once per process.
+    """
+    h = hashlib.sha256(__version__.encode())
+    for name, func in sorted(PARSERS.items()):
+        h.update(f"{name}={func.__module__}.{func.__qualname__};".encode())
+    for ctype in COMPONENT_TYPES:
+        h.update(repr(ctype).encode())
+    root = Path(__file__).resolve().parent.parent
+    for entry in _FINGERPRINT_SOURCES:
+        path = root / entry
+        files = sorted(path.rglob("*.py")) if path.is_dir() else [path]
+        for fp in files:
+            h.update(fp.relative_to(root).as_posix().encode())
+            h.update(fp.read_bytes())
+    return h.hexdigest()
+
+
+class ParseCache:
+    """Size-bounded LRU cache of parses in a SQLite file.
+
+    Safe to share between processes (``parse_serps`` workers, concurrent
+    notebooks): the database runs in WAL mode and the object pickles as its
+    settings, reconnecting lazily in each process.
+
+    Args:
+        path: SQLite file; parent directories are created.
+        max_bytes: Bound on stored parse bytes. Least recently used entries are
+            evicted past it.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path).expanduser()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._writes = 0
+
+    def __getstate__(self) -> dict:
+        return {"path": self.path, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["path"], state["max_bytes"])
+
+    def __enter__(self) -> "ParseCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._db().execute("SELECT COUNT(*) FROM parses").fetchone()[0]
+
+    def _db(self) -> sqlite3.Connection:
+        # A connection inherited across fork() is unusable; reconnect per process.
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS parses ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS parses_accessed ON parses (accessed)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    @staticmethod
+    def key(html: str | bytes, url: str | None = None) -> str:
+        """Cache key for one SERP: HTML + URL + parser fingerprint (and the
+        registered extra features, which change the parse's ``features``)."""
+        if isinstance(html, str):
+            html = html.encode("utf-8", errors="surrogatepass")
+        h = hashlib.sha256(parser_fingerprint().encode())
+        h.update(extra_features_fingerprint().encode())
+        h.update(b"\0" + (url or "").encode() + b"\0")
+        h.update(html)
+        return h.hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        """Return the stored parse for ``key`` (refreshing its recency), or None."""
+        db = self._db()
+        row = db.execute("SELECT value FROM parses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        db.execute("UPDATE parses SET accessed = ? WHERE key = ?", (time.time(), key))
+        return orjson.loads(row[0])
+
+    def put(self, key: str, parsed: dict) -> None:
+        """Store a parse under ``key``, evicting old entries past ``max_bytes``."""
+        value = orjson.dumps(parsed)
+        self._db().execute(
+            "INSERT OR REPLACE INTO parses (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+            (key, value, len(value), time.time()),
+        )
+        self._writes += 1
+        if self._writes % _EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until under ``max_bytes``; return the count."""
+        db = self._db()
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM parses").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return 0
+        drop, freed = [], 0
+        for key, size in db.execute("SELECT key, size FROM parses ORDER BY accessed"):
+            if freed >= excess:
+                break
+            drop.append((key,))
+            freed += size
+        db.executemany("DELETE FROM parses WHERE key = ?", drop)
+        log.debug(f"parse cache evicted {len(drop):,} entries ({freed:,} bytes)")
+        return len(drop)
+
+    def clear(self) -> None:
+        self._db().execute("DELETE FROM parses")
+
+    def close(self) -> None:
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = self._pid = None
@@ -12,9 +12,11 @@ from ..models.data import (
     ERR_NO_SUBCOMPONENTS,
     ERR_NOT_IMPLEMENTED,
     ERR_NULL_TYPE,
+    ERR_TIMEOUT,
     BaseResult,
     error_details,
 )
+from .budget import NULL_BUDGET, ParseBudget, ParseTimeout
 from .components import (
     footer_parser_dict,
     header_parser_dict,
@@ -84,15 +86,33 @@ class Component:
             return main_parser_dict.get(self.type)
         return None
 
-    def run_parser(self, parser_func: Callable) -> list:
+    def run_parser(self, parser_func: Callable, budget: ParseBudget = NULL_BUDGET) -> list:
         log.debug(f"parsing: {self.cmpt_rank} | {self.section} | {self.type}")
         try:
-            parsed_list = parser_func(self.elem)
+            with budget.component():
+                parsed_list = parser_func(self.elem)
+        except ParseTimeout:
+            budget.timed_out = True
+            parsed_list = self.create_parsed_list_error(ERR_TIMEOUT)
         except Exception:
             parsed_list = self.create_parsed_list_error(ERR_EXCEPTION, is_exception=True)
         return parsed_list
 
-    def parse_component(self, parser_type_func: Callable | None = None):
+    def parse_component(
+        self,
+        parser_type_func: Callable | None = None,
+        validate: bool = True,
+        budget: ParseBudget = NULL_BUDGET,
+    ):
+        """Run this component's parser and record its rows in ``result_list``.
+
+        With ``validate=False`` the rows are stored as the parser returned them
+        and validated later, in one batch, by
+        ``ComponentList.export_component_results(validate=True)`` -- the
+        ``parse_serp`` path. A parser cut off by ``budget``, or not started
+        because the SERP budget is already spent, yields a ``"parsing
+        timeout"`` error row.
+        """
 
         if not self.type:
             parsed_list = self.create_parsed_list_error(ERR_NULL_TYPE)
@@ -101,8 +121,11 @@ class Component:
             parser_func = self.select_parser(parser_type_func)
             if parser_func is None:
                 parsed_list = self.create_parsed_list_error(ERR_NOT_IMPLEMENTED)
+            elif budget.expired():
+                budget.timed_out = True
+                parsed_list = self.create_parsed_list_error(ERR_TIMEOUT)
             else:
-                parsed_list = self.run_parser(parser_func)
+                parsed_list = self.run_parser(parser_func, budget)
 
                 # Check parsed_list
                 if not isinstance(parsed_list, (list, dict)):
@@ -111,7 +134,10 @@ class Component:
                     parsed_list = self.create_parsed_list_error(ERR_NO_SUBCOMPONENTS)
 
         parsed_list = parsed_list if isinstance(parsed_list, list) else [parsed_list]
-        self.add_parsed_result_list(parsed_list)
+        if validate:
+            self.add_parsed_result_list(parsed_list)
+        else:
+            self.result_list.extend(parsed_list)
 
     def create_parsed_list_error(self, error_msg: str, is_exception: bool = False) -> list:
         error_traceback = ""
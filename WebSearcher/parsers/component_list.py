@@ -1,27 +1,13 @@
-from selectolax.lexbor import LexborNode as Node
+from pydantic import TypeAdapter
 
+from .._document_index import DocumentIndex
+from ..models.data import BaseResult, ResultRecord
 from .component import Component
 
-
-def _last_descendant(elem: Node) -> Node:
-    """The last element of ``elem.css('*')`` (self + descendants, pre-order)
-    without materializing the whole subtree.
-
-    The last node a pre-order walk visits is reached by repeatedly descending to
-    the last *element* child (selectolax pseudo-nodes -- text/comment -- carry a
-    ``-``-prefixed or empty tag and are excluded from ``css('*')``, so they are
-    skipped here too). Returns ``elem`` itself when it has no element children,
-    matching ``elem.css('*')[-1]`` for a leaf.
-    """
-    node = elem
-    while True:
-        last: Node | None = None
-        for ch in node.iter(include_text=False):
-            if ch.tag and not ch.tag.startswith("-"):
-                last = ch
-        if last is None:
-            return node
-        node = last
+# One compiled validator for a whole SERP's rows: a single pydantic-core call
+# validates (and another dumps) the list, instead of a ``BaseResult`` instance
+# and ``model_dump`` round-trip per row.
+_RESULTS_ADAPTER = TypeAdapter(list[BaseResult])
 
 
 class ComponentList:
@@ -41,31 +27,19 @@ class ComponentList:
         self.components.append(component)
         self.cmpt_rank_counter += 1
 
-    def reorder_by_dom_position(self, positions):
+    def reorder_by_dom_position(self, index: DocumentIndex):
         """Reorder components by DOM position within each section.
 
-        ``positions`` maps ``mem_id -> pre-order index`` for every element in
-        the document. End ranges for main components are derived on demand from
-        the last descendant (``_last_descendant``, the last node a pre-order walk
-        of the subtree visits -- its index is the end of the subtree). When a
-        component's range contains another component's start, the ancestor's
-        effective position shifts to the first direct child positioned after the
-        nested subtree.
+        ``index`` holds the pre-extraction pre-order position of every element
+        in the document; ``index.span`` gives a main component's ``(start, end)``
+        range, ``end`` being the position of the last node a pre-order walk of
+        its subtree visits. When a component's range contains another
+        component's start, the ancestor's effective position shifts to the first
+        direct child positioned after the nested subtree.
         """
         section_order = {"header": 0, "main": 1, "footer": 2, "rhs": 3}
         main_components = [c for c in self.components if c.section == "main"]
-
-        def _range(elem):
-            start = positions.get(elem.mem_id)
-            if start is None:
-                return None
-            # The last descendant's index is the end of the subtree. Find it via
-            # a right-spine descent rather than materializing the whole subtree
-            # (``elem.css('*')``) only to read its last entry.
-            end = positions.get(_last_descendant(elem).mem_id, start)
-            return start, end
-
-        ranges = {id(c): _range(c.elem) for c in main_components}
+        ranges = {id(c): index.span(c.elem) for c in main_components}
 
         def _effective_pos(cmpt):
             rng = ranges[id(cmpt)]
@@ -84,7 +58,7 @@ class ComponentList:
                     # direct child positioned after the nested subtree.
                     best = float("inf")
                     for ch in cmpt.elem.iter(include_text=False):
-                        ch_start = positions.get(ch.mem_id)
+                        ch_start = index.position(ch)
                         if ch_start is not None and o_end < ch_start < best:
                             best = ch_start
                     if best != float("inf"):
@@ -102,14 +76,42 @@ class ComponentList:
             cmpt.cmpt_rank = i
         self.cmpt_rank_counter = len(self.components)
 
-    def export_component_results(self):
-        """Export the results of all components"""
-        results = []
-        for cmpt in self.components:
-            for result in cmpt.export_results():
-                result["serp_rank"] = self.serp_rank_counter
-                results.append(result)
-                self.serp_rank_counter += 1
+    def export_component_results(self, validate: bool = False, output: str = "dict"):
+        """Export the results of all components.
+
+        Args:
+            validate: Validate every component's rows against ``BaseResult`` in
+                one batch first -- for components parsed with
+                ``parse_component(validate=False)``. Each output row is built
+                once, with ``section``/``cmpt_rank`` ahead of the result fields
+                and ``serp_rank`` last, matching the per-row path.
+            output: ``"dict"`` rows, or ``"struct"`` for ``ResultRecord`` rows
+                (the same fields, built directly from the validated values).
+        """
+        if not validate:
+            results = []
+            for cmpt in self.components:
+                for result in cmpt.export_results():
+                    result["serp_rank"] = self.serp_rank_counter
+                    results.append(ResultRecord(**result) if output == "struct" else result)
+                    self.serp_rank_counter += 1
+            return results
+
+        owners = [cmpt for cmpt in self.components for _ in cmpt.result_list]
+        rows = [row for cmpt in self.components for row in cmpt.result_list]
+        validated = _RESULTS_ADAPTER.dump_python(_RESULTS_ADAPTER.validate_python(rows))
+        start = self.serp_rank_counter
+        if output == "struct":
+            results = [
+                ResultRecord(cmpt.section, cmpt.cmpt_rank, **row, serp_rank=rank)
+                for rank, (cmpt, row) in enumerate(zip(owners, validated), start)
+            ]
+        else:
+            results = [
+                {"section": cmpt.section, "cmpt_rank": cmpt.cmpt_rank, **row, "serp_rank": rank}
+                for rank, (cmpt, row) in enumerate(zip(owners, validated), start)
+            ]
+        self.serp_rank_counter = start + len(results)
         return results
 
     def to_records(self):
@@ -16,61 +16,259 @@ Each UUID can have multiple payloads of three shapes:
 - ``type_a``  — ``[[<uuid>, [<title>, <snippet>, <favicon>, <domain>, [<publisher>], <full_url>, null, null, "<data-src-id>", ...]]]``
   (``data-src-id`` is at ``inner[1][8]`` and may be int or str.)
 - ``type_b``  — ``[[<uuid>, "<index>", 0, <full_url>, <favicon>, ""]]``
+
+Scanning is lazy (``PayloadIndex``): one ``find``-based pass over the document
+records where every blob sits and, from its first few characters, the UUID it
+belongs to. A UUID's blobs are decoded (orjson) only when the parser asks for
+that UUID, and the source tray's ``data-src-id`` map decodes only the blobs
+that can be type A. A blob whose leading characters don't pin its UUID is
+decoded during the scan, so lookups never miss one.
 """
 
 from __future__ import annotations
 
-import functools
 import html
 import json
 import re
+from collections.abc import Callable, Iterator, Mapping
+
+import orjson
 
-_UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+_UUID = r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+_UUID_RE = re.compile(f"^{_UUID}$")
 
-_COMMENT_TGQPHD = re.compile(r"<!--TgQPHd\|(.+?)-->", re.DOTALL)
-_COMMENT_SV6KPE = re.compile(r"<!--Sv6Kpe(.+?)-->", re.DOTALL)
+# Comment forms: the JSON runs from the marker to the next ``-->`` (at least one
+# character, as ``<!--TgQPHd\|(.+?)-->`` with DOTALL matched).
+_TGQPHD = "<!--TgQPHd|"
+_SV6KPE = "<!--Sv6Kpe"
+_COMMENT_END = "-->"
+
+# Push form: every ``["<jsid>","[[\"<uuid>\"...]]"]`` entry carries the literal
+# ``","[[\"`` right after its jsid. The scanner finds that literal, walks back
+# over the jsid to the entry's ``["``, and checks the entry with ``_LDPB_PUSH``
+# anchored there -- the matches a ``finditer`` over the document would give.
+_LDPB_ANCHOR = '","[[\\"'
 _LDPB_PUSH = re.compile(
     r'\["[a-zA-Z0-9_]+","(\[\[\\"[0-9a-f-]{36}\\".*?\]\])"\]',
     re.DOTALL,
 )
+# Bytes twin: undecoded markup is scanned as-is and only the blobs are decoded.
+_LDPB_PUSH_B = re.compile(_LDPB_PUSH.pattern.encode(), re.DOTALL)
+_JSID_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_"
+
+# Leading shapes that pin a blob's UUID without decoding it: the header's
+# ``[[null,null,"<uuid>"`` and type A/B's ``[["<uuid>",`` followed by ``[``
+# (A's body list) or a quote (B's index string). Quotes are ``&quot;`` in
+# comments and ``\"`` in pushes.
+_QUOTE = r'(?:&quot;|\\"|")'
+_HEADER_PREFIX = re.compile(rf"\[\[null,null,{_QUOTE}({_UUID}){_QUOTE}")
+_ENTRY_PREFIX = re.compile(rf"\[\[{_QUOTE}({_UUID}){_QUOTE},(\[|{_QUOTE})?")
+_PREFIX_CHARS = 64
+
+_COMMENT, _PUSH = 0, 1
+
+
+def extract_payloads(raw_html: str | bytes) -> PayloadIndex:
+    """Return the document's payloads as a lazy
+    ``{uuid: {"header": payload | None, "type_a": [...], "type_b": [...]}}``
+    mapping (see ``PayloadIndex``).
+
+    Accepts a string or undecoded UTF-8 bytes. Not cached here: within a
+    parse, the AI overview cmpts share one index through the ``ParseContext``,
+    which is dropped with the parse.
+    """
+    return PayloadIndex(raw_html)
 
 
-@functools.lru_cache(maxsize=2)
-def extract_payloads(raw_html: str) -> dict[str, dict]:
-    """Return ``{uuid: {"header": payload | None, "type_a": [...], "type_b": [...]}}``.
+class PayloadIndex(Mapping[str, dict]):
+    """Payload blobs located by one scan and decoded per UUID on demand.
 
-    Scans the raw HTML string for all three delivery forms, decodes each JSON
-    blob, classifies by shape, and groups by UUID. Cached so adjacent AI
-    overview cmpts within one parse skip the rescan; ``maxsize=2`` keeps the
-    cache from holding multiple SERPs' worth of payloads.
+    Iterating (``dict(index)``) decodes every blob and gives the buckets in
+    order of each UUID's first recognized payload, taking the comment forms
+    before the push form.
     """
-    out: dict[str, dict] = {}
-    for raw in _iter_payload_blobs(raw_html):
-        classified = _classify(raw)
-        if classified is None:
-            continue
-        kind, uuid, value = classified
-        bucket = out.setdefault(uuid, {"header": None, "type_a": [], "type_b": []})
-        if kind == "header":
-            bucket["header"] = value
-        else:
-            bucket[kind].append(value)
-    return out
-
-
-def _iter_payload_blobs(raw_html: str):
-    for m in _COMMENT_TGQPHD.finditer(raw_html):
-        yield html.unescape(m.group(1))
-    for m in _COMMENT_SV6KPE.finditer(raw_html):
-        yield html.unescape(m.group(1))
-    for m in _LDPB_PUSH.finditer(raw_html):
-        # The JS push stores the JSON as a double-escaped string. Apply the
-        # unicode-escape pass to convert ``\"`` -> ``"`` and ``=`` -> ``=``
-        # before json.loads.
-        try:
-            yield m.group(1).encode("utf-8").decode("unicode_escape")
-        except UnicodeDecodeError:
-            continue
+
+    def __init__(self, raw_html: str | bytes):
+        self._raw = raw_html
+        self._blobs = _scan(raw_html)
+        self._decoded: dict[int, tuple[str, str, object] | None] = {}
+        self._by_uuid: dict[str, list[int]] = {}
+        self._not_type_a: set[int] = set()
+        self._buckets: dict[str, dict | None] = {}
+        self._order: list[str] | None = None
+        for i, (form, start, end) in enumerate(self._blobs):
+            uuid, kind = _sniff(raw_html[start : min(end, start + _PREFIX_CHARS)])
+            if uuid is None:
+                classified = self._decode(i)
+                if classified is None:
+                    continue
+                kind, uuid, _ = classified
+            if kind != "type_a":
+                self._not_type_a.add(i)
+            self._by_uuid.setdefault(uuid, []).append(i)
+
+    def _decode(self, i: int) -> tuple[str, str, object] | None:
+        if i not in self._decoded:
+            form, start, end = self._blobs[i]
+            raw = _unescape(form, self._raw[start:end])
+            self._decoded[i] = _classify(raw) if raw is not None else None
+        return self._decoded[i]
+
+    def _bucket(self, uuid: str) -> dict | None:
+        if uuid not in self._buckets:
+            bucket: dict | None = None
+            for i in self._by_uuid.get(uuid, ()):
+                classified = self._decode(i)
+                if classified is None:
+                    continue
+                kind, _, value = classified
+                if bucket is None:
+                    bucket = {"header": None, "type_a": [], "type_b": []}
+                if kind == "header":
+                    bucket["header"] = value
+                else:
+                    bucket[kind].append(value)
+            self._buckets[uuid] = bucket
+        return self._buckets[uuid]
+
+    def __getitem__(self, uuid: str) -> dict:
+        bucket = self._bucket(uuid)
+        if bucket is None:
+            raise KeyError(uuid)
+        return bucket
+
+    def __iter__(self) -> Iterator[str]:
+        if self._order is None:
+            # A UUID ranks at its first blob that decodes to a payload.
+            first: dict[str, int] = {}
+            for uuid, blobs in self._by_uuid.items():
+                for i in blobs:
+                    if self._decode(i) is not None:
+                        first[uuid] = i
+                        break
+            self._order = sorted(first, key=first.__getitem__)
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def type_a_by_src_id(self) -> dict[str, dict]:
+        """Flatten all Type-A payloads into a ``data-src-id -> entry`` map
+        (first entry wins, in mapping order). Decodes only the blobs that can
+        be type A, plus what ordering the UUIDs takes."""
+        out: dict[str, dict] = {}
+        for uuid in self:
+            for i in self._by_uuid[uuid]:
+                if i in self._not_type_a:
+                    continue
+                classified = self._decode(i)
+                if classified is None or classified[0] != "type_a":
+                    continue
+                entry = classified[2]
+                assert isinstance(entry, dict)
+                src_id = entry.get("source_id")
+                if not src_id or src_id in out:
+                    continue
+                out[src_id] = entry
+        return out
+
+
+def _scan(raw_html: str | bytes) -> list[tuple[int, int, int]]:
+    """``(form, start, end)`` of every payload blob: the TgQPHd comments, then
+    the Sv6Kpe comments, then the pushes -- the order the payloads were first
+    grouped in."""
+    if isinstance(raw_html, bytes):
+        comments = [
+            *_comment_spans(raw_html, _TGQPHD.encode(), _COMMENT_END.encode()),
+            *_comment_spans(raw_html, _SV6KPE.encode(), _COMMENT_END.encode()),
+        ]
+        pushes = _push_spans(
+            raw_html, _LDPB_ANCHOR.encode(), b'["', _LDPB_PUSH_B, frozenset(_JSID_CHARS.encode())
+        )
+    else:
+        comments = [
+            *_comment_spans(raw_html, _TGQPHD, _COMMENT_END),
+            *_comment_spans(raw_html, _SV6KPE, _COMMENT_END),
+        ]
+        pushes = _push_spans(raw_html, _LDPB_ANCHOR, '["', _LDPB_PUSH, frozenset(_JSID_CHARS))
+    return [(_COMMENT, s, e) for s, e in comments] + [(_PUSH, s, e) for s, e in pushes]
+
+
+def _comment_spans[S: (str, bytes)](raw: S, marker: S, end_marker: S) -> list[tuple[int, int]]:
+    find: Callable[..., int] = raw.find
+    spans = []
+    pos = find(marker)
+    while pos != -1:
+        start = pos + len(marker)
+        end = find(end_marker, start + 1)
+        if end == -1:
+            break
+        spans.append((start, end))
+        pos = find(marker, end + len(end_marker))
+    return spans
+
+
+def _push_spans[S: (str, bytes)](
+    raw: S, anchor: S, opener: S, rx: re.Pattern[S], jsid_chars: frozenset
+) -> list[tuple[int, int]]:
+    find: Callable[..., int] = raw.find
+    spans = []
+    last_end = 0
+    pos = find(anchor)
+    while pos != -1:
+        start = pos
+        while start > 0 and raw[start - 1] in jsid_chars:
+            start -= 1
+        entry = start - len(opener)
+        if start < pos and entry >= last_end and raw[entry:start] == opener:
+            m = rx.match(raw, entry)
+            if m:
+                spans.append(m.span(1))
+                last_end = m.end()
+        pos = find(anchor, pos + 1)
+    return spans
+
+
+def _sniff(prefix: str | bytes) -> tuple[str | None, str | None]:
+    """``(uuid, kind)`` from a blob's leading characters, or ``(None, None)``.
+    ``kind`` is ``"type_a"`` when the blob may be type A."""
+    if isinstance(prefix, bytes):
+        prefix = prefix.decode("utf-8", errors="replace")
+    m = _HEADER_PREFIX.match(prefix)
+    if m:
+        return m.group(1), "header"
+    m = _ENTRY_PREFIX.match(prefix)
+    if m:
+        return m.group(1), "type_b" if m.group(2) not in (None, "[") else "type_a"
+    return None, None
+
+
+def _unescape(form: int, raw: str | bytes) -> str | None:
+    if form == _COMMENT:
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8", errors="replace")
+        # The JSON's quotes are its only entities as a rule; with nothing else
+        # escaped, replacing them is exactly ``html.unescape``.
+        unquoted = raw.replace("&quot;", '"')
+        return unquoted if "&" not in unquoted else html.unescape(raw)
+    # The JS push stores the JSON as a double-escaped string. Apply the
+    # unicode-escape pass to convert ``\"`` -> ``"`` and ``\u003d`` -> ``=``
+    # before decoding.
+    try:
+        if isinstance(raw, bytes):
+            return raw.decode("unicode_escape")
+        return raw.encode("utf-8").decode("unicode_escape")
+    except UnicodeDecodeError:
+        return None
+
+
+def _loads(raw: str) -> object:
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # orjson is stricter than ``json`` in a few corners the payloads can
+        # hit (lone surrogates from the push unescape, NaN, >64-bit integers).
+        return json.loads(raw)
 
 
 def _classify(raw: str) -> tuple[str, str, object] | None:
@@ -78,8 +276,8 @@ def _classify(raw: str) -> tuple[str, str, object] | None:
     if not raw or raw == "[]":
         return None
     try:
-        data = json.loads(raw)
-    except (json.JSONDecodeError, ValueError):
+        data = _loads(raw)
+    except ValueError:
         return None
     if not isinstance(data, list) or not data or not isinstance(data[0], list):
         return None
@@ -31,18 +31,13 @@ none of these markers and correctly yield empty output.
 
 from __future__ import annotations
 
-import contextvars
+from collections.abc import Mapping
 
 from selectolax.lexbor import LexborNode as Node
 
+from ..._parse_context import active_index, parse_context
 from ..._slx import class_tokens, get_text
-from ._ai_overview_payloads import extract_payloads
-
-# Set by ``parse_serp`` so ``_root_html`` skips a full-document serialization
-# per AI overview component. ``None`` outside that context (e.g. direct tests).
-raw_serp_html: contextvars.ContextVar[str | None] = contextvars.ContextVar(
-    "raw_serp_html", default=None
-)
+from ._ai_overview_payloads import PayloadIndex, extract_payloads
 
 
 def parse_ai_overview(elem, sub_rank: int = 0) -> list[dict]:
@@ -57,10 +52,10 @@ def parse_ai_overview(elem, sub_rank: int = 0) -> list[dict]:
 
     content = node.css_first("div.mZJni")
     if content is not None:
-        # Payload extraction serializes the whole document; only the current
-        # DOM ships these JSON citation payloads, so skip it for legacy SERPs.
-        payloads = extract_payloads(_root_html(node))
-        type_a_by_src_id = _index_type_a_by_src_id(payloads)
+        # Payload extraction scans the whole document; only the current DOM
+        # ships these JSON citation payloads, so skip it for legacy SERPs.
+        payloads = _payloads(node)
+        type_a_by_src_id = payloads.type_a_by_src_id()
         lede, lede_citations, sections = _extract_body(content, payloads)
         sources = _extract_sources(node, type_a_by_src_id)
     else:
@@ -109,25 +104,39 @@ def _is_unavailable(node: Node) -> bool:
     return any(marker in text for marker in _UNAVAILABLE_MARKERS)
 
 
+def _payloads(node: Node) -> PayloadIndex:
+    """The document's payload index, scanned once per parse.
+
+    Every AI overview component of a page shares the scan (and the blobs it
+    has decoded) through the active ``ParseContext``; outside a parse (e.g.
+    direct tests of the parser) each call scans afresh.
+    """
+    ctx = parse_context.get()
+    if ctx is None:
+        return extract_payloads(_root_html(node))
+    if ctx.payloads is None:
+        raw = ctx.raw_html
+        ctx.payloads = extract_payloads(raw if raw is not None else _root_html(node))
+    return ctx.payloads
+
+
 def _root_html(node: Node) -> str:
-    """Document HTML for payload extraction.
+    """Document HTML for payload extraction when the raw markup isn't at hand.
 
     The ``lDPB.push`` fallback payload form lives in script tags outside the
-    AI overview component, so we need the full document. ``parse_serp`` publishes
-    the raw markup via a ``ContextVar`` (``raw_serp_html``); we fall back to
-    serializing the document root when called outside that context (e.g.
-    direct tests of the parser).
+    AI overview component, so we need the full document: serialize the root.
+    ``parse_serp`` hands the raw markup over on its ``ParseContext`` instead,
+    skipping the serialization (``Node`` input has none).
     """
-    cached = raw_serp_html.get()
-    if cached is not None:
-        return cached
     cur = node
     while cur.parent is not None:
         cur = cur.parent
     return cur.html or ""
 
 
-def _extract_body(content: Node, payloads: dict[str, dict]) -> tuple[str, list[dict], list[dict]]:
+def _extract_body(
+    content: Node, payloads: Mapping[str, dict]
+) -> tuple[str, list[dict], list[dict]]:
     """Walk the content area and split into lede + lede citations + sections."""
     elements = _collect_body_elements(content)
     if not elements:
@@ -196,7 +205,7 @@ def _collect_body_elements(content: Node) -> list[Node]:
     # Deduplicate (Y3BBE divs can nest inside one another in some layouts)
     # and drop elements whose ancestor is already in the set.
     elements = _drop_nested_descendants(elements)
-    return sorted(elements, key=_doc_position)
+    return _in_document_order(elements)
 
 
 def _drop_nested_descendants(elements: list[Node]) -> list[Node]:
@@ -215,6 +224,23 @@ def _drop_nested_descendants(elements: list[Node]) -> list[Node]:
     return kept
 
 
+def _in_document_order(elements: list[Node]) -> list[Node]:
+    """Sort ``elements`` into document order: by document-index position during
+    ``parse_serp``, else by ``_doc_position``'s ancestor-chain key."""
+    index = active_index()
+    if index is not None:
+        keyed: list[tuple[int, Node]] = []
+        for elem in elements:
+            pos = index.position(elem)
+            if pos is None:
+                break
+            keyed.append((pos, elem))
+        else:
+            keyed.sort(key=lambda pe: pe[0])
+            return [elem for _, elem in keyed]
+    return sorted(elements, key=_doc_position)
+
+
 def _doc_position(elem: Node) -> tuple:
     """Crude document position via ancestor chain indices."""
     path = []
@@ -265,7 +291,7 @@ def _find_parent_tag_class(node: Node, tag: str, cls: str) -> Node | None:
     return None
 
 
-def _extract_button_citations(elem: Node, payloads: dict[str, dict]) -> list[dict]:
+def _extract_button_citations(elem: Node, payloads: Mapping[str, dict]) -> list[dict]:
     """Build citation dicts for ``button.rBl3me`` widgets within ``elem``."""
     citations: list[dict] = []
     for button in elem.css("button.rBl3me"):
@@ -313,18 +339,6 @@ def _button_additional_count(button: Node) -> int:
         return 0
 
 
-def _index_type_a_by_src_id(payloads: dict[str, dict]) -> dict[str, dict]:
-    """Flatten all Type-A payloads into a ``data-src-id -> entry`` map."""
-    out: dict[str, dict] = {}
-    for bucket in payloads.values():
-        for entry in bucket.get("type_a", []):
-            src_id = entry.get("source_id")
-            if not src_id or src_id in out:
-                continue
-            out[src_id] = entry
-    return out
-
-
 def _extract_sources(node: Node, type_a_by_src_id: dict[str, dict]) -> list[dict]:
     """Build the sources list in tray (rank) order."""
     sources_ul = node.css_first("ul.bTFeG")
@@ -387,7 +401,7 @@ def _extract_body_legacy(content: Node) -> tuple[str, list[dict], list[dict]]:
         and _find_parent_tag_class(lst, "li", _LEGACY_SOURCE_LI_CLASS) is None
     ]
     elements = _drop_nested_descendants(paragraphs + lists)
-    elements = sorted(elements, key=_doc_position)
+    elements = _in_document_order(elements)
     if not elements:
         return "", [], []
 
@@ -1,57 +1,411 @@
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+
 from selectolax.lexbor import LexborNode as Node
 
 from .. import utils
+from .._parse_context import ParseContext
+from ..classifiers.cache import ClassificationCache
+from ..classifiers.stats import ClassifierStats, classifier_stats, collect_classifier_stats
 from ..extractors import Extractor
+from ..extractors.extra_features import EXTRA_FEATURES, extract_extra_features
 from ..extractors.extractor_serp_features import FeatureExtractor
-from .components.ai_overview import raw_serp_html
+from ..models.data import ResultRecord
+from .budget import ParseBudget, ParseTimeout
+from .cache import ParseCache
+from .component_types import TYPES_BY_NAME
+from .timings import StageTimer
+
+log = logging.getLogger(__name__)
+
+# Record metadata carried through ``parse_serps`` onto each parsed output. Only
+# these keys ride along; the rest of a stored record (html, qry, timestamp, ...)
+# is never shipped to the worker processes or echoed back.
+BATCH_META_KEYS = ("serp_id", "crawl_id")
+
+SECTIONS = ("header", "main", "footer", "rhs")
+
+OUTPUTS = ("dict", "struct")
+
+
+def _selection(values: Iterable[str] | None, valid: Iterable[str], what: str) -> frozenset | None:
+    """Normalize a ``types``/``sections`` filter to a frozenset (None = all)."""
+    if values is None:
+        return None
+    selected = frozenset([values] if isinstance(values, str) else values)
+    unknown = selected.difference(valid)
+    if unknown:
+        raise ValueError(f"unknown {what}: {sorted(unknown)}")
+    return selected
+
 
+def _check_output(output: str) -> None:
+    if output not in OUTPUTS:
+        raise ValueError(f"unknown output: {output!r} (expected one of {OUTPUTS})")
 
-def parse_serp(serp: str | Node, url: str | None = None) -> dict:
+
+def parse_serp(
+    serp: str | bytes | Node,
+    url: str | None = None,
+    cache: ParseCache | None = None,
+    timings: bool = False,
+    types: Iterable[str] | None = None,
+    sections: Iterable[str] | None = None,
+    features: bool = True,
+    timeout: float | None = None,
+    component_timeout: float | None = None,
+    classify_cache: ClassificationCache | None = None,
+    skip_blocked: bool = True,
+    output: str = "dict",
+) -> dict:
     """Parse a Search Engine Result Page (SERP).
 
     Args:
-        serp: The HTML content of the SERP or a parsed selectolax ``Node``.
+        serp: The HTML content of the SERP (``str``, or UTF-8 ``bytes`` parsed
+            without a decode pass) or a parsed selectolax ``Node``.
         url: The response's final URL, when known. A ``/sorry/`` redirect
             flags ``features["captcha"]`` even when the HTML is empty.
+        cache: Optional ``ParseCache``. Raw HTML already parsed by this parser
+            version is returned from it without building a DOM; fresh parses
+            are stored. ``Node`` input bypasses the cache.
+        timings: Also return a ``timings`` block of per-stage wall-clock
+            seconds: ``make_soup``; ``extract`` split into ``index``,
+            ``rhs``, ``header``, ``main``, ``footer``, and ``reorder``;
+            ``classify``; ``parse`` summed per component type; ``export``;
+            ``features``; and ``total``. A cache hit reports ``cache`` and
+            ``total`` only.
+        types: Only parse components classified as one of these types (names
+            from ``component_types``, e.g. ``{"ai_overview", "general"}``).
+            Extraction and classification still run in full, but every other
+            component's parser is skipped and it emits no rows.
+        sections: Only classify and parse components in these sections
+            (``header``, ``main``, ``footer``, ``rhs``).
+        features: Run ``FeatureExtractor``. ``False`` skips it and returns
+            empty ``features``.
+        timeout: Time budget (seconds) for extraction, classification, and
+            the component parsers together. Running out during extraction or
+            classification raises ``ParseTimeout``; during parsing, the
+            running parser is cut off and it and every component not yet
+            parsed emit a ``"parsing timeout"`` error row.
+        component_timeout: Time budget (seconds) per component parser; an
+            overrunning parser is cut off and emits a ``"parsing timeout"``
+            error row. Both budgets interrupt a parser only on the main
+            thread (see ``parsers/budget.py``); elsewhere they are checked
+            between components. A parse that hit either budget is not cached.
+        classify_cache: Optional ``ClassificationCache`` reused across SERPs:
+            main-section components whose structural fingerprint it has seen
+            take the cached type instead of running the ``ClassifyMain`` chain.
+        skip_blocked: Answer raw HTML that ``utils.is_blocked`` flags -- a
+            ``/sorry/`` redirect, an empty body, or the CAPTCHA block page --
+            from its markup alone: no results and the features a full parse
+            reports (``captcha`` set), without building a DOM. Registered
+            extra features are not computed for such pages, and a timed
+            parse reports ``gate`` and ``total`` only.
+        output: ``"dict"`` (default) returns one dict per result row;
+            ``"struct"`` returns ``ResultRecord`` rows -- the same fields in
+            slots, a fraction of a dict's memory when many SERPs' rows are
+            held at once. ``record.to_dict()`` gives the dict row.
+
+        With a ``types``/``sections`` filter, ``cmpt_rank`` still counts every
+        extracted component, while ``serp_rank`` numbers only the rows
+        returned. A filtered or feature-less parse bypasses ``cache``.
 
     Returns:
-        A dict with 'results' and 'features' keys.
+        A dict with 'results' and 'features' keys (plus 'timings' if requested).
     """
-    soup = utils.make_soup(serp)
-    # Publish the raw markup (if we have it) so the AI overview parser skips
-    # a full-document serialization per cmpt.
-    raw_html: str | None = None
-    if isinstance(serp, str):
-        raw_html = serp
-    elif isinstance(serp, bytes):
-        raw_html = serp.decode("utf-8", errors="replace")
-    token = raw_serp_html.set(raw_html)
-    try:
-        extractor = Extractor(soup)
-        extractor.extract_components()
-        component_list = extractor.components
-
-        # Classify every component before parsing any of them. Two parsers
-        # mutate the DOM mid-parse (``general`` decomposes top-menu children,
-        # ``ai_overview`` decomposes citation buttons); interleaving classify and
-        # parse would let an earlier component's parse-time mutation reach a later
-        # component's classify, making classification depend on parse order. A
-        # full classify pass first pins every type against the pristine
-        # post-extraction tree.
-        for cmpt in component_list:
-            cmpt.classify_component()
-        for cmpt in component_list:
-            cmpt.parse_component()
-        results = component_list.export_component_results()
-    finally:
-        raw_serp_html.reset(token)
+    types = _selection(types, TYPES_BY_NAME, "types")
+    sections = _selection(sections, SECTIONS, "sections")
+    _check_output(output)
+    selective = types is not None or sections is not None or not features
+    timer = StageTimer(enabled=timings)
+    budget = ParseBudget(timeout, component_timeout)
+    start = time.perf_counter()
+    if skip_blocked and isinstance(serp, (str, bytes)) and utils.is_blocked(serp, url):
+        with timer.stage("gate"):
+            extracted = FeatureExtractor.extract_blocked_features(serp, url)
+        parsed = {"features": extracted.model_dump() if features else {}, "results": []}
+        if timings:
+            parsed["timings"] = {**timer.timings, "total": time.perf_counter() - start}
+        return parsed
+    key = None
+    if cache is not None and not selective and isinstance(serp, (str, bytes)):
+        with timer.stage("cache"):
+            key = cache.key(serp, url)
+            cached = cache.get(key)
+        if cached is not None:
+            if output == "struct":
+                cached["results"] = [ResultRecord(**row) for row in cached["results"]]
+            if timings:
+                cached["timings"] = {**timer.timings, "total": time.perf_counter() - start}
+            return cached
+
+    with timer.stage("make_soup"):
+        soup = utils.make_soup(serp)
+    # One context per parse: the raw markup (if we have it) so the AI overview
+    # parser skips a full-document serialization, the document index built by
+    # extraction's one walk, and the per-parse memos. Bytes go through
+    # undecoded: lexbor, the payload scanner, and the feature regexes all read
+    # the buffer directly. Leaving ``active`` drops it all.
+    raw_html = serp if isinstance(serp, (str, bytes)) else None
+    context = ParseContext(raw_html, timer, budget, classify_cache)
+    extractor = Extractor(soup, context)
+    extra = None
+    with context.active():
+        with budget.serp():
+            if features and EXTRA_FEATURES:
+                # Registered probes see the document as a separate scan of the
+                # HTML would: before extraction detaches the ads and RHS column
+                # and the parsers decompose nodes. The index walk they are
+                # handed is the one extraction then uses.
+                with timer.stage("extract", "index"):
+                    context.index.build(soup)
+                with timer.stage("extra_features"):
+                    extra = extract_extra_features(raw_html, soup, context.index)
+            extractor.extract_components()
+            budget.check()
+            component_list = extractor.components
+
+            # Classify every component before parsing any of them. Two parsers
+            # mutate the DOM mid-parse (``general`` decomposes top-menu children,
+            # ``ai_overview`` decomposes citation buttons); interleaving classify
+            # and parse would let an earlier component's parse-time mutation reach
+            # a later component's classify, making classification depend on parse
+            # order. A full classify pass first pins every type against the
+            # pristine post-extraction tree.
+            wanted = [c for c in component_list if sections is None or c.section in sections]
+            with timer.stage("classify"):
+                for cmpt in wanted:
+                    cmpt.classify_component()
+            budget.check()
+        if types is not None:
+            wanted = [c for c in wanted if c.type in types]
+        # Parsers may decompose nodes; node-keyed state must not outlive that.
+        context.release()
+        for cmpt in wanted:
+            with timer.stage("parse", cmpt.type or "null"):
+                cmpt.parse_component(validate=False, budget=budget)
+        with timer.stage("export"):
+            results = component_list.export_component_results(validate=True, output=output)
 
     # Forward raw HTML (when available) + soup so feature extraction takes the
     # regex path and reuses the already-parsed soup for shared probes. The main
     # layout label is internal to extraction, so surface it on the features here.
-    features = FeatureExtractor.extract_features(serp, soup=soup, url=url)
-    features.main_layout = extractor.main_handler.layout_label
-    return {
-        "features": features.model_dump(),
+    serp_features: dict = {}
+    if features:
+        with timer.stage("features"):
+            extracted = FeatureExtractor.extract_features(
+                serp, soup=soup, url=url, index=extractor.index, extra=extra
+            )
+            extracted.main_layout = extractor.main_handler.layout_label
+            serp_features = extracted.model_dump()
+    parsed = {
+        "features": serp_features,
         "results": results,
     }
+    if cache is not None and key is not None and not budget.timed_out:
+        cache.put(key, parsed)
+    if timings:
+        parsed["timings"] = {**timer.timings, "total": time.perf_counter() - start}
+    return parsed
+
+
+def classify_serp(
+    serp: str | bytes | Node, classify_cache: ClassificationCache | None = None
+) -> list[tuple[str, int, str]]:
+    """Extract and classify a SERP's components without parsing any of them.
+
+    The triage fast path ("which SERPs carry an AI overview / knowledge panel /
+    unknowns?"): the same extraction and classify pass as ``parse_serp``, so
+    the types match its rows' ``type``, but no component parser, result
+    validation, or feature extraction runs.
+
+    Args:
+        serp: The HTML content of the SERP or a parsed selectolax ``Node``.
+        classify_cache: Optional ``ClassificationCache``, as in ``parse_serp``.
+
+    Returns:
+        ``(section, cmpt_rank, type)`` per component, in ``cmpt_rank`` order.
+    """
+    soup = utils.make_soup(serp)
+    raw_html = serp if isinstance(serp, (str, bytes)) else None
+    context = ParseContext(raw_html, classify_cache=classify_cache)
+    extractor = Extractor(soup, context)
+    with context.active():
+        extractor.extract_components()
+        for cmpt in extractor.components:
+            cmpt.classify_component()
+    return [(c.section, c.cmpt_rank, c.type) for c in extractor.components]
+
+
+# Batch parsing ----------------------------------------------------------------
+
+
+def _parse_one(html: str, url: str | None, options: dict) -> dict:
+    """``parse_serp`` that never raises: a failed SERP is logged and yields an
+    empty parse (the ``ParsedSERP`` defaults), so one bad page can't abort a
+    batch -- mirrors ``SearchEngine.parse_serp``."""
+    try:
+        return parse_serp(html, url=url, **options)
+    except ParseTimeout:
+        log.warning("batch parse timed out")
+        return {"features": {}, "results": []}
+    except Exception:
+        log.exception("batch parse failed")
+        return {"features": {}, "results": []}
+
+
+def _parse_chunk(chunk: list[tuple[str, str | None]], options: dict) -> list[dict]:
+    """Worker entrypoint: parse one chunk of ``(html, url)`` pairs in order,
+    passing ``options`` through to ``parse_serp``."""
+    return [_parse_one(html, url, options) for html, url in chunk]
+
+
+def _parse_chunk_counted(
+    chunk: list[tuple[str, str | None]], options: dict
+) -> tuple[list[dict], ClassifierStats]:
+    """``_parse_chunk`` with classifier statistics on, returned alongside the
+    results: a worker can't reach the parent's ``collect_classifier_stats``."""
+    with collect_classifier_stats() as stats:
+        return _parse_chunk(chunk, options), stats
+
+
+def _split_record(record: dict | str) -> tuple[tuple[str, str | None], dict]:
+    """Split a record into the worker payload ``(html, url)`` and the metadata
+    kept in the parent process."""
+    if isinstance(record, str):
+        return (record, None), {}
+    meta = {k: record[k] for k in BATCH_META_KEYS if k in record}
+    return (record.get("html") or "", record.get("url")), meta
+
+
+def _chunks(records: Iterable[dict | str], size: int) -> Iterator[list[tuple]]:
+    it = iter(records)
+    while chunk := list(islice(it, size)):
+        yield [_split_record(r) for r in chunk]
+
+
+def _merge(parsed: list[dict], metas: list[dict]) -> Iterator[dict]:
+    for out, meta in zip(parsed, metas):
+        yield {**meta, **out}
+
+
+def parse_serps(
+    records: Iterable[dict | str],
+    workers: int | None = None,
+    chunksize: int = 8,
+    ordered: bool = True,
+    cache: ParseCache | None = None,
+    types: Iterable[str] | None = None,
+    sections: Iterable[str] | None = None,
+    features: bool = True,
+    timeout: float | None = None,
+    component_timeout: float | None = None,
+    classify_cache: ClassificationCache | None = None,
+    skip_blocked: bool = True,
+    output: str = "dict",
+) -> Iterator[dict]:
+    """Parse many SERPs across a process pool, yielding results as they finish.
+
+    Each record is either a raw HTML string or a stored SERP dict -- the shape
+    ``SearchEngine.save_serp(append_to=...)`` writes -- carrying ``html`` and,
+    optionally, ``url`` (fed to ``parse_serp`` for the ``/sorry/`` captcha
+    flag). The ``serp_id``/``crawl_id`` of a dict record are attached to its
+    output; only ``(html, url)`` crosses the process boundary.
+
+    ``records`` is consumed lazily: at most ``2 * workers`` chunks are in
+    flight, so memory stays bounded on arbitrarily long inputs (e.g. a
+    generator over a crawl file). A SERP whose parse raises (or runs out of
+    its ``timeout`` before the parse stage) is logged and yields empty
+    ``features``/``results`` instead of aborting the batch.
+
+    Args:
+        records: Iterable of HTML strings or SERP record dicts.
+        workers: Worker processes; defaults to ``os.cpu_count()``. ``1`` parses
+            in-process with no pool (useful for debugging and profiling).
+        chunksize: Records sent to a worker per task. Larger chunks amortize
+            inter-process overhead; smaller ones balance uneven SERP sizes.
+        ordered: Yield in input order (default). ``False`` yields each chunk
+            as soon as it completes, which keeps every worker busy when one
+            pathological SERP stalls its chunk.
+        cache: Optional ``ParseCache`` shared by every worker (it pickles as
+            its path and reconnects in each process).
+        types, sections, features: Selective parsing, as in ``parse_serp``.
+        timeout, component_timeout: Per-SERP and per-component time budgets,
+            as in ``parse_serp``. Workers parse on their main thread, so an
+            overrunning parser is cut off rather than stalling its chunk.
+        classify_cache: Optional ``ClassificationCache``. Each worker process
+            keeps its own copy, held by the worker from its first chunk to its
+            last, so it persists across the chunks that worker parses.
+        skip_blocked: Answer block pages from their markup, as in ``parse_serp``.
+        output: ``"dict"`` or ``"struct"`` result rows, as in ``parse_serp``.
+
+    Yields:
+        One dict per record: ``{"serp_id", "crawl_id"}`` (when present on the
+        record) plus the ``parse_serp`` output's ``features`` and ``results``.
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be >= 1, got {chunksize}")
+    # Validated here so a bad filter fails fast instead of once per SERP.
+    ParseBudget(timeout, component_timeout)
+    _check_output(output)
+    options = {
+        "cache": cache,
+        "types": _selection(types, TYPES_BY_NAME, "types"),
+        "sections": _selection(sections, SECTIONS, "sections"),
+        "features": features,
+        "timeout": timeout,
+        "component_timeout": component_timeout,
+        "classify_cache": classify_cache,
+        "skip_blocked": skip_blocked,
+        "output": output,
+    }
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in _chunks(records, chunksize):
+            payload = [p for p, _ in chunk]
+            yield from _merge(_parse_chunk(payload, options), [m for _, m in chunk])
+        return
+
+    max_in_flight = 2 * workers
+    chunks = _chunks(records, chunksize)
+    stats = classifier_stats.get()
+    worker_fn = _parse_chunk if stats is None else _parse_chunk_counted
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[tuple[Future, list[dict]]] = deque()
+
+        def submit_next() -> bool:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            future = pool.submit(worker_fn, [p for p, _ in chunk], options)
+            pending.append((future, [m for _, m in chunk]))
+            return True
+
+        while len(pending) < max_in_flight and submit_next():
+            pass
+
+        try:
+            while pending:
+                if ordered:
+                    future, metas = pending.popleft()
+                else:
+                    done, _ = wait([f for f, _ in pending], return_when=FIRST_COMPLETED)
+                    idx = next(i for i, (f, _) in enumerate(pending) if f in done)
+                    future, metas = pending[idx]
+                    del pending[idx]
+                parsed = future.result()
+                if stats is not None:
+                    parsed, chunk_stats = parsed
+                    stats.merge(chunk_stats)
+                submit_next()
+                yield from _merge(parsed, metas)
+        finally:
+            # A consumer that stops early (``break``, ``close()``) shouldn't wait
+            # on chunks it will never read.
+            for future, _ in pending:
+                future.cancel()
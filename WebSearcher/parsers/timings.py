@@ -0,0 +1,49 @@
+"""Opt-in per-stage wall-clock timings for ``parse_serp(..., timings=True)``.
+
+A ``StageTimer`` accumulates ``time.perf_counter`` deltas into a nested dict
+keyed by stage path, e.g. ``timer.stage("extract", "main")`` adds to
+``timings["extract"]["main"]``. Repeated stages sum, which is how per-component
+parse time rolls up by type. A disabled timer hands back one shared no-op
+context, so the default (untimed) parse pays only an attribute lookup per stage.
+"""
+
+import time
+from contextlib import AbstractContextManager, nullcontext
+
+_NOOP = nullcontext()
+
+
+class _Stage(AbstractContextManager):
+    __slots__ = ("bucket", "key", "start")
+
+    def __init__(self, bucket: dict, key: str):
+        self.bucket = bucket
+        self.key = key
+
+    def __enter__(self) -> "_Stage":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self.start
+        self.bucket[self.key] = self.bucket.get(self.key, 0.0) + elapsed
+
+
+class StageTimer:
+    """Accumulate stage durations (seconds) into ``self.timings``."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.timings: dict = {}
+
+    def stage(self, *path: str) -> AbstractContextManager:
+        """Context manager timing one stage; ``path`` nests (``"parse", "general"``)."""
+        if not self.enabled:
+            return _NOOP
+        bucket = self.timings
+        for key in path[:-1]:
+            bucket = bucket.setdefault(key, {})
+        return _Stage(bucket, path[-1])
+
+
+NULL_TIMER = StageTimer(enabled=False)
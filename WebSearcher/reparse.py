@@ -0,0 +1,205 @@
+"""Resumable streaming reparse of a stored crawl file.
+
+Reads the JSON lines ``SearchEngine.save_serp(append_to=...)`` writes (plain
+or compressed) one record at a time, parses them in parallel with
+``parse_serps``, and appends ``save_record``-shaped merged records -- SERP
+metadata (no HTML) + ``features`` + ``results``, stamped with the reparsing
+``ws_version`` so the collection-time ``version`` is kept. Records saved with
+``save_serp(blob_dir=...)`` carry an ``html_hash``; pass the same directory as
+``--blob-dir`` to read their HTML from the ``BlobStore``. An archive
+(``WebSearcher.archive``, ``.wsa``) is read in write order.
+
+Progress is checkpointed to ``<output>.checkpoint`` (the last completed
+``serp_id``, the number of input records consumed, and the output size at that
+point). A killed job rerun with the same arguments truncates the output back
+to the last checkpoint and resumes after that record, so the output never
+holds a duplicate or partial line. Rerunning a finished job is a no-op. A
+checkpoint whose output is missing or shorter than its offset is refused
+rather than resumed.
+
+    python -m WebSearcher.reparse serps.json.bz2 records.json --workers 8
+"""
+
+import argparse
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import orjson
+
+from . import __version__, utils
+from .archive import ARCHIVE_SUFFIX, ArchiveReader
+from .blobs import BlobStore
+from .parsers.parse_serp import parse_serps
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+
+def checkpoint_path(output: str | Path) -> Path:
+    output = Path(output)
+    return output.with_name(output.name + CHECKPOINT_SUFFIX)
+
+
+def load_checkpoint(fp: str | Path) -> dict | None:
+    fp = Path(fp)
+    if not fp.exists():
+        return None
+    return orjson.loads(fp.read_bytes())
+
+
+def save_checkpoint(fp: str | Path, state: dict) -> None:
+    """Write the checkpoint atomically (temp file + rename), so a kill mid-write
+    leaves the previous checkpoint intact."""
+    fp = Path(fp)
+    tmp = fp.with_name(fp.name + ".tmp")
+    tmp.write_bytes(orjson.dumps(state))
+    os.replace(tmp, fp)
+
+
+def _skip_completed(records: Iterable[dict], n: int, serp_id: str | None) -> Iterator[dict]:
+    """Drop the ``n`` records a previous run completed, checking that the last
+    one is the checkpointed ``serp_id`` (i.e. the input hasn't changed)."""
+    it = iter(records)
+    last = None
+    for _ in range(n):
+        last = next(it, None)
+        if last is None:
+            raise ValueError(f"input has fewer than the {n:,} checkpointed records")
+    if n and last is not None and last.get("serp_id") != serp_id:
+        raise ValueError(
+            f"checkpoint mismatch at record {n:,}: expected serp_id {serp_id!r}, "
+            f"found {last.get('serp_id')!r}"
+        )
+    yield from it
+
+
+def _iter_records(fp: str | Path) -> Iterator[dict]:
+    """Records from a crawl file or an archive (``.wsa``)."""
+    if Path(fp).suffix == ARCHIVE_SUFFIX:
+        with ArchiveReader(fp) as archive:
+            yield from archive
+    else:
+        yield from utils.iter_lines(fp)
+
+
+def reparse(
+    input_path: str | Path,
+    output_path: str | Path,
+    workers: int | None = None,
+    chunksize: int = 8,
+    checkpoint_every: int = 100,
+    overwrite: bool = False,
+    blob_dir: str | Path = "",
+) -> int:
+    """Reparse ``input_path`` into ``output_path``; return the records written.
+
+    Args:
+        input_path: Crawl file of SERP records (``.json``, or compressed: ``.json.zst``,
+            ``.json.gz``, ``.json.br``, ``.json.bz2``), or an archive (``.wsa``).
+        output_path: Plain JSON-lines file receiving the merged records.
+        workers: Parse processes (see ``parse_serps``).
+        chunksize: Records per worker task (see ``parse_serps``).
+        checkpoint_every: Records between checkpoint writes.
+        overwrite: Start over, discarding an existing output and checkpoint.
+        blob_dir: ``BlobStore`` holding the HTML of records saved with
+            ``save_serp(blob_dir=...)``.
+    """
+    output_path = Path(output_path)
+    if output_path.suffix != ".json":
+        raise ValueError(f"output must be an uncompressed .json file: {output_path}")
+    ckpt_path = checkpoint_path(output_path)
+    if overwrite:
+        # Drop the old checkpoint before truncating the output: a crash before
+        # the first new checkpoint must not resume from the old offsets.
+        ckpt_path.unlink(missing_ok=True)
+    state = None if overwrite else load_checkpoint(ckpt_path)
+    if state is None and output_path.exists() and not overwrite:
+        raise FileExistsError(
+            f"{output_path} exists with no checkpoint; pass overwrite=True (--overwrite) "
+            "to replace it"
+        )
+    if state is not None:
+        size = output_path.stat().st_size if output_path.exists() else None
+        if size is None or size < state["offset"]:
+            found = "is missing" if size is None else f"has {size:,} bytes"
+            raise ValueError(
+                f"can't resume: {output_path} {found} but its checkpoint is at byte "
+                f"{state['offset']:,}; pass overwrite=True (--overwrite) to start over"
+            )
+    state = state or {"serp_id": None, "records": 0, "offset": 0}
+
+    records = _skip_completed(_iter_records(input_path), state["records"], state["serp_id"])
+    if blob_dir:
+        records = BlobStore(blob_dir).with_html(records)
+    # Metadata stays in this process; parse_serps only ships (html, url) to the
+    # workers. Output is in input order, so a FIFO pairs each parse with its
+    # record. The queue is bounded by parse_serps' in-flight window.
+    metas: deque[dict] = deque()
+
+    def feed() -> Iterator[dict]:
+        for record in records:
+            metas.append({k: v for k, v in record.items() if k != "html"})
+            yield record
+
+    written = 0
+    with open(output_path, "r+b" if output_path.exists() else "wb") as outfile:
+        # Drop anything written after the last checkpoint (a kill between the
+        # write and the checkpoint) so the resumed run doesn't duplicate it.
+        outfile.truncate(state["offset"])
+        outfile.seek(state["offset"])
+        for parsed in parse_serps(feed(), workers=workers, chunksize=chunksize):
+            meta = metas.popleft()
+            record = {
+                **meta,
+                "features": parsed["features"],
+                "results": parsed["results"],
+                "ws_version": __version__,
+            }
+            outfile.write(orjson.dumps(record))
+            outfile.write(b"\n")
+            written += 1
+            state = {
+                "serp_id": meta.get("serp_id"),
+                "records": state["records"] + 1,
+                "offset": outfile.tell(),
+            }
+            if written % checkpoint_every == 0:
+                outfile.flush()
+                save_checkpoint(ckpt_path, state)
+        outfile.flush()
+        save_checkpoint(ckpt_path, state)
+    return written
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Reparse a stored crawl file into merged per-SERP records."""
+    p = argparse.ArgumentParser(
+        prog="WebSearcher.reparse",
+        description="Reparse a save_serp crawl file into save_record-shaped records.",
+    )
+    p.add_argument("input", type=Path, help="SERP records (.json, .json.zst/.gz/.br/.bz2, or .wsa)")
+    p.add_argument("output", type=Path, help="Merged records output (.json)")
+    p.add_argument("--workers", type=int, default=None, help="Parse processes (default: all)")
+    p.add_argument("--chunksize", type=int, default=8, help="Records per worker task")
+    p.add_argument("--checkpoint-every", type=int, default=100, help="Records between checkpoints")
+    p.add_argument(
+        "--overwrite", action="store_true", help="Discard existing output and checkpoint"
+    )
+    p.add_argument("--blob-dir", default="", help="BlobStore holding records' html_hash pages")
+    args = p.parse_args(argv)
+
+    n = reparse(
+        args.input,
+        args.output,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        checkpoint_every=args.checkpoint_every,
+        overwrite=args.overwrite,
+        blob_dir=args.blob_dir,
+    )
+    print(f"WebSearcher {__version__} | reparsed {n:,} records -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,14 @@ from importlib import metadata
 from pathlib import Path
 
 from .. import logger, utils
+from ..blobs import BlobStore
 from ..models.configs import (
     LogConfig,
     PatchrightConfig,
     RequestsConfig,
     SearchConfig,
     SearchMethod,
+    WriterConfig,
 )
 from ..models.data import BaseSERP, ParsedSERP
 from ..models.searches import SearchParams
@@ -28,6 +30,7 @@ class SearchEngine:
         requests_config: dict | RequestsConfig = {},
         patchright_config: dict | PatchrightConfig = {},
         crawl_id: str = "",
+        writer_config: dict | WriterConfig = {},
     ) -> None:
         """Initialize the search engine
 
@@ -39,6 +42,11 @@ class SearchEngine:
             requests_config: Requests-specific configuration. Defaults to {}.
             patchright_config: Patchright-specific configuration. Defaults to {}.
             crawl_id: A unique identifier for the crawl. Defaults to ''.
+            writer_config: Buffering for the files the ``save_*`` methods
+                append to: ``flush_every`` records, ``flush_interval`` seconds,
+                and the ``fsync`` policy (see ``utils.RecordWriter``). Each
+                file stays open until ``close()``. Defaults to {} (flush every
+                record, no fsync).
         """
 
         # Initialize config settings, log, and session data
@@ -49,6 +57,7 @@ class SearchEngine:
                 "log": LogConfig.create(log_config),
                 "requests": RequestsConfig.create(requests_config),
                 "patchright": PatchrightConfig.create(patchright_config),
+                "writer": WriterConfig.create(writer_config),
             }
         )
         # Name the logger after the subpackage, not __name__ (which doubles to
@@ -71,6 +80,7 @@ class SearchEngine:
         # Initialize search params and output
         self.search_params = SearchParams.create()
         self.parsed = ParsedSERP()
+        self.writers: dict[Path, utils.RecordWriter] = {}
 
     # ==========================================================================
     # Lifecycle
@@ -81,10 +91,30 @@ class SearchEngine:
         Deterministic teardown for the browser backend: the patchright window
         stays open until this is called, so close the engine when done -- either
         explicitly, or by using it as a context manager (``with ws.SearchEngine()
-        as se:``).
+        as se:``). Records still buffered by the ``save_*`` writers are written
+        out and their files closed first. Compressed outputs are only complete
+        once closed; an engine that is never closed has its writers closed
+        (with a warning) when they are garbage-collected or at exit.
         """
+        self.close_writers()
         return self.searcher.cleanup()
 
+    def writer(self, fp: str | Path) -> utils.RecordWriter:
+        """The open ``RecordWriter`` for ``fp``, created on first use."""
+        key = Path(fp).absolute()
+        writer = self.writers.get(key)
+        if writer is None:
+            cfg = self.config.writer
+            writer = utils.RecordWriter(key, cfg.flush_every, cfg.flush_interval, cfg.fsync)
+            self.writers[key] = writer
+        return writer
+
+    def close_writers(self) -> None:
+        """Flush and close every ``save_*`` output file."""
+        writers, self.writers = self.writers, {}
+        for writer in writers.values():
+            writer.close()
+
     def __enter__(self) -> "SearchEngine":
         return self
 
@@ -168,12 +198,20 @@ class SearchEngine:
     # ==========================================================================
     # Saving
 
-    def save_serp(self, save_dir: str | Path = "", append_to: str | Path = ""):
+    def save_serp(
+        self,
+        save_dir: str | Path = "",
+        append_to: str | Path = "",
+        blob_dir: str | Path = "",
+    ):
         """Save SERP to file
 
         Args:
             save_dir (str, optional): Save results as `save_dir/{serp_id}.html`
             append_to (str, optional): Append results to this file path
+            blob_dir (str, optional): With `append_to`, store the HTML once in a
+                `BlobStore` at this path and append the record with its
+                `html_hash` instead of the `html`
         """
         if not save_dir and not append_to:
             self.log.warning(
@@ -181,8 +219,12 @@ class SearchEngine:
                 extra={"event": "save_serp"},
             )
             return
+        elif append_to and blob_dir:
+            record = {k: v for k, v in self.serp.items() if k != "html"}
+            record["html_hash"] = BlobStore(blob_dir).put(self.serp["html"])
+            self.writer(append_to).write(record)
         elif append_to:
-            utils.write_lines([self.serp], append_to)
+            self.writer(append_to).write(self.serp)
         elif save_dir:
             fp = Path(save_dir) / f"{self.serp['serp_id']}.html"
             with open(fp, "w") as outfile:
@@ -201,7 +243,7 @@ class SearchEngine:
             return
 
         fp = append_to if append_to else Path(save_dir) / "parsed.json"
-        utils.write_lines([self.parsed.model_dump()], fp)
+        self.writer(fp).write(self.parsed.model_dump())
 
     def save_search(self, append_to: str | Path = ""):
         """Save SERP metadata (excludes HTML) to file"""
@@ -213,7 +255,7 @@ class SearchEngine:
             return
 
         self.serp_metadata = {k: v for k, v in self.serp.items() if k != "html"}
-        utils.write_lines([self.serp_metadata], append_to)
+        self.writer(append_to).write(self.serp_metadata)
 
     def to_record(self) -> dict:
         """Build one merged per-SERP record: metadata (excludes HTML) + features + results.
@@ -246,7 +288,7 @@ class SearchEngine:
         record = self.to_record()
         if ws_version:
             record["ws_version"] = ws_version
-        utils.write_lines([record], append_to)
+        self.writer(append_to).write(record)
 
     def save_results(self, save_dir: str | Path = "", append_to: str | Path = ""):
         """Save parsed results
@@ -269,4 +311,4 @@ class SearchEngine:
         result_metadata = {k: self.serp[k] for k in ["crawl_id", "serp_id", "version"]}
         results_output = [{**result, **result_metadata} for result in self.parsed.results]
         fp = append_to if append_to else Path(save_dir) / "results.json"
-        utils.write_lines(results_output, fp)
+        self.writer(fp).write_many(results_output)
@@ -1,11 +1,18 @@
 import atexit
+import bz2
+import gzip
 import hashlib
+import io
 import logging
+import os
 import re
 import subprocess
+import time
 import urllib.parse as urlparse
-from collections.abc import Mapping, Sequence
+import weakref
+from collections.abc import Iterator, Mapping, Sequence
 from pathlib import Path
+from typing import BinaryIO
 
 import brotli
 import orjson
@@ -21,26 +28,326 @@ log = logging.getLogger(__name__)
 # Files ------------------------------------------------------------------------
 
 
-def read_lines(fp: str | Path):
+# Line files may be compressed; the codec is picked from the final suffix
+# (``serps.json.zst``) and the data format from the suffix before it.
+COMPRESSED_SUFFIXES = (".bz2", ".gz", ".zst", ".br")
+
+# Streaming levels: fast enough to keep up with a crawl, still ~10:1 on SERP HTML.
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+BROTLI_QUALITY = 5
+
+
+def import_zstandard():
+    """The ``zstandard`` module, imported on first use; every zstd codec in
+    the package (line files, blobs, archives) goes through here."""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError('zstd support requires zstandard: pip install "WebSearcher[zstd]"') from e
+    return zstandard
+
+
+class _BrotliReader(io.RawIOBase):
+    """Decompress a brotli stream from a binary file, chunk by chunk."""
+
+    def __init__(self, raw: BinaryIO, chunk_size: int = 1 << 16):
+        self.raw = raw
+        self.chunk_size = chunk_size
+        self._decompressor = brotli.Decompressor()
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._pending:
+            chunk = self.raw.read(self.chunk_size)
+            if not chunk:
+                if not self._decompressor.is_finished():
+                    raise EOFError("brotli stream ended before the end-of-stream marker")
+                return 0
+            self._pending = memoryview(self._decompressor.process(chunk))
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self) -> None:
+        self.raw.close()
+        super().close()
+
+
+class _BrotliWriter:
+    """Compress writes into one brotli stream; ``flush`` emits everything
+    written so far, ``close`` ends the stream."""
+
+    def __init__(self, raw: BinaryIO):
+        self.raw = raw
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def write(self, data: bytes) -> int:
+        self.raw.write(self._compressor.process(data))
+        return len(data)
+
+    def flush(self) -> None:
+        self.raw.write(self._compressor.flush())
+
+    def close(self) -> None:
+        self.raw.write(self._compressor.finish())
+
+
+def _compress_stream(suffix: str):
+    """A function wrapping a raw binary file in a compressing stream for
+    ``suffix``; closing the stream ends the compressed data but leaves the file
+    open."""
+    if suffix == ".gz":
+        return lambda raw: gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=GZIP_LEVEL)
+    if suffix == ".bz2":
+        return lambda raw: bz2.BZ2File(raw, "wb")
+    if suffix == ".zst":
+        compressor = import_zstandard().ZstdCompressor(level=ZSTD_LEVEL)
+        return lambda raw: compressor.stream_writer(raw, closefd=False)
+    return _BrotliWriter
+
+
+class _CompressedSink:
+    """A compressing stream over a raw file it owns: ``flush`` pushes the
+    compressed data to the file, ``close`` ends the stream, then the file."""
+
+    def __init__(self, raw: BinaryIO, stream):
+        self.raw = raw
+        self.stream = stream
+
+    def __enter__(self) -> "_CompressedSink":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write(self, data: bytes) -> int:
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+        self.raw.flush()
+
+    def fileno(self) -> int:
+        return self.raw.fileno()
+
+    def close(self) -> None:
+        try:
+            self.stream.close()
+        finally:
+            self.raw.close()
+
+
+def open_lines(fp: str | Path, mode: str = "rt"):
+    """Open a line file for reading (``"rt"`` or ``"rb"``), transparently
+    decompressing ``.bz2`` / ``.gz`` / ``.zst`` / ``.br``. Files appended to
+    over several sessions hold several gzip members / zstd frames / bz2
+    streams; they read as one."""
     fp = Path(fp)
-    with open(fp) as infile:
-        if fp.suffix == ".json":
-            return [orjson.loads(line) for line in infile]
-        else:
-            return [line.strip() for line in infile]
+    if fp.suffix in (".bz2", ".gz"):
+        opener = bz2.open if fp.suffix == ".bz2" else gzip.open
+        return opener(fp, mode)
+    if fp.suffix == ".zst":
+        reader = (
+            import_zstandard()
+            .ZstdDecompressor()
+            .stream_reader(open(fp, "rb"), read_across_frames=True, closefd=True)
+        )
+        stream = io.BufferedReader(reader)
+    elif fp.suffix == ".br":
+        stream = io.BufferedReader(_BrotliReader(open(fp, "rb")))
+    else:
+        return open(fp, mode)
+    return io.TextIOWrapper(stream, encoding="utf-8") if "t" in mode else stream
+
+
+def open_sink(fp: str | Path, overwrite: bool = False) -> BinaryIO | _CompressedSink:
+    """Open a line file for appending bytes (or rewriting, with ``overwrite``),
+    compressing per its suffix.
+
+    A compressed sink is one stream held open until closed, so records written
+    through it share a compression window; ``flush`` makes everything written
+    so far decodable from the file (bz2 excepted: it can only flush on close).
+    Each open of an existing file appends a new gzip member / zstd frame / bz2
+    stream. Brotli streams can't be concatenated, so a non-empty ``.br`` file
+    can only be overwritten -- use ``.zst`` or ``.gz`` for files appended to
+    across sessions.
+    """
+    fp = Path(fp)
+    mode = "wb" if overwrite else "ab"
+    if fp.suffix not in COMPRESSED_SUFFIXES:
+        return open(fp, mode)
+    if fp.suffix == ".br" and not overwrite and fp.exists() and fp.stat().st_size:
+        raise ValueError(f"can't append to an existing brotli stream: {fp}")
+    wrap = _compress_stream(fp.suffix)
+    raw = open(fp, mode)
+    return _CompressedSink(raw, wrap(raw))
+
+
+def is_json_lines(fp: str | Path) -> bool:
+    """True for a JSON-lines path, compressed or not (``.json``, ``.json.zst``)."""
+    fp = Path(fp)
+    if fp.suffix in COMPRESSED_SUFFIXES:
+        fp = fp.with_suffix("")
+    return fp.suffix == ".json"
+
+
+def encode_line(data, json: bool) -> bytes:
+    """One line of a line file: JSON for JSON-lines files, ``str`` otherwise."""
+    line = orjson.dumps(data) if json else str(data).encode("utf-8")
+    return line + b"\n"
+
+
+def iter_lines(fp: str | Path) -> Iterator:
+    """Stream a line file one record at a time (see ``read_lines``).
+
+    Constant memory regardless of file size -- the reader for multi-GB crawl
+    files. JSON lines are read as bytes and handed straight to ``orjson``.
+    """
+    if is_json_lines(fp):
+        with open_lines(fp, "rb") as infile:
+            for line in infile:
+                yield orjson.loads(line)
+    else:
+        with open_lines(fp, "rt") as infile:
+            for line in infile:
+                yield line.strip()
+
+
+def read_lines(fp: str | Path):
+    return list(iter_lines(fp))
 
 
 def write_lines(iter_data, fp: str | Path, overwrite=False):
-    fp = Path(fp)
-    mode = "w" if overwrite else "a+"
+    """Append records to a line file (see ``open_sink`` for compressed files)."""
+    json = is_json_lines(fp)
+    with open_sink(fp, overwrite) as outfile:
+        for data in iter_data:
+            outfile.write(encode_line(data, json))
+
+
+FSYNC_POLICIES = ("never", "flush", "close")
+
+
+class _PendingOutput:
+    """A ``RecordWriter``'s buffered lines and open sink, kept apart from the
+    writer so its finalizer can reach them without keeping the writer alive."""
+
+    def __init__(self, fp: Path):
+        self.fp = fp
+        self.file: BinaryIO | _CompressedSink | None = None
+        self.lines: list[bytes] = []
+
+    def abandon(self) -> None:
+        """Write out and close what an unclosed writer left behind. Without it
+        a compressed file has no end marker (and bz2 output is never written)."""
+        if not self.lines and self.file is None:
+            return
+        log.warning(f"RecordWriter for {self.fp} was not closed; closing it now")
+        if self.lines:
+            if self.file is None:
+                self.file = open_sink(self.fp)
+            self.file.write(b"".join(self.lines))
+            self.lines.clear()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class RecordWriter:
+    """Append lines to one file through a handle held open across writes.
+
+    ``write_lines`` opens, appends, and closes the file on every call -- per
+    record when a crawl saves each SERP, and a measurable share of wall time
+    on a network filesystem at high query rates. A ``RecordWriter`` opens the
+    file once, buffers encoded lines, and writes them out every
+    ``flush_every`` records or once ``flush_interval`` seconds have passed since
+    the last flush (checked on each write; there is no background thread, so
+    close the writer to write out a tail). Lines are encoded as in
+    ``write_lines``: JSON for ``.json`` files, ``str`` otherwise.
+
+    A compressed file (``serps.json.zst``) is written through one streaming
+    compressor kept open until ``close``; see ``open_sink``. Close the writer
+    (or use it as a context manager): one that is garbage-collected or still
+    open at interpreter exit is closed then, with a warning.
+
+    Args:
+        fp: File to append to (created on the first flush).
+        flush_every: Records buffered before a flush (1 = flush every write).
+        flush_interval: Seconds after which the next write flushes.
+        fsync: ``"never"`` leaves durability to the OS, ``"flush"`` fsyncs
+            after every flush, ``"close"`` fsyncs once on close.
+    """
 
-    with open(fp, mode) as outfile:
+    def __init__(
+        self,
+        fp: str | Path,
+        flush_every: int = 1,
+        flush_interval: float = 5.0,
+        fsync: str = "never",
+    ):
+        if flush_every < 1:
+            raise ValueError(f"flush_every must be >= 1, got {flush_every}")
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.fp = Path(fp)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.json = is_json_lines(self.fp)
+        self._out = _PendingOutput(self.fp)
+        self._last_flush = time.monotonic()
+        # Runs when the writer is collected, or at exit (weakref.finalize's atexit hook).
+        weakref.finalize(self, self._out.abandon)
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write(self, data) -> None:
+        """Buffer one record, flushing when the count or interval is reached."""
+        lines = self._out.lines
+        lines.append(encode_line(data, self.json))
+        if (
+            len(lines) >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def write_many(self, iter_data) -> None:
         for data in iter_data:
-            if fp.suffix == ".json":
-                line_output = orjson.dumps(data).decode("utf-8")
-            else:
-                line_output = data
-            outfile.write(f"{line_output}\n")
+            self.write(data)
+
+    def flush(self) -> None:
+        """Write the buffered lines to the file (and fsync, per ``fsync``)."""
+        self._last_flush = time.monotonic()
+        out = self._out
+        if not out.lines:
+            return
+        if out.file is None:
+            out.file = open_sink(self.fp)
+        out.file.write(b"".join(out.lines))
+        out.lines.clear()
+        out.file.flush()
+        if self.fsync == "flush":
+            os.fsync(out.file.fileno())
+
+    def close(self) -> None:
+        """Flush and close the file. The writer reopens on a later write."""
+        self.flush()
+        out = self._out
+        if out.file is None:
+            return
+        if self.fsync == "close":
+            os.fsync(out.file.fileno())
+        out.file.close()
+        out.file = None
 
 
 def load_html(fp: str | Path, zipped: bool = False) -> str | bytes:
@@ -77,8 +384,9 @@ def slugify(text: str, sep: str = "_") -> str:
 # Hashing ----------------------------------------------------------------------
 
 
-def hash_id(s):
-    return hashlib.sha224(s.encode("utf-8")).hexdigest()
+def hash_id(s: str | bytes) -> str:
+    data = s.encode("utf-8") if isinstance(s, str) else s
+    return hashlib.sha224(data).hexdigest()
 
 
 # Parsing ----------------------------------------------------------------------
@@ -103,21 +411,50 @@ def is_sorry_redirect(url: str | None) -> bool:
     return parts.path == "/sorry" or parts.path.startswith("/sorry/")
 
 
-def has_captcha(soup: Node | None, html: str | None = None) -> bool:
+def has_captcha(soup: Node | None, html: str | bytes | None = None) -> bool:
     """Boolean for 'CAPTCHA' appearance in the document text.
 
-    If ``html`` (the raw markup) is provided, a substring check rules out the
-    common no-captcha case without a document text walk. Falls back to
-    ``soup.text(deep=True)`` so script/style/template content doesn't
-    false-positive on JS that happens to contain the literal.
+    If ``html`` (the raw markup, ``str`` or undecoded ``bytes``) is provided, a
+    substring check rules out the common no-captcha case without a document
+    text walk. Falls back to ``soup.text(deep=True)`` so script/style/template
+    content doesn't false-positive on JS that happens to contain the literal.
     """
-    if html is not None and "CAPTCHA" not in html:
+    if isinstance(html, bytes):
+        if b"CAPTCHA" not in html:
+            return False
+    elif html is not None and "CAPTCHA" not in html:
         return False
     if soup is None:
         return False
     return "CAPTCHA" in (soup.text(deep=True) or "")
 
 
+# The challenge form on Google's CAPTCHA block page (the /sorry/ interstitial).
+# Unlike the bare word "CAPTCHA" -- which a SERP about CAPTCHAs carries in its
+# results -- this markup never appears on a results page.
+CAPTCHA_PAGE_MARKER = 'id="captcha-form"'
+CAPTCHA_PAGE_MARKER_B = CAPTCHA_PAGE_MARKER.encode()
+
+
+def is_captcha_page(html: str | bytes | None) -> bool:
+    """Boolean for Google's CAPTCHA block page, from the raw markup alone."""
+    if isinstance(html, bytes):
+        return CAPTCHA_PAGE_MARKER_B in html
+    return html is not None and CAPTCHA_PAGE_MARKER in html
+
+
+def is_blocked(html: str | bytes | None, url: str | None = None) -> bool:
+    """Boolean for a response with no SERP to parse: a /sorry/ redirect, an
+    empty (or whitespace-only) body, or the CAPTCHA block page.
+
+    A raw-markup check -- no DOM is built -- so ``parse_serp`` can answer these
+    without extraction. During a block wave they are most of the responses.
+    """
+    if not html or html.isspace():
+        return True
+    return is_sorry_redirect(url) or is_captcha_page(html)
+
+
 def get_link_list(soup: Node | None) -> list[str] | None:
     """All descendant anchor ``href``s in document order; ``None`` when none."""
     if soup is None:
@@ -0,0 +1,12 @@
+"""Shared builders for synthetic test inputs"""
+
+
+def make_serp(n_results: int, offset: int = 0, head: str = "") -> str:
+    """Minimal standard-layout SERP: ``n_results`` organic results, each a
+    ``div.MjjYud > div.g`` block with a distinct site, numbered from ``offset``."""
+    blocks = "".join(
+        f'<div class="MjjYud"><div class="g"><a href="https://site{i}.example/{i}">'
+        f"<h3>Result {i}</h3></a><span>snippet {i}</span></div></div>"
+        for i in range(offset, offset + n_results)
+    )
+    return f'<html lang="en"><head>{head}</head><body><div id="rso">{blocks}</div></body></html>'
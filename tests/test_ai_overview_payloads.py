@@ -1,5 +1,11 @@
 """Unit tests for the AI overview payload extractor."""
 
+import html as html_lib
+import re
+
+import pytest
+
+from WebSearcher.parsers.components import _ai_overview_payloads as payloads
 from WebSearcher.parsers.components._ai_overview_payloads import extract_payloads
 
 UUID = "12345678-1234-1234-1234-123456789abc"
@@ -122,3 +128,143 @@ def test_multiple_payloads_per_uuid():
     out = extract_payloads(raw)
     assert out[UUID]["header"]["total"] == 2
     assert [p["source_id"] for p in out[UUID]["type_a"]] == ["1", "2"]
+
+
+def test_bytes_input_matches_str():
+    """Undecoded bytes take the bytes scanners; the payloads are identical."""
+    raw = (
+        f"<!--TgQPHd|[[null,null,&quot;{UUID}&quot;,null,null,1,0,&quot;f&quot;,&quot;Café&quot;,2]]-->"
+        f"<!--Sv6Kpe[[&quot;{UUID}&quot;,&quot;3&quot;,0,&quot;https://u&quot;,&quot;f&quot;,&quot;&quot;]]-->"
+        r'(j.lDPB=j.lDPB||[]).push([["abc_67","[[\"'
+        + UUID
+        + r'\",[\"Title\",\"Snippet\",\"https://fav\",\"https://dom\",[\"Pub\"],\"https://url\",null,null,\"5\",null,null,null]]]"]])'
+    )
+    out = extract_payloads(raw.encode("utf-8"))
+    assert out == extract_payloads(raw)
+    assert out[UUID]["header"]["publisher"] == "Café"
+    assert [p["source_id"] for p in out[UUID]["type_b"]] == ["3"]
+    assert [p["source_id"] for p in out[UUID]["type_a"]] == ["5"]
+
+
+# Lazy index ---------------------------------------------------------------------
+# The find-based scan and per-UUID decode must give exactly what the previous
+# eager scan (three DOTALL regexes, every blob decoded) gave.
+
+EAGER_COMMENTS = [
+    re.compile(r"<!--TgQPHd\|(.+?)-->", re.DOTALL),
+    re.compile(r"<!--Sv6Kpe(.+?)-->", re.DOTALL),
+]
+EAGER_PUSH = re.compile(r'\["[a-zA-Z0-9_]+","(\[\[\\"[0-9a-f-]{36}\\".*?\]\])"\]', re.DOTALL)
+
+
+def eager_payloads(raw: str) -> dict:
+    blobs = [html_lib.unescape(m.group(1)) for rx in EAGER_COMMENTS for m in rx.finditer(raw)]
+    for m in EAGER_PUSH.finditer(raw):
+        try:
+            blobs.append(m.group(1).encode("utf-8").decode("unicode_escape"))
+        except UnicodeDecodeError:
+            continue
+    out: dict = {}
+    for blob in blobs:
+        classified = payloads._classify(blob)
+        if classified is None:
+            continue
+        kind, uuid, value = classified
+        bucket = out.setdefault(uuid, {"header": None, "type_a": [], "type_b": []})
+        if kind == "header":
+            bucket["header"] = value
+        else:
+            bucket[kind].append(value)
+    return out
+
+
+UUID2 = "abcdef01-2345-6789-abcd-ef0123456789"
+
+
+def header(uuid, publisher="Pub", total=2):
+    return (
+        f"<!--TgQPHd|[[null,null,&quot;{uuid}&quot;,null,null,1,0,"
+        f"&quot;f&quot;,&quot;{publisher}&quot;,{total}]]-->"
+    )
+
+
+def type_a(uuid, src_id, title="T", marker="TgQPHd|"):
+    return (
+        f"<!--{marker}[[&quot;{uuid}&quot;,[&quot;{title}&quot;,&quot;S&quot;,&quot;f&quot;,"
+        f"&quot;d&quot;,[&quot;P&quot;],&quot;u&quot;,null,null,&quot;{src_id}&quot;]]]-->"
+    )
+
+
+def push_a(uuid, src_id, title="T"):
+    return (
+        r'(j.lDPB=j.lDPB||[]).push([["abc_1","[[\"'
+        + uuid
+        + r"\",[\""
+        + title
+        + r"\",\"S\",\"f\",\"d\",[\"P\"],\"u\",null,null,\""
+        + src_id
+        + r'\"]]]"],'
+        r'["abc_2","[[\"' + uuid + r'\",\"9\",0,\"https://b\",\"f\",\"\"]]"]])'
+    )
+
+
+DOCS = [
+    "",
+    header(UUID) + type_a(UUID, "1") + type_a(UUID2, "1", title="second") + push_a(UUID2, "2"),
+    # UUID2's first payload comes before UUID's: mapping order follows it.
+    type_a(UUID2, "3") + header(UUID) + type_a(UUID, "3", title="later"),
+    # A malformed header doesn't rank its UUID; the later type B does.
+    "<!--TgQPHd|[[null,null,&quot;" + UUID + "&quot;]]-->" + type_a(UUID2, "1") + push_a(UUID, "4"),
+    # Empty comment: ``(.+?)-->`` runs on to the next ``-->``.
+    "<!--TgQPHd|--><!--x-->" + header(UUID),
+    # Escaped brackets: the leading shape can't be read, so it decodes in the scan.
+    "<!--TgQPHd|&#91;[&quot;" + UUID + "&quot;,&quot;2&quot;,0,&quot;u&quot;,&quot;f&quot;]]-->",
+    # Sv6Kpe and a non-UUID push id.
+    type_a(UUID, "5", marker="Sv6Kpe") + r'["x","[[\"' + "-" * 36 + r'\",1]]"]',
+    # A push entry nested in another's lazy match is skipped, as finditer skips it.
+    r'["a","[[\"'
+    + UUID
+    + r"\",[\"x\",\"y\",\"f\",\"d\",[\"P\"],\"u\",null,null,\"6\"]"
+    + r'["b","[[\"'
+    + UUID2
+    + r'\",\"1\",0,\"u\",\"f\"]]"]',
+]
+
+
+@pytest.mark.parametrize("doc", DOCS)
+@pytest.mark.parametrize("encode", [False, True])
+def test_lazy_index_matches_eager_scan(doc, encode):
+    raw = doc.encode("utf-8") if encode else doc
+    index = payloads.PayloadIndex(raw)
+    expected = eager_payloads(doc)
+    assert dict(index) == expected
+    assert list(index) == list(expected)
+    # Fresh index: per-UUID lookups alone give the same buckets.
+    lazy = payloads.PayloadIndex(raw)
+    for uuid, bucket in expected.items():
+        assert lazy.get(uuid) == bucket
+    assert lazy.get("00000000-0000-0000-0000-000000000000") is None
+
+
+@pytest.mark.parametrize("doc", DOCS)
+def test_type_a_by_src_id_matches_flattened_mapping(doc):
+    expected: dict = {}
+    for bucket in eager_payloads(doc).values():
+        for entry in bucket["type_a"]:
+            if entry["source_id"] and entry["source_id"] not in expected:
+                expected[entry["source_id"]] = entry
+    assert payloads.PayloadIndex(doc).type_a_by_src_id() == expected
+
+
+def test_lookup_decodes_only_that_uuid():
+    index = payloads.PayloadIndex(header(UUID) + type_a(UUID, "1") + type_a(UUID2, "2"))
+    assert index[UUID2]["type_a"][0]["source_id"] == "2"
+    assert len(index._decoded) == 1
+
+
+def test_type_a_map_skips_type_b_blobs():
+    doc = header(UUID) + push_a(UUID, "1")
+    index = payloads.PayloadIndex(doc)
+    assert list(index.type_a_by_src_id()) == ["1"]
+    # The header (for ordering) and the type A push; not the type B push.
+    assert len(index._decoded) == 2
@@ -0,0 +1,105 @@
+"""Tests for dictionary-compressed SERP archives"""
+
+import random
+
+import pytest
+
+pytest.importorskip("zstandard")
+
+from helpers import make_serp  # noqa: E402
+
+import WebSearcher as ws  # noqa: E402
+from WebSearcher import archive, reparse, utils  # noqa: E402
+from WebSearcher.demos.show import show  # noqa: E402
+
+# Boilerplate shared by every SERP but not repetitive within one, like real page chrome.
+_rng = random.Random(0)
+CHROME = "<script>" + "".join(f"var v{_rng.getrandbits(40):x}=1;" for _ in range(400)) + "</script>"
+
+
+RECORDS = [
+    {
+        "serp_id": f"s{i}",
+        "crawl_id": "c0",
+        "qry": f"q{i % 15}",
+        "html": make_serp(5, offset=5 * i, head=CHROME),
+    }
+    for i in range(40)
+]
+
+
+@pytest.fixture
+def archive_file(tmp_path):
+    fp = tmp_path / "serps.wsa"
+    assert archive.write_archive(RECORDS, fp, samples=20, dict_size=16_384) == len(RECORDS)
+    return fp
+
+
+def test_random_access(archive_file):
+    with archive.ArchiveReader(archive_file) as reader:
+        assert len(reader) == len(RECORDS)
+        assert reader.serp_ids == [r["serp_id"] for r in RECORDS]
+        assert reader.get("s17") == RECORDS[17]
+        assert reader.record(0) == RECORDS[0]
+        assert "s39" in reader and "s40" not in reader
+        assert reader.find("q3") == [RECORDS[3], RECORDS[18], RECORDS[33]]
+        assert list(reader) == RECORDS
+        with pytest.raises(KeyError):
+            reader.get("missing")
+
+
+def test_dictionary_beats_plain_frames(archive_file, tmp_path):
+    plain = tmp_path / "plain.wsa"
+    with archive.ArchiveWriter(plain) as writer:
+        writer.write_all(RECORDS)
+    assert archive_file.stat().st_size < plain.stat().st_size
+    with archive.ArchiveReader(plain) as reader:
+        assert list(reader) == RECORDS
+
+
+def test_too_few_samples_falls_back(tmp_path, caplog):
+    fp = tmp_path / "small.wsa"
+    archive.write_archive(RECORDS[:2], fp)
+    assert "no dictionary trained" in caplog.text
+    with archive.ArchiveReader(fp) as reader:
+        assert list(reader) == RECORDS[:2]
+
+
+def test_rejects_unclosed_or_foreign(tmp_path):
+    writer = archive.ArchiveWriter(tmp_path / "open.wsa")
+    writer.write(RECORDS[0])
+    writer._file.flush()
+    with pytest.raises(ValueError, match="footer"):
+        archive.ArchiveReader(tmp_path / "open.wsa")
+    writer.close()
+    writer.close()
+    with pytest.raises(ValueError, match="closed"):
+        writer.write(RECORDS[1])
+    (tmp_path / "other.wsa").write_bytes(b"not an archive")
+    with pytest.raises(ValueError, match="not a WebSearcher archive"):
+        archive.ArchiveReader(tmp_path / "other.wsa")
+
+
+def test_main_and_reparse(tmp_path, capsys):
+    crawl = tmp_path / "serps.json.gz"
+    utils.write_lines(RECORDS, crawl)
+    fp = tmp_path / "serps.wsa"
+    archive.main([str(crawl), str(fp), "--samples", "20", "--dict-size", "16384"])
+    assert "archived 40 records" in capsys.readouterr().out
+    from_archive, from_crawl = tmp_path / "a.json", tmp_path / "b.json"
+    reparse.reparse(fp, from_archive, workers=1)
+    reparse.reparse(crawl, from_crawl, workers=1)
+    assert from_archive.read_bytes() == from_crawl.read_bytes()
+
+
+def test_show_reads_archive(archive_file, capsys, monkeypatch):
+    read = []
+    record = archive.ArchiveReader.record
+    monkeypatch.setattr(
+        archive.ArchiveReader, "record", lambda self, i: read.append(i) or record(self, i)
+    )
+    parsed = show("q4", data_dir=str(archive_file.parent))
+    assert parsed == ws.parse_serp(RECORDS[34]["html"])  # the last q4 capture
+    assert read == [34]  # the other q4 captures stay compressed
+    show(data_dir=str(archive_file.parent), list_queries=True)
+    assert capsys.readouterr().out.splitlines()[-40:] == [r["qry"] for r in RECORDS]
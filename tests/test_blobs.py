@@ -0,0 +1,72 @@
+"""Tests for the content-addressed SERP HTML store"""
+
+import importlib.util
+
+import pytest
+
+from WebSearcher import utils
+from WebSearcher.blobs import BlobStore
+
+needs_zstd = pytest.mark.skipif(
+    importlib.util.find_spec("zstandard") is None, reason="zstandard not installed"
+)
+
+HTML = '<html lang="en"><body><div id="rso">' + "résultat " * 500 + "</div></body></html>"
+
+
+@pytest.mark.parametrize("codec", ["br", pytest.param("zst", marks=needs_zstd)])
+def test_put_get_round_trip(tmp_path, codec):
+    store = BlobStore(tmp_path / "blobs", codec=codec)
+    digest = store.put(HTML)
+    assert digest == utils.hash_id(HTML)
+    assert digest in store
+    assert store.get(digest) == HTML
+    fp = store.path(digest)
+    assert fp.relative_to(store.root).parts == (digest[:2], digest[2:4], f"{digest}.html.{codec}")
+    assert fp.stat().st_size < len(HTML.encode()) // 10
+
+
+def test_identical_pages_stored_once(tmp_path):
+    store = BlobStore(tmp_path)
+    assert store.put(HTML) == store.put(HTML.encode("utf-8"))
+    assert store.put(HTML + " ") != store.put(HTML)
+    blobs = [p for p in tmp_path.rglob("*") if p.is_file()]
+    assert len(blobs) == 2  # no temp files left behind
+
+
+@needs_zstd
+def test_reads_either_codec(tmp_path):
+    digest = BlobStore(tmp_path, codec="zst").put(HTML)
+    store = BlobStore(tmp_path, codec="br")
+    assert store.get(digest) == HTML
+    assert store.put(HTML) == digest
+    assert not store.path(digest).exists()  # the zst blob already covers it
+
+
+def test_missing_and_invalid(tmp_path):
+    store = BlobStore(tmp_path)
+    with pytest.raises(KeyError):
+        store.get(utils.hash_id("absent"))
+    with pytest.raises(ValueError, match="codec"):
+        BlobStore(tmp_path, codec="gz")
+
+
+def test_missing_store_not_created(tmp_path):
+    store = BlobStore(tmp_path / "blobz")
+    assert utils.hash_id(HTML) not in store
+    with pytest.raises(FileNotFoundError, match="blobz"):
+        store.get(utils.hash_id(HTML))
+    with pytest.raises(FileNotFoundError):
+        list(store.with_html([{"html_hash": utils.hash_id(HTML)}]))
+    assert not store.root.exists()
+    store.put(HTML)
+    assert store.get(utils.hash_id(HTML)) == HTML
+
+
+def test_with_html(tmp_path):
+    store = BlobStore(tmp_path)
+    records = [{"serp_id": "a", "html_hash": store.put(HTML)}, {"serp_id": "b", "html": "<p>"}]
+    resolved = list(store.with_html(records))
+    assert resolved[0] == {**records[0], "html": HTML}
+    assert resolved[1] is records[1]
+    assert "html" not in records[0]
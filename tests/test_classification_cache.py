@@ -0,0 +1,138 @@
+"""Tests for the cross-SERP structural classification cache"""
+
+import itertools
+import multiprocessing
+import operator
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from helpers import make_serp
+
+import WebSearcher as ws
+from WebSearcher import utils
+from WebSearcher._parse_context import ParseContext
+from WebSearcher.classifiers import ClassificationCache, ClassifyMain
+from WebSearcher.parsers import parse_serp as parse_serp_module
+
+
+def classify(inner: str) -> str:
+    return ClassifyMain.classify(
+        utils.make_soup(f'<div class="wrap">{inner}</div>').css_first("div.wrap")
+    )
+
+
+def test_same_shape_hits_across_serps():
+    cache = ClassificationCache()
+    first = ws.parse_serp(make_serp(3), classify_cache=cache)
+    assert cache.report()["misses"] == 1  # three organic results, one shape
+    second = ws.parse_serp(make_serp(4, offset=10), classify_cache=cache)
+    assert cache.report() == {"hits": 6, "misses": 1, "size": 1, "verified": 0, "divergences": 0}
+    assert first == ws.parse_serp(make_serp(3))
+    assert second == ws.parse_serp(make_serp(4, offset=10))
+
+
+def test_tracking_ids_left_out_of_fingerprint():
+    def tracked(html: str, serp: int) -> str:
+        rank = itertools.count()
+        return re.sub(
+            r'<div class="(MjjYud|g)">',
+            lambda m: (
+                f'<div class="{m[1]}" data-hveid="C{serp}{next(rank)}QAA" data-ved="x{serp}">'
+            ),
+            html,
+        )
+
+    cache = ClassificationCache()
+    ws.parse_serp(tracked(make_serp(1), serp=1), classify_cache=cache)
+    ws.parse_serp(tracked(make_serp(1, offset=7), serp=2), classify_cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    # The hveid knowledge_box reads still splits the shape.
+    with ParseContext(classify_cache=cache).active():
+        for hveid in ("CAMQAA", "CAEQAA"):
+            html = f'<div class="kp-blk" data-hveid="{hveid}">x</div>'
+            ClassifyMain.classify(utils.make_soup(html).css_first("div.kp-blk"))
+    assert cache.misses == 3
+
+
+def test_classify_serp_uses_cache():
+    cache = ClassificationCache()
+    html = make_serp(2)
+    assert ws.classify_serp(html, classify_cache=cache) == ws.classify_serp(html)
+    assert cache.hits == 1
+
+
+def test_verify_catches_and_evicts_divergence():
+    # Whole-text matches are outside the fingerprint: these two share one.
+    cache = ClassificationCache(verify=1.0)
+    with ParseContext(classify_cache=cache).active():
+        assert classify("<div>Other text</div>") == "unknown"
+        assert classify("<div>Twitter Results</div>") == "twitter_result"
+    assert cache.n_divergences == 1
+    assert list(cache.divergences)[0]["cached"] == "unknown"
+    assert list(cache.divergences)[0]["actual"] == "twitter_result"
+    assert len(cache) == 0
+
+
+def test_lru_bound():
+    cache = ClassificationCache(maxsize=1)
+    with ParseContext(classify_cache=cache).active():
+        classify('<div class="ITWcLb">x</div>')
+        classify('<div class="dob-modules">x</div>')
+        classify('<div class="ITWcLb">x</div>')
+    assert (cache.hits, cache.misses, len(cache)) == (0, 3, 1)
+
+
+def test_pickles_to_the_process_instance():
+    cache = ClassificationCache()
+    assert pickle.loads(pickle.dumps(cache)) is cache
+
+
+def test_parse_serps_passthrough():
+    cache = ClassificationCache()
+    out = list(
+        ws.parse_serps([make_serp(2), make_serp(2, offset=5)], workers=1, classify_cache=cache)
+    )
+    assert [len(o["results"]) for o in out] == [2, 2]
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError, match="maxsize"):
+        ClassificationCache(maxsize=0)
+    with pytest.raises(ValueError, match="verify"):
+        ClassificationCache(verify=1.5)
+
+
+class _KeepAlivePool(ProcessPoolExecutor):
+    """A one-worker spawn pool that outlives ``parse_serps``' ``with`` block, so
+    the test can ask its worker for the cache counters afterwards."""
+
+    def __init__(self, max_workers=None):
+        super().__init__(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+def test_worker_cache_persists_across_chunks_under_spawn(monkeypatch):
+    pools: list[_KeepAlivePool] = []
+
+    def make_pool(max_workers=None):
+        pools.append(_KeepAlivePool())
+        return pools[-1]
+
+    monkeypatch.setattr(parse_serp_module, "ProcessPoolExecutor", make_pool)
+    cache = ClassificationCache()
+    serps = [make_serp(1, offset=i) for i in range(3)]  # one component, one shape each
+    out = list(ws.parse_serps(serps, workers=2, chunksize=1, classify_cache=cache))
+    assert len(out) == 3
+    (pool,) = pools
+    try:
+        report = pool.submit(operator.methodcaller("report"), cache).result()
+    finally:
+        pool.shutdown()
+    # Chunk one misses; chunks two and three hit the worker's surviving copy.
+    assert (report["hits"], report["misses"]) == (2, 1)
+    assert cache.report()["hits"] == 0  # counters stay in the worker
@@ -0,0 +1,117 @@
+"""Tests for ClassifyMain's gate-indexed dispatch and header-text trie"""
+
+import pytest
+
+from WebSearcher import utils
+from WebSearcher.classifiers import main
+from WebSearcher.parsers.component_types import header_text_to_type
+
+
+def signals_for(inner: str):
+    cmpt = utils.make_soup(f'<div class="wrap">{inner}</div>').css_first("div.wrap")
+    return main._ComponentSignals(cmpt)
+
+
+def linear_candidates(signals) -> list[int]:
+    """The pre-index dispatch: walk the chain, testing each gate directly."""
+    out = []
+    for pos, (_, gate) in enumerate(main._CHAIN):
+        if gate is None or any(
+            token in getattr(signals, kind) for kind, tokens in gate.items() for token in tokens
+        ):
+            out.append(pos)
+    return out
+
+
+GATE_TOKENS = [
+    (kind, token)
+    for _, gate in main._CHAIN
+    if gate is not None
+    for kind, tokens in gate.items()
+    for token in tokens
+]
+
+
+def snippet(kind: str, token: str) -> str:
+    if kind == "classes":
+        return f'<div class="{token}">x</div>'
+    if kind == "ids":
+        return f'<div id="{token}">x</div>'
+    return f"<{token}>x</{token}>"
+
+
+def test_signal_sets_derived_from_gates():
+    # The tokens the hand-maintained sets used to list, now derived.
+    assert main._NAME_SIGNALS == {
+        "g-scrolling-carousel",
+        "g-tray-header",
+        "block-component",
+        "h2",
+        "promo-throttler",
+        "product-viewer-group",
+        "g-more-link",
+    }
+    assert main._ID_SIGNALS == {
+        "imagebox_bigimages",
+        "iur",
+        "knowledge-finance-wholepage__entity-summary",
+        "eer-masthead",
+    }
+
+
+@pytest.mark.parametrize("kind,token", GATE_TOKENS)
+def test_each_gate_token_opens_its_classifiers(kind, token):
+    signals = signals_for(snippet(kind, token))
+    assert token in getattr(signals, kind)
+    assert main._candidates(signals) == linear_candidates(signals)
+
+
+def test_combined_signals_keep_chain_order():
+    inner = "".join(snippet(kind, token) for kind, token in GATE_TOKENS)
+    signals = signals_for(inner)
+    assert main._candidates(signals) == list(range(len(main._CHAIN)))
+
+
+def test_ungated_only_component():
+    signals = signals_for("<span>plain</span>")
+    assert main._candidates(signals) == sorted(main._UNGATED)
+
+
+# Header-text trie -------------------------------------------------------------
+
+
+def linear_header_match(text: str, level: int) -> str:
+    """The pre-trie matcher: suffix rule, then every marker in registry order."""
+    if text.endswith("locations"):
+        return "local_results"
+    for marker, label in header_text_to_type(level).items():
+        if marker != "locations" and text.startswith(marker):
+            return label
+    return "unknown"
+
+
+def header_cases(level: int) -> list[str]:
+    markers = list(header_text_to_type(level))
+    return [
+        *markers,
+        *(m + " and more" for m in markers),
+        *(m[:-1] for m in markers if len(m) > 1),
+        "",
+        "Nothing registered",
+        "12 locations",
+        "Noticias Locales de hoy",
+    ]
+
+
+@pytest.mark.parametrize("level", [2, 3])
+def test_header_trie_matches_linear_scan(level):
+    trie = main._header_trie(level)
+    for text in header_cases(level):
+        assert trie.match(text) == linear_header_match(text, level), text
+
+
+def test_header_trie_earliest_registration_wins_over_longest():
+    trie = main._HeaderTrie({"Noticias Locales": "local_news", "Noticias": "top_stories"})
+    assert trie.match("Noticias Locales hoy") == "local_news"
+    trie = main._HeaderTrie({"Noticias": "top_stories", "Noticias Locales": "local_news"})
+    assert trie.match("Noticias Locales hoy") == "top_stories"
@@ -0,0 +1,114 @@
+"""Tests for opt-in classifier chain statistics"""
+
+import logging
+
+import WebSearcher as ws
+from WebSearcher import utils
+from WebSearcher.classifiers import ClassifierStats, ClassifyMain, collect_classifier_stats
+from WebSearcher.classifiers import main as classify_main
+from WebSearcher.parsers import bench
+
+SERP = (
+    '<html lang="en"><body>'
+    '<div id="rso"><div class="g"><a href="https://a.example"><h3>A</h3></a></div>'
+    '<div class="g"><a href="https://b.example"><h3>B</h3></a></div></div>'
+    '<div id="botstuff"><div id="bres"><h3>Related searches</h3>'
+    '<a href="/search?q=x">x</a></div></div>'
+    "</body></html>"
+)
+
+
+def by_name(stats: ClassifierStats, chain: str) -> dict[str, dict]:
+    return stats.counts[chain]
+
+
+def test_stats_off_by_default():
+    assert classify_main.classifier_stats.get() is None
+
+
+def test_counts_match_uninstrumented_chain():
+    plain = ws.parse_serp(SERP)
+    with collect_classifier_stats() as stats:
+        counted = ws.parse_serp(SERP)
+    assert counted == plain
+
+    main_rows = by_name(stats, "main")
+    general = main_rows["ClassifyMain.general"]
+    assert (general["matched"], general["unknown"]) == (2, 0)
+    # Gated classifiers ahead of ``general`` are reached but skipped on plain results.
+    assert main_rows["ClassifyMain.top_stories"]["skipped"] == 2
+    # Nothing after the match is reached.
+    assert "ClassifyMain.people_also_ask" not in main_rows
+    for row in stats.rows():
+        assert row["reached"] == row["skipped"] + row["matched"] + row["unknown"]
+
+
+def test_footer_chain_counted():
+    with collect_classifier_stats() as stats:
+        ws.parse_serp(SERP)
+    footer = by_name(stats, "footer")
+    assert footer["ClassifyFooter.searches_related"]["matched"] == 1
+    assert footer["ClassifyMain.img_cards"]["unknown"] == 1
+
+
+def test_aggregates_and_merges():
+    with collect_classifier_stats() as stats:
+        ws.parse_serp(SERP)
+    with collect_classifier_stats(stats):
+        ws.parse_serp(SERP)
+    assert by_name(stats, "main")["ClassifyMain.general"]["matched"] == 4
+
+    total = ClassifierStats()
+    total.merge(stats)
+    total.merge(stats)
+    assert by_name(total, "main")["ClassifyMain.general"]["matched"] == 8
+
+
+def _counts(stats: ClassifierStats) -> list[dict]:
+    return [{k: v for k, v in r.items() if k != "seconds"} for r in stats.rows()]
+
+
+def test_parse_serps_workers_report_back():
+    with collect_classifier_stats() as in_process:
+        list(ws.parse_serps([SERP] * 4, workers=1, chunksize=1))
+    with collect_classifier_stats() as pooled:
+        list(ws.parse_serps([SERP] * 4, workers=2, chunksize=1))
+    assert _counts(in_process)
+    assert sorted(_counts(pooled), key=str) == sorted(_counts(in_process), key=str)
+
+
+def test_classification_cache_hits_counted():
+    cache = ws.ClassificationCache()
+    with collect_classifier_stats() as stats:
+        ws.parse_serp(SERP, classify_cache=cache)
+        ws.parse_serp(SERP, classify_cache=cache)
+    # The two results share a shape: only the first one ran the chain.
+    assert by_name(stats, "main")["ClassifyMain.general"]["matched"] == 1
+    assert stats.cache_hits == {"main": cache.hits} == {"main": 3}
+
+    total = ClassifierStats()
+    total.merge(stats)
+    total.merge(stats)
+    assert total.cache_hits == {"main": 2 * cache.hits}
+
+
+def test_direct_classify_collects():
+    cmpt = utils.make_soup('<div class="wrap"><div class="ITWcLb">x</div></div>')
+    with collect_classifier_stats() as stats:
+        assert ClassifyMain.classify(cmpt.css_first("div.wrap")) == "buying_guide"
+    assert by_name(stats, "main")["ClassifyMain.buying_guide"]["matched"] == 1
+
+
+def test_bench_classifier_stats(tmp_path, capsys):
+    fixture = tmp_path / "serps.json"
+    utils.write_lines([{"html": SERP}], fixture)
+    # bench quiets the package logger; don't leak that into later tests.
+    pkg_log = logging.getLogger("WebSearcher")
+    level = pkg_log.level
+    try:
+        bench.main(["--fixtures", str(fixture), "--classifier-stats", "--no-save"])
+    finally:
+        pkg_log.setLevel(level)
+    out = capsys.readouterr().out
+    assert "Classifier statistics over 1 SERPs" in out
+    assert "ClassifyMain.general" in out
@@ -62,3 +62,28 @@ def test_add_component_honors_explicit_zero_rank():
     cl.add_component(comp("<span>a</span>"), section="main")  # auto rank 0, counter -> 1
     cl.add_component(comp("<span>b</span>"), section="main", cmpt_rank=0)
     assert cl.components[1].cmpt_rank == 0
+
+
+def _custom_parser(elem) -> list[dict]:
+    # A row with a type-less ``details`` payload, backfilled to "item".
+    return [{"type": "custom", "title": "t", "details": {"k": 1}}, {"type": "c2"}]
+
+
+def _parsed_list(validate: bool) -> list[dict]:
+    cl = ComponentList()
+    cl.add_component(comp("<span>stray</span>"), section="main", type="unknown")
+    cl.add_component(comp("<span>widget</span>"), section="footer", type="weather")
+    cl.add_component(comp("<span>x</span>"), section="main", type="unknown")
+    for i, c in enumerate(cl.components):
+        c.parse_component(_custom_parser if i == 2 else None, validate=validate)
+    return cl.export_component_results(validate=not validate)
+
+
+def test_batch_validated_export_matches_per_row():
+    batched = _parsed_list(validate=False)
+    assert batched == _parsed_list(validate=True)
+    assert [list(r)[:2] + list(r)[-1:] for r in batched] == [
+        ["section", "cmpt_rank", "serp_rank"]
+    ] * 4
+    assert [r["serp_rank"] for r in batched] == [0, 1, 2, 3]
+    assert batched[2]["details"] == {"type": "item", "k": 1}
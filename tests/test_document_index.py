@@ -0,0 +1,95 @@
+"""The per-document index must answer exactly what a fresh walk of the
+post-extraction tree would (the plan 044 equivalence contract)."""
+
+import WebSearcher as ws
+from WebSearcher import utils
+from WebSearcher._document_index import DocumentIndex, hides, last_descendant
+from WebSearcher._slx import reparse_fragment
+
+# An RHS column and a top-ads block nested under main-column containers, and
+# display:none wrappers above, around, and inside the detached subtrees.
+HTML = """
+<html><body><div id="rcnt">
+  <div id="center_col" style="display: none">
+    <div id="tads"><div class="uEierd"><a href="https://ad.example">ad</a></div></div>
+    <div id="rso">
+      <div class="MjjYud"><div class="g"><a href="https://a.example"><h3>A</h3></a></div></div>
+      <div class="MjjYud"><div style="DISPLAY:NONE"><div class="g">
+        <a href="https://b.example"><h3>B</h3></a></div></div></div>
+    </div>
+  </div>
+  <div class="wrap">
+    <div id="rhs" class="kp-wholepage"><div style="display:none"><span class="Fzsovc">x</span></div>
+      <div class="TzHB6b"><b>rhs</b></div></div>
+    <div class="g"><a href="https://c.example"><h3>C</h3></a></div>
+  </div>
+</div></body></html>
+"""
+
+
+def _walk_is_hidden(node) -> bool:
+    while node is not None:
+        if hides(node):
+            return True
+        node = node.parent
+    return False
+
+
+def _ids(nodes) -> list[int]:
+    return [n.mem_id for n in nodes]
+
+
+def test_index_matches_fresh_walk_after_detach():
+    soup = utils.make_soup(HTML)
+    index = DocumentIndex(soup)
+    everything = soup.css("*")
+    tads, rhs = soup.css_first("#tads"), soup.css_first("#rhs")
+    index.detach(tads)
+    index.detach(rhs)
+    assert tads.parent is None and rhs.parent is None
+
+    for el in everything:
+        assert _ids(index.subtree(el)) == _ids(el.css("*"))
+        assert index.is_hidden(el) == _walk_is_hidden(el)
+        start, end = index.span(el)
+        assert end == index.position(last_descendant(el))
+
+    # The detached RHS no longer counts toward its old container, and the
+    # hidden center column no longer hides the detached ads.
+    wrap = soup.css_first("div.wrap")
+    assert "kp-wholepage" not in {
+        c for el in index.subtree(wrap) for c in (el.attrs.get("class") or "").split()
+    }
+    assert index.is_hidden(tads.css_first("a")) is False
+
+
+def test_index_unknown_and_released():
+    soup = utils.make_soup(HTML)
+    index = DocumentIndex(soup)
+    other = utils.make_soup("<div><p>x</p></div>").css_first("p")
+    assert index.subtree(other) is None
+    assert index.is_hidden(other) is None
+    index.release()
+    assert index.subtree(soup) is None
+    assert index.position(soup) == 0
+
+
+def test_index_ignores_foreign_node_with_stale_key():
+    # selectolax reuses freed mem_ids, so a node of a reparsed fragment can
+    # carry the key of an indexed (since destroyed) hidden element.
+    soup = utils.make_soup(HTML)
+    index = DocumentIndex(soup)
+    hidden = soup.css_first('div[style="DISPLAY:NONE"]')
+    clone = reparse_fragment(soup.css_first("div.g"))
+    index.positions[clone.mem_id] = index.position(hidden)
+    assert index.position(clone) is None
+    assert index.span(clone) is None
+    assert index.is_hidden(clone) is None
+    assert index.subtree(clone) is None
+
+
+def test_parse_serp_matches_unindexed_pipeline(monkeypatch):
+    indexed = ws.parse_serp(HTML)
+    monkeypatch.setattr(DocumentIndex, "subtree", lambda self, node: None)
+    monkeypatch.setattr(DocumentIndex, "is_hidden", lambda self, node: None)
+    assert ws.parse_serp(HTML) == indexed
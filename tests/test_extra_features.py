@@ -0,0 +1,160 @@
+"""Tests for user-registered SERP features"""
+
+import re
+
+import pytest
+
+import WebSearcher as ws
+from WebSearcher._document_index import DocumentIndex
+from WebSearcher.extractors import extra_features
+from WebSearcher.extractors.extractor_serp_features import FeatureExtractor
+
+SERP = (
+    '<html lang="en"><body>'
+    "<script>window.kno_fiu = 1; /* marker-v2 */</script>"
+    '<div id="rso">'
+    '<div class="g" data-kind="ad"><a href="https://a.example"><h3>A</h3></a></div>'
+    '<div class="g"><a href="https://b.example"><h3>B</h3></a></div>'
+    "</div></body></html>"
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    saved = dict(extra_features.EXTRA_FEATURES)
+    extra_features.EXTRA_FEATURES.clear()
+    yield
+    extra_features.EXTRA_FEATURES.clear()
+    extra_features.EXTRA_FEATURES.update(saved)
+
+
+def register_all():
+    ws.register_feature("has_kno", pattern=r"kno_fiu")
+    ws.register_feature("marker_version", pattern=r"marker-v(\d+)", value="first")
+    ws.register_feature("n_markers", pattern=r"marker", value="count")
+    ws.register_feature("n_results", css="div.g", value="count")
+    ws.register_feature("first_title", css="h3", value="first")
+    ws.register_feature("has_rhs", css="#rhs")
+    ws.register_feature("n_ads", func=lambda soup, index: len(soup.css('[data-kind="ad"]')))
+
+
+EXPECTED = {
+    "has_kno": True,
+    "marker_version": "2",
+    "n_markers": 1,
+    "n_results": 2,
+    "first_title": "A",
+    "has_rhs": False,
+    "n_ads": 1,
+}
+
+
+def test_no_registrations_leave_features_unchanged():
+    features = ws.parse_serp(SERP)["features"]
+    assert "extra" not in features
+
+
+def test_registered_features_land_in_extra():
+    register_all()
+    assert ws.parse_serp(SERP)["features"]["extra"] == EXPECTED
+
+
+def test_bytes_and_node_inputs_match():
+    register_all()
+    assert FeatureExtractor.extract_features(SERP.encode()).extra == EXPECTED
+    assert FeatureExtractor.extract_features(ws.make_soup(SERP)).extra == EXPECTED
+
+
+def test_non_ascii_pattern_on_bytes():
+    ws.register_feature("accent", pattern="café", value="count")
+    html = SERP.replace("A</h3>", "café</h3>")
+    assert FeatureExtractor.extract_features(html.encode()).extra == {"accent": 1}
+
+
+def test_str_and_bytes_agree_on_non_ascii_text():
+    ws.register_feature("word", pattern=r"caf\w+", value="first")
+    ws.register_feature("any_char", pattern=r"caf(.)", value="first")
+    ws.register_feature("n_chars", pattern=r"[^<>]", value="count")
+    ws.register_feature("folded", pattern=re.compile("20k", re.IGNORECASE))  # the Kelvin sign
+    html = SERP.replace("A</h3>", "cafés 20\u212a</h3>")
+    from_str = FeatureExtractor.extract_features(html).extra
+    assert from_str["word"] == "cafés" and from_str["any_char"] == "é"
+    assert from_str["folded"] is True
+    assert FeatureExtractor.extract_features(html.encode()).extra == from_str
+
+
+def test_bytes_twin_only_for_safe_patterns():
+    def twin(pattern, flags=0):
+        return extra_features._bytes_twin(re.compile(pattern, flags)) is not None
+
+    assert twin(r"kno_fiu") and twin(r"marker-v[0-9]+") and twin(r"a\.b|(?:c)")
+    assert twin(r"marker-v(\d+)", re.ASCII) and twin("k", re.IGNORECASE | re.ASCII)
+    assert not twin(r"marker-v(\d+)") and not twin("k", re.IGNORECASE)
+    assert not twin("caf.") and not twin("[^<]") and not twin(r"\xe9") and not twin("café")
+
+
+def test_func_gets_document_index():
+    seen = []
+
+    def rso_position(soup, index):
+        seen.append(index)
+        return index.position(soup.css_first("#rso")) if index is not None else None
+
+    ws.register_feature("rso_position", func=rso_position)
+    extra = ws.parse_serp(SERP)["features"]["extra"]
+    assert isinstance(seen[0], DocumentIndex)
+    assert isinstance(extra["rso_position"], int)
+
+
+def test_soup_probes_see_the_unextracted_document():
+    # Extraction detaches #tads and #rhs, and parsers decompose nodes; probes
+    # must answer as a separate scan of the HTML would.
+    html = SERP.replace(
+        '<div id="rso">',
+        '<div id="tads"><div data-text-ad="1"><a href="https://ad.example">Ad</a></div></div>'
+        '<div id="rhs"><div class="kp">Panel</div></div><div id="rso">',
+    )
+    ws.register_feature("n_text_ads", css="#tads [data-text-ad]", value="count")
+    ws.register_feature("has_rhs", css="#rhs .kp")
+    ws.register_feature("n_nodes", func=lambda soup, index: len(soup.css("*")))
+    fresh = FeatureExtractor.extract_features(html).extra
+    assert fresh["n_text_ads"] == 1 and fresh["has_rhs"] is True
+    parsed = ws.parse_serp(html)
+    assert {r["type"] for r in parsed["results"]} >= {"ad"}
+    assert parsed["features"]["extra"] == fresh
+
+
+def test_failing_probe_reports_none():
+    ws.register_feature("boom", func=lambda soup, index: 1 / 0)
+    ws.register_feature("has_kno", pattern=r"kno_fiu")
+    assert ws.parse_serp(SERP)["features"]["extra"] == {"boom": None, "has_kno": True}
+
+
+def test_registration_errors():
+    with pytest.raises(ValueError, match="exactly one"):
+        ws.register_feature("x")
+    with pytest.raises(ValueError, match="exactly one"):
+        ws.register_feature("x", pattern="a", css="b")
+    with pytest.raises(ValueError, match="value"):
+        ws.register_feature("x", css="a", value="sum")  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="value"):
+        ws.register_feature("x", func=lambda soup, index: 1, value="count")
+    ws.register_feature("x", css="a")
+    with pytest.raises(ValueError, match="already registered"):
+        ws.register_feature("x", css="b")
+    ws.register_feature("x", css="b", replace=True)
+    ws.unregister_feature("x")
+    ws.unregister_feature("x")
+    assert extra_features.EXTRA_FEATURES == {}
+
+
+def test_registry_changes_parse_cache_key(tmp_path):
+    key = ws.ParseCache.key(SERP)
+    ws.register_feature("has_kno", pattern=r"kno_fiu")
+    assert ws.ParseCache.key(SERP) != key
+    with ws.ParseCache(tmp_path / "parse.sqlite") as cache:
+        first = ws.parse_serp(SERP, cache=cache)
+        assert ws.parse_serp(SERP, cache=cache) == first
+        assert first["features"]["extra"] == {"has_kno": True}
+    ws.unregister_feature("has_kno")
+    assert ws.ParseCache.key(SERP) == key
@@ -267,6 +267,39 @@ def test_features_model_dump():
     assert d["captcha"] is False
 
 
+# Bytes input ------------------------------------------------------------------
+# Bytes are scanned undecoded; every feature must match the str path.
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        '<div id="result-stats">About 1,234 results (0.42 seconds)</div>',
+        SCRIPT_STATS,
+        # Multibyte text inside the 80-char script window: a bytes window of 80
+        # would cut the time off; the widened window decodes back to 80 chars.
+        r'<script>var a="\x3cdiv id=\"result-stats\">約 ﾃｽﾄﾃｽﾄﾃｽﾄﾃｽﾄﾃｽﾄ 1,234 件の結果'
+        r'\x3cnobr> (0.31 秒)&nbsp;\x3c/nobr>";</script>',
+        '<span class="RVQdVd">More results</span><div>CAPTCHA</div>',
+        "We're sorry but it appears that there has been an internal server error "
+        "while processing your request.",
+    ],
+)
+def test_bytes_input_matches_str(body):
+    html = make_html(body, lang="ja")
+    from_str = FeatureExtractor.extract_features(html)
+    from_bytes = FeatureExtractor.extract_features(html.encode("utf-8"))
+    assert from_bytes == from_str
+
+
+def test_bytes_script_window_is_80_chars():
+    body = r'<script>var a="\x3cdiv id=\"result-stats\">' + "é" * 90 + '";</script>'
+    html = make_html(body).encode("utf-8")
+    stats = FeatureExtractor._find_result_stats_html(html)
+    assert stats == FeatureExtractor._find_result_stats_html(html.decode("utf-8"))
+    assert stats is not None and stats.endswith("é" * 80)
+
+
 # Result estimate -- captured-SERP fixtures ------------------------------------
 # Real SERPs whose #result-stats div is injected client-side (absent from the
 # static markup); the estimate is recovered from the inline <script> fallback.
@@ -284,3 +317,71 @@ def test_result_estimate_script_fallback_fixtures(fixture, expected_time):
     features = ws.parse_serp(html)["features"]
     assert features["result_estimate_count"] == 0
     assert features["result_estimate_time"] == expected_time
+
+
+# Single-pass raw-markup scan --------------------------------------------------
+# scan_html must find exactly what the per-feature searches it replaced found.
+
+
+def separate_searches(html: str) -> dict:
+    from WebSearcher.extractors import extractor_serp_features as fx
+
+    stats = fx.RX_RESULT_STATS.search(html)
+    script = fx.RX_RESULT_STATS_SCRIPT.search(html)
+    lang = fx.RX_LANGUAGE.search(html)
+    return {
+        "result_stats": stats.start() if stats else None,
+        "result_stats_script": script.start() if script and not stats else None,
+        "language": lang.start() if lang else None,
+        "server_error": html.find(fx.NOTICE_SERVER_ERROR),
+        "infinity_scroll": html.find(fx.INFINITY_SCROLL_SPAN),
+        "captcha": html.find("CAPTCHA"),
+    }
+
+
+SCAN_BODIES = [
+    "",
+    '<div id="result-stats">About 10 results (0.1 seconds)</div>',
+    # Marker without a same-line closing tag: only the script pattern matches it.
+    '<div id="result-stats">About 10\nresults</div>',
+    # Script copy ahead of the rendered div: the div still wins.
+    SCRIPT_STATS + '<div id="result-stats">About 5 results (0.2s)</div>',
+    "<style>#result-stats{}</style>" + SCRIPT_STATS,
+    '<span class="RVQdVd">More results</span><p>CAPTCHA</p>',
+    "We're sorry but it appears that there has been an internal server error "
+    "while processing your request.",
+]
+
+
+@pytest.mark.parametrize("body", SCAN_BODIES)
+@pytest.mark.parametrize("encode", [False, True])
+def test_scan_html_matches_separate_searches(body, encode):
+    from WebSearcher.extractors.extractor_serp_features import scan_html
+
+    html = make_html(body)
+    expected = {k: (None if v == -1 else v) for k, v in separate_searches(html).items()}
+    assert scan_html(html.encode("utf-8") if encode else html) == expected
+
+
+def test_scan_html_no_lang():
+    from WebSearcher.extractors.extractor_serp_features import scan_html
+
+    assert scan_html("<html><body>x</body></html>")["language"] is None
+
+
+@pytest.mark.parametrize(
+    "fixture", ["result_estimate_script_fallback_1.html", "result_estimate_script_fallback_2.html"]
+)
+def test_scan_html_fixtures(fixture):
+    from WebSearcher.extractors.extractor_serp_features import scan_html
+
+    html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8", errors="replace")
+    expected = {k: (None if v == -1 else v) for k, v in separate_searches(html).items()}
+    assert scan_html(html) == expected
+
+
+def test_captcha_from_scan():
+    assert FeatureExtractor.extract_features(make_html("<p>CAPTCHA</p>")).captcha is True
+    assert FeatureExtractor.extract_features(make_html("<p>ok</p>")).captcha is False
+    # A Node input has no raw markup to scan: the document text decides.
+    assert FeatureExtractor.extract_features(make_soup("<p>CAPTCHA</p>")).captcha is True
@@ -0,0 +1,85 @@
+"""Tests for Arrow/Parquet output of parsed results"""
+
+import orjson
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from helpers import make_serp  # noqa: E402
+
+import WebSearcher as ws  # noqa: E402
+from WebSearcher import io  # noqa: E402
+
+
+def records(n_serps: int = 3, output: str = "dict") -> list[dict]:
+    batch = [
+        {"serp_id": f"s{i}", "crawl_id": "c1", "html": make_serp(2, offset=i)}
+        for i in range(n_serps)
+    ]
+    return list(ws.parse_serps(batch, workers=1, output=output))
+
+
+def expected_rows(parsed: list[dict]) -> list[dict]:
+    rows = []
+    for record in parsed:
+        for row in record["results"]:
+            row = dict(row)
+            if row["details"] is not None:
+                row["details"] = orjson.dumps(row["details"]).decode()
+            meta = {k: record.get(k) for k in ("crawl_id", "serp_id", "version")}
+            rows.append({**row, **meta})
+    return rows
+
+
+def test_record_batch_matches_rows():
+    parsed = records()
+    parsed[0]["results"][0]["details"] = {"type": "item", "visible": False}
+    batch = io.to_record_batch(parsed)
+    assert batch.schema == io.RESULTS_SCHEMA
+    assert batch.to_pylist() == expected_rows(parsed)
+    for name in ("section", "type", "sub_type", "crawl_id", "version"):
+        assert pa.types.is_dictionary(batch.schema.field(name).type)
+
+
+def test_struct_rows_match_dict_rows():
+    assert io.to_record_batch(records(output="struct")).equals(io.to_record_batch(records()))
+
+
+def test_to_record_shape():
+    # ``SearchEngine.to_record``: metadata + features + results, no html.
+    parsed = ws.parse_serp(make_serp(2))
+    record = {"serp_id": "s1", "crawl_id": "c1", "version": "0.11.5", "qry": "q", **parsed}
+    rows = io.to_record_batch([record]).to_pylist()
+    assert [(r["serp_id"], r["version"]) for r in rows] == [("s1", "0.11.5")] * 2
+
+
+def test_parquet_row_groups(tmp_path):
+    path = tmp_path / "results.parquet"
+    parsed = records(n_serps=5)
+    assert io.write_parquet(parsed, path, row_group_size=4) == 10
+    meta = pq.ParquetFile(path).metadata
+    assert [meta.row_group(i).num_rows for i in range(meta.num_row_groups)] == [4, 4, 2]
+    table = pq.read_table(path)
+    assert table.to_pylist() == expected_rows(parsed)
+    assert pa.types.is_dictionary(table.schema.field("type").type)
+
+
+def test_writer_buffers_until_row_group(tmp_path):
+    writer = io.ParquetWriter(tmp_path / "results.parquet", row_group_size=100)
+    writer.write_all(records())
+    assert writer.n_rows == 0  # still buffered
+    writer.close()
+    writer.close()
+    assert writer.n_rows == 6
+    with pytest.raises(ValueError, match="closed"):
+        writer.write(records(1)[0])
+        writer.flush()
+
+
+def test_iter_record_batches():
+    parsed = records(n_serps=5)
+    sizes = [b.num_rows for b in io.iter_record_batches(parsed, batch_size=3)]
+    assert sizes == [4, 4, 2]  # a SERP's rows stay in one batch
+    with pytest.raises(ValueError, match="batch_size"):
+        list(io.iter_record_batches(parsed, batch_size=0))
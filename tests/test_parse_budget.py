@@ -0,0 +1,162 @@
+"""Tests for per-SERP and per-component parse time budgets"""
+
+import signal
+import threading
+import time
+
+import pytest
+
+import WebSearcher as ws
+from WebSearcher import utils
+from WebSearcher.models.data import ERR_TIMEOUT
+from WebSearcher.parsers.budget import ParseBudget, ParseTimeout, time_limit
+from WebSearcher.parsers.component import Component
+from WebSearcher.parsers.components import main_parser_dict
+
+needs_alarm = pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="no setitimer")
+
+SERP = (
+    '<html lang="en"><body>'
+    '<div id="tads"><div class="uEierd"><a href="https://ad.example">Ad</a></div></div>'
+    '<div id="rso"><div class="g"><a href="https://a.example"><h3>A</h3></a></div>'
+    '<div class="g"><a href="https://b.example"><h3>B</h3></a></div></div>'
+    "</body></html>"
+)
+
+
+def spin(elem):
+    """A parser stuck in a pure-Python loop (the quadratic-walk stand-in)."""
+    while True:
+        pass
+
+
+def comp():
+    return Component(utils.make_soup("<div>x</div>").css_first("div"), section="main", type="x")
+
+
+@needs_alarm
+def test_component_timeout_cuts_parser_off():
+    c = comp()
+    budget = ParseBudget(component_timeout=0.05)
+    start = time.monotonic()
+    c.parse_component(parser_type_func=spin, budget=budget)
+    assert time.monotonic() - start < 5
+    [row] = c.result_list
+    assert row["details"] == {"type": "item", "error": ERR_TIMEOUT}
+    assert budget.timed_out
+
+
+def test_spent_serp_budget_skips_parser():
+    def boom(elem):
+        raise AssertionError("parser ran")
+
+    budget = ParseBudget(timeout=1)
+    budget.deadline = time.monotonic() - 1
+    c = comp()
+    c.parse_component(parser_type_func=boom, budget=budget)
+    assert c.result_list[0]["details"]["error"] == ERR_TIMEOUT
+
+
+@needs_alarm
+def test_parse_serp_component_timeout(monkeypatch):
+    monkeypatch.setitem(main_parser_dict, "general", spin)
+    results = ws.parse_serp(SERP, component_timeout=0.05)["results"]
+    errors = [(r["type"], (r["details"] or {}).get("error")) for r in results]
+    assert errors == [("ad", None), ("general", ERR_TIMEOUT), ("general", ERR_TIMEOUT)]
+
+
+@needs_alarm
+def test_parse_serp_timeout_skips_remaining_components(monkeypatch):
+    calls = []
+
+    def spin_once(elem):
+        calls.append(elem)
+        spin(elem)
+
+    monkeypatch.setitem(main_parser_dict, "general", spin_once)
+    results = ws.parse_serp(SERP, timeout=0.2)["results"]
+    assert len(calls) == 1
+    assert [r["details"]["error"] for r in results if r["type"] == "general"] == [ERR_TIMEOUT] * 2
+
+
+@needs_alarm
+def test_serp_timeout_cuts_off_registered_probe(caplog):
+    later = []
+    ws.register_feature("stuck", func=lambda soup, index: spin(soup))
+    ws.register_feature("later", func=lambda soup, index: later.append(soup))
+    try:
+        start = time.monotonic()
+        with pytest.raises(ParseTimeout):
+            ws.parse_serp(SERP, timeout=0.1)
+        assert time.monotonic() - start < 5
+    finally:
+        ws.unregister_feature("stuck")
+        ws.unregister_feature("later")
+    # The timeout ends the parse; it isn't swallowed as the probe's own failure.
+    assert later == []
+    assert "failed" not in caplog.text
+
+
+@needs_alarm
+def test_budget_restores_signal_state():
+    handler = signal.getsignal(signal.SIGALRM)
+    ws.parse_serp(SERP, timeout=5, component_timeout=1)
+    assert signal.getsignal(signal.SIGALRM) is handler
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+
+
+@needs_alarm
+def test_time_limit_leaves_an_armed_timer_alone():
+    # Someone else's ITIMER_REAL is running: don't clobber it, just don't cut off.
+    previous = signal.signal(signal.SIGALRM, lambda *_: None)
+    signal.setitimer(signal.ITIMER_REAL, 60)
+    try:
+        with time_limit(0.01):
+            time.sleep(0.05)
+        assert signal.getitimer(signal.ITIMER_REAL)[0] > 0
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def test_off_main_thread_budget_is_cooperative():
+    out = {}
+
+    def run():
+        with time_limit(0.01):
+            time.sleep(0.05)
+        out["done"] = True
+
+    t = threading.Thread(target=run)
+    t.start()
+    t.join()
+    assert out == {"done": True}
+
+
+def test_timed_out_parse_not_cached(tmp_path, monkeypatch):
+    def slow(elem):
+        time.sleep(0.05)
+        return [{"type": "general"}]
+
+    monkeypatch.setitem(main_parser_dict, "general", slow)
+    with ws.ParseCache(tmp_path / "parse.sqlite") as cache:
+        ws.parse_serp(SERP, cache=cache, timeout=0.03)
+        assert len(cache) == 0
+        ws.parse_serp(SERP, cache=cache)
+        assert len(cache) == 1
+
+
+def test_invalid_budgets_rejected():
+    with pytest.raises(ValueError, match="timeout"):
+        ws.parse_serp(SERP, timeout=0)
+    with pytest.raises(ValueError, match="component_timeout"):
+        list(ws.parse_serps([SERP], workers=1, component_timeout=-1))
+
+
+def test_parse_serps_turns_serp_timeout_into_empty_parse(monkeypatch):
+    def expired(self):
+        raise ParseTimeout("parse time budget exceeded")
+
+    monkeypatch.setattr(ParseBudget, "check", expired)
+    [out] = ws.parse_serps([SERP], workers=1, timeout=5)
+    assert out == {"features": {}, "results": []}
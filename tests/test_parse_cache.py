@@ -0,0 +1,70 @@
+"""Tests for the content-addressed parse cache"""
+
+import pickle
+
+import pytest
+from helpers import make_serp
+
+import WebSearcher as ws
+from WebSearcher.parsers import cache as cache_mod
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with ws.ParseCache(tmp_path / "parse.sqlite") as c:
+        yield c
+
+
+def test_cache_hit_returns_stored_parse(cache):
+    html = make_serp(3)
+    fresh = ws.parse_serp(html, cache=cache)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 1, 1)
+    assert ws.parse_serp(html, cache=cache) == fresh
+    assert cache.hits == 1
+
+
+def test_cache_hit_skips_parsing(cache, monkeypatch):
+    html = make_serp(2)
+    ws.parse_serp(html, cache=cache)
+
+    def boom(*args, **kwargs):
+        raise AssertionError("parsed on a cache hit")
+
+    monkeypatch.setattr("WebSearcher.parsers.parse_serp.utils.make_soup", boom)
+    assert len(ws.parse_serp(html, cache=cache)["results"]) == 2
+
+
+def test_cache_key_covers_url_and_fingerprint(monkeypatch):
+    html = make_serp(1)
+    key = ws.ParseCache.key(html)
+    assert ws.ParseCache.key(html.encode()) == key
+    assert ws.ParseCache.key(html, url="https://www.google.com/sorry/index") != key
+    monkeypatch.setattr(cache_mod, "parser_fingerprint", lambda: "other-parser")
+    assert ws.ParseCache.key(html) != key
+
+
+def test_cache_bypassed_for_nodes(cache):
+    ws.parse_serp(ws.make_soup(make_serp(1)), cache=cache)
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used(cache):
+    for i in range(4):
+        cache.put(f"k{i}", {"features": {}, "results": [{"i": i}]})
+    cache.get("k0")  # refresh k0 so k1 is the oldest
+    size = len(b'{"features":{},"results":[{"i":0}]}')
+    cache.max_bytes = 3 * size
+    assert cache.evict() == 1
+    assert cache.get("k1") is None
+    assert cache.get("k0") is not None
+
+
+def test_cache_pickles_and_shares_across_workers(cache):
+    clone = pickle.loads(pickle.dumps(cache))
+    assert clone.path == cache.path and clone.max_bytes == cache.max_bytes
+    records = [{"serp_id": f"s{i}", "html": make_serp(i + 1)} for i in range(4)]
+    first = list(ws.parse_serps(records, workers=2, chunksize=1, cache=cache))
+    assert len(cache) == 4
+    again = list(ws.parse_serps(records, workers=1, cache=cache))
+    assert again == first
+    assert cache.hits == 4
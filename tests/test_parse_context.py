@@ -0,0 +1,114 @@
+"""Tests for the per-parse ParseContext"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import WebSearcher as ws
+from WebSearcher import _parse_context, _slx, utils
+from WebSearcher.extractors import Extractor
+from WebSearcher.parsers import parse_serp as parse_serp_module
+from WebSearcher.parsers.components import ai_overview
+
+UUID = "12345678-1234-1234-1234-123456789abc"
+AI_OVERVIEW = (
+    '<div class="MjjYud"><div class="Fzsovc"></div>'
+    '<div class="mZJni"><div class="Y3BBE">Answer {0}</div></div></div>'
+)
+SERP = (
+    '<html lang="en"><body><div id="rso">'
+    + AI_OVERVIEW.format(1)
+    + AI_OVERVIEW.format(2)
+    + '<div class="MjjYud"><div class="g"><a href="https://a.example"><h3>A</h3></a></div></div>'
+    + "</div>"
+    + f"<!--TgQPHd|[[null,null,&quot;{UUID}&quot;,null,null,1,0,"
+    + "&quot;https://fav&quot;,&quot;Pub&quot;,2]]-->"
+    + "</body></html>"
+)
+
+
+class RecordingContext(_parse_context.ParseContext):
+    instances: list["RecordingContext"] = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        RecordingContext.instances.append(self)
+
+
+def test_payloads_scanned_once_per_parse(monkeypatch):
+    scans = []
+    extract = ai_overview.extract_payloads
+
+    def counting(raw_html):
+        scans.append(raw_html)
+        return extract(raw_html)
+
+    monkeypatch.setattr(ai_overview, "extract_payloads", counting)
+    results = ws.parse_serp(SERP)["results"]
+    assert [r["text"] for r in results if r["type"] == "ai_overview"] == ["Answer 1", "Answer 2"]
+    assert scans == [SERP]  # two AI overviews, one scan of the raw markup
+    ws.parse_serp(SERP)
+    assert len(scans) == 2  # nothing carried over to the next parse
+
+
+def test_context_dropped_after_parse(monkeypatch):
+    RecordingContext.instances = []
+    monkeypatch.setattr(parse_serp_module, "ParseContext", RecordingContext)
+    ws.parse_serp(SERP)
+    (ctx,) = RecordingContext.instances
+    assert _parse_context.parse_context.get() is None
+    assert ctx.raw_html is None
+    assert ctx.payloads is None
+    assert ctx.texts is None
+    assert ctx.index.elements is None
+    assert ctx.index.positions  # positions outlive the parse for features
+
+
+def test_context_dropped_after_failed_parse(monkeypatch):
+    RecordingContext.instances = []
+    monkeypatch.setattr(parse_serp_module, "ParseContext", RecordingContext)
+
+    def boom(self, timer=None):
+        raise RuntimeError("extraction failed")
+
+    monkeypatch.setattr(Extractor, "extract_components", boom)
+    with pytest.raises(RuntimeError):
+        ws.parse_serp(SERP)
+    (ctx,) = RecordingContext.instances
+    assert _parse_context.parse_context.get() is None
+    assert ctx.raw_html is None
+
+
+def test_node_input_serializes_document():
+    assert ws.parse_serp(utils.make_soup(SERP)) == ws.parse_serp(SERP)
+
+
+def test_parse_in_threads_matches_serial():
+    serps = [SERP.replace("Answer", f"Answer {i}") for i in range(8)]
+    serial = [ws.parse_serp(s) for s in serps]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(ws.parse_serp, serps)) == serial
+
+
+def test_cached_text_memoized_until_release():
+    soup = utils.make_soup("<html><body><h3>Title</h3></body></html>")
+    h3 = soup.css_first("h3")
+    ctx = _parse_context.ParseContext()
+    with ctx.active():
+        assert _slx.cached_text(h3) == "Title"
+        assert ctx.texts == {(h3.mem_id, "", False): "Title"}
+        assert _slx.cached_text(h3, " ", strip=True) == "Title"
+        assert len(ctx.texts) == 2
+        ctx.release()
+        h3.decompose()
+        assert _slx.cached_text(soup.css_first("body")) == ""
+        assert ctx.texts is None
+    assert _slx.cached_text(soup) == ""
+
+
+def test_extractor_builds_its_own_context():
+    extractor = Extractor(utils.make_soup(SERP))
+    extractor.extract_components()
+    assert extractor.index is extractor.context.index
+    assert extractor.index.elements
+    assert [c.section for c in extractor.components] == ["main"] * 3
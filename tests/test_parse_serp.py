@@ -6,6 +6,7 @@ from pathlib import Path
 
 import orjson
 import pytest
+from helpers import make_serp
 from syrupy.extensions.json import JSONSnapshotExtension
 
 import WebSearcher as ws
@@ -210,3 +211,202 @@ def test_features_expose_main_layout(all_parsed_serps):
         assert layout is None or isinstance(layout, str)
         seen.add(layout)
     assert {"standard", "standard-overview", "standard-airfares"} <= seen
+
+
+# ---------------------------------------------------------------------------
+# Batch parsing
+# ---------------------------------------------------------------------------
+
+
+BATCH_RECORDS = [
+    {"serp_id": f"s{i}", "crawl_id": "c0", "qry": f"q{i}", "html": make_serp(i + 1)}
+    for i in range(5)
+]
+
+
+def test_parse_serps_in_process_matches_parse_serp():
+    out = list(ws.parse_serps(BATCH_RECORDS, workers=1, chunksize=2))
+    assert [o["serp_id"] for o in out] == [r["serp_id"] for r in BATCH_RECORDS]
+    for o, r in zip(out, BATCH_RECORDS):
+        assert set(o) == {"serp_id", "crawl_id", "features", "results"}
+        assert o["crawl_id"] == "c0"
+        assert {"features": o["features"], "results": o["results"]} == ws.parse_serp(r["html"])
+
+
+def test_parse_serps_pool_ordered():
+    out = list(ws.parse_serps(BATCH_RECORDS, workers=2, chunksize=1))
+    assert [o["serp_id"] for o in out] == [r["serp_id"] for r in BATCH_RECORDS]
+    assert [len(o["results"]) for o in out] == [1, 2, 3, 4, 5]
+
+
+def test_parse_serps_pool_unordered_covers_all():
+    out = list(ws.parse_serps(BATCH_RECORDS, workers=2, chunksize=2, ordered=False))
+    assert sorted(o["serp_id"] for o in out) == [r["serp_id"] for r in BATCH_RECORDS]
+
+
+def test_parse_serps_accepts_html_strings_and_url():
+    sorry_url = "https://www.google.com/sorry/index?continue=x"
+    out = list(ws.parse_serps([make_serp(1), {"html": "", "url": sorry_url}], workers=1))
+    assert "serp_id" not in out[0]
+    assert out[0]["features"]["language"] == "en"
+    assert out[1]["features"]["captcha"] is True
+
+
+def test_parse_serps_is_lazy():
+    """Only the chunks needed for the first yield are pulled from the input."""
+    pulled = []
+
+    def gen():
+        for r in BATCH_RECORDS:
+            pulled.append(r["serp_id"])
+            yield r
+
+    first = next(ws.parse_serps(gen(), workers=1, chunksize=2))
+    assert first["serp_id"] == "s0"
+    assert pulled == ["s0", "s1"]
+
+
+def test_parse_serps_rejects_bad_chunksize():
+    with pytest.raises(ValueError):
+        list(ws.parse_serps(BATCH_RECORDS, chunksize=0))
+
+
+# ---------------------------------------------------------------------------
+# Stage timings
+# ---------------------------------------------------------------------------
+
+
+def test_parse_serp_timings_opt_in():
+    html = make_serp(3)
+    plain = ws.parse_serp(html)
+    timed = ws.parse_serp(html, timings=True)
+    assert "timings" not in plain
+    assert {"features": timed["features"], "results": timed["results"]} == plain
+
+    t = timed["timings"]
+    assert set(t) == {"make_soup", "extract", "classify", "parse", "export", "features", "total"}
+    assert set(t["extract"]) == {"index", "rhs", "header", "main", "footer", "reorder"}
+    assert set(t["parse"]) == {r["type"] for r in plain["results"]}
+    assert all(v >= 0 for v in t["parse"].values())
+    stages = t["make_soup"] + sum(t["extract"].values()) + t["classify"]
+    stages += sum(t["parse"].values()) + t["export"] + t["features"]
+    assert stages <= t["total"]
+
+
+def test_parse_serp_timings_cache_hit(tmp_path):
+    html = make_serp(1)
+    with ws.ParseCache(tmp_path / "parse.sqlite") as cache:
+        ws.parse_serp(html, cache=cache, timings=True)
+        hit = ws.parse_serp(html, cache=cache, timings=True)
+        assert set(hit["timings"]) == {"cache", "total"}
+        assert "timings" not in ws.parse_serp(html, cache=cache)
+
+
+# ---------------------------------------------------------------------------
+# Selective parsing
+# ---------------------------------------------------------------------------
+
+SELECTIVE_SERP = (
+    '<html lang="en"><body>'
+    '<div id="tads"><div class="uEierd"><a href="https://ad.example">Ad</a></div></div>'
+    '<div id="rso"><div class="g"><a href="https://a.example"><h3>A</h3></a></div>'
+    '<div class="g"><a href="https://b.example"><h3>B</h3></a></div></div>'
+    "</body></html>"
+)
+
+
+def test_parse_serp_selective_types():
+    full = ws.parse_serp(SELECTIVE_SERP)
+    general = ws.parse_serp(SELECTIVE_SERP, types={"general"})
+    expected = [r for r in full["results"] if r["type"] == "general"]
+    assert [r["type"] for r in full["results"]][0] == "ad"
+    assert [{**r, "serp_rank": 0} for r in general["results"]] == [
+        {**r, "serp_rank": 0} for r in expected
+    ]
+    assert [r["serp_rank"] for r in general["results"]] == list(range(len(expected)))
+    assert general["features"] == full["features"]
+
+
+def test_parse_serp_selective_sections_and_no_features():
+    out = ws.parse_serp(SELECTIVE_SERP, sections="footer", features=False)
+    assert out == {"features": {}, "results": []}
+
+
+def test_parse_serp_selective_rejects_unknown_names():
+    with pytest.raises(ValueError, match="types"):
+        ws.parse_serp(SELECTIVE_SERP, types={"nope"})
+    with pytest.raises(ValueError, match="sections"):
+        list(ws.parse_serps([SELECTIVE_SERP], workers=1, sections={"sidebar"}))
+
+
+def test_parse_serps_selective_passthrough():
+    [out] = ws.parse_serps([SELECTIVE_SERP], workers=1, types=["ad"], features=False)
+    assert [r["type"] for r in out["results"]] == ["ad"]
+    assert out["features"] == {}
+
+
+def test_parse_serp_selective_bypasses_cache(tmp_path):
+    with ws.ParseCache(tmp_path / "parse.sqlite") as cache:
+        ws.parse_serp(SELECTIVE_SERP, cache=cache, types={"general"})
+        assert len(cache) == 0
+
+
+def test_classify_serp_matches_parse_types():
+    types = ws.classify_serp(SELECTIVE_SERP)
+    rows = ws.parse_serp(SELECTIVE_SERP)["results"]
+    assert types == [("main", 0, "ad"), ("main", 1, "general"), ("main", 2, "general")]
+    assert {(r["section"], r["cmpt_rank"], r["type"]) for r in rows} == set(types)
+
+
+def test_classify_serp_skips_parsers(monkeypatch):
+    def boom(self, *args, **kwargs):
+        raise AssertionError("parser ran")
+
+    monkeypatch.setattr("WebSearcher.parsers.component.Component.parse_component", boom)
+    assert [t for _, _, t in ws.classify_serp(SELECTIVE_SERP)] == ["ad", "general", "general"]
+
+
+def test_parse_serp_bytes_matches_str():
+    # Bytes are parsed and scanned without a decode pass; output is identical.
+    html = SELECTIVE_SERP.replace("</body>", "<p>caf\u00e9 \u7d04</p></body>")
+    assert ws.parse_serp(html.encode("utf-8")) == ws.parse_serp(html)
+    assert ws.classify_serp(html.encode("utf-8")) == ws.classify_serp(html)
+
+
+# Block-page gate ---------------------------------------------------------------
+
+SORRY_FIXTURE = FIXTURES_DIR / "sorry_index.html"
+SORRY_URL = "https://www.google.com/sorry/index?continue=https://www.google.com/search%3Fq%3Dtest"
+
+
+@pytest.mark.parametrize(
+    "html,url",
+    [
+        ("", None),
+        ("  \n", None),
+        (b"", None),
+        ("", SORRY_URL),
+        (SORRY_FIXTURE.read_text(encoding="utf-8"), None),
+        (SORRY_FIXTURE.read_bytes(), SORRY_URL),
+    ],
+)
+def test_parse_serp_blocked_matches_full_parse(html, url):
+    assert ws.parse_serp(html, url=url) == ws.parse_serp(html, url=url, skip_blocked=False)
+
+
+def test_parse_serp_blocked_skips_dom(monkeypatch):
+    def boom(*args, **kwargs):
+        raise AssertionError("DOM built")
+
+    monkeypatch.setattr("WebSearcher.parsers.parse_serp.utils.make_soup", boom)
+    parsed = ws.parse_serp(SORRY_FIXTURE.read_text(encoding="utf-8"), timings=True)
+    assert parsed["features"]["captcha"] is True
+    assert parsed["results"] == []
+    assert set(parsed["timings"]) == {"gate", "total"}
+
+
+def test_parse_serp_captcha_topic_not_blocked():
+    # A results page that mentions CAPTCHAs is parsed in full.
+    html = SELECTIVE_SERP.replace("</body>", "<p>What is a CAPTCHA?</p></body>")
+    parsed = ws.parse_serp(html)
+    assert parsed["results"]
@@ -0,0 +1,141 @@
+"""Tests for the resumable streaming reparse command"""
+
+import bz2
+
+import orjson
+import pytest
+from helpers import make_serp
+
+import WebSearcher as ws
+from WebSearcher import reparse, utils
+from WebSearcher.blobs import BlobStore
+
+RECORDS = [
+    {
+        "serp_id": f"s{i}",
+        "crawl_id": "c0",
+        "qry": f"q{i}",
+        "version": "0.0.1",
+        "html": make_serp(i + 1),
+    }
+    for i in range(5)
+]
+
+
+@pytest.fixture
+def crawl_file(tmp_path):
+    fp = tmp_path / "serps.json.bz2"
+    fp.write_bytes(bz2.compress(b"".join(orjson.dumps(r) + b"\n" for r in RECORDS)))
+    return fp
+
+
+def test_reparse_writes_merged_records(crawl_file, tmp_path):
+    out = tmp_path / "records.json"
+    assert reparse.reparse(crawl_file, out, workers=1) == len(RECORDS)
+    rows = utils.read_lines(out)
+    assert [r["serp_id"] for r in rows] == [r["serp_id"] for r in RECORDS]
+    for row, record in zip(rows, RECORDS):
+        assert "html" not in row
+        assert row["qry"] == record["qry"]
+        assert row["version"] == "0.0.1"
+        assert row["ws_version"] == ws.__version__
+        assert row["results"] == ws.parse_serp(record["html"])["results"]
+    state = reparse.load_checkpoint(reparse.checkpoint_path(out))
+    assert state["serp_id"] == "s4" and state["records"] == len(RECORDS)
+    assert state["offset"] == out.stat().st_size
+
+
+def test_reparse_resumes_from_checkpoint(crawl_file, tmp_path):
+    out = tmp_path / "records.json"
+    reparse.reparse(crawl_file, out, workers=1)
+    lines = out.read_bytes().splitlines(keepends=True)
+
+    # Simulate a kill after record 2 was checkpointed and record 3 was written.
+    offset = len(b"".join(lines[:2]))
+    out.write_bytes(b"".join(lines[:3]))
+    ckpt = reparse.checkpoint_path(out)
+    reparse.save_checkpoint(ckpt, {"serp_id": "s1", "records": 2, "offset": offset})
+
+    assert reparse.reparse(crawl_file, out, workers=1) == 3
+    assert [r["serp_id"] for r in utils.read_lines(out)] == [r["serp_id"] for r in RECORDS]
+    # A finished job rerun is a no-op.
+    assert reparse.reparse(crawl_file, out, workers=1) == 0
+
+
+def test_reparse_checkpoint_mismatch(crawl_file, tmp_path):
+    out = tmp_path / "records.json"
+    out.write_bytes(b"")
+    reparse.save_checkpoint(
+        reparse.checkpoint_path(out), {"serp_id": "other", "records": 2, "offset": 0}
+    )
+    with pytest.raises(ValueError, match="checkpoint mismatch"):
+        reparse.reparse(crawl_file, out, workers=1)
+
+
+@pytest.mark.parametrize("damage", ["deleted", "shortened"])
+def test_reparse_refuses_resume_without_output(crawl_file, tmp_path, damage):
+    out = tmp_path / "records.json"
+    reparse.reparse(crawl_file, out, workers=1)
+    if damage == "deleted":
+        out.unlink()
+    else:
+        out.write_bytes(out.read_bytes()[:10])
+    with pytest.raises(ValueError, match="can't resume"):
+        reparse.reparse(crawl_file, out, workers=1)
+    assert not out.exists() or out.stat().st_size == 10
+    assert reparse.reparse(crawl_file, out, workers=1, overwrite=True) == len(RECORDS)
+
+
+def test_reparse_overwrite_discards_checkpoint(crawl_file, tmp_path, monkeypatch):
+    out = tmp_path / "records.json"
+    reparse.reparse(crawl_file, out, workers=1)
+
+    def crash(*args, **kwargs):
+        raise KeyboardInterrupt
+        yield
+
+    monkeypatch.setattr(reparse, "parse_serps", crash)
+    with pytest.raises(KeyboardInterrupt):
+        reparse.reparse(crawl_file, out, workers=1, overwrite=True)
+    assert not reparse.checkpoint_path(out).exists()
+    with pytest.raises(FileExistsError):  # not resumed from the old offsets
+        reparse.reparse(crawl_file, out, workers=1)
+
+
+def test_reparse_refuses_existing_output(crawl_file, tmp_path):
+    out = tmp_path / "records.json"
+    out.write_bytes(b'{"stale": true}\n')
+    with pytest.raises(FileExistsError):
+        reparse.reparse(crawl_file, out, workers=1)
+    assert reparse.reparse(crawl_file, out, workers=1, overwrite=True) == len(RECORDS)
+    assert len(utils.read_lines(out)) == len(RECORDS)
+
+
+def test_reparse_requires_json_output(crawl_file, tmp_path):
+    with pytest.raises(ValueError):
+        reparse.reparse(crawl_file, tmp_path / "records.json.bz2", workers=1)
+
+
+def test_reparse_main(crawl_file, tmp_path, capsys):
+    out = tmp_path / "records.json"
+    reparse.main([str(crawl_file), str(out), "--workers", "1", "--checkpoint-every", "2"])
+    assert "reparsed 5 records" in capsys.readouterr().out
+
+
+def test_reparse_from_blob_store(crawl_file, tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    hashed = tmp_path / "serps_hashed.json"
+    utils.write_lines(
+        [
+            {**{k: v for k, v in r.items() if k != "html"}, "html_hash": store.put(r["html"])}
+            for r in RECORDS
+        ],
+        hashed,
+    )
+    expected = tmp_path / "expected.json"
+    reparse.reparse(crawl_file, expected, workers=1)
+    out = tmp_path / "records.json"
+    reparse.main([str(hashed), str(out), "--workers", "1", "--blob-dir", str(store.root)])
+    rows = utils.read_lines(out)
+    assert [r.pop("html_hash") for r in rows] == [utils.hash_id(r["html"]) for r in RECORDS]
+    assert rows == utils.read_lines(expected)
@@ -0,0 +1,54 @@
+"""Tests for parse_serp(output="struct") result records"""
+
+import pickle
+
+import orjson
+import pytest
+from helpers import make_serp
+
+import WebSearcher as ws
+from WebSearcher.models.data import BaseResult, ResultRecord
+
+
+def test_fields_follow_dict_rows():
+    fields = list(ResultRecord.__dataclass_fields__)
+    assert fields == ["section", "cmpt_rank", *BaseResult.model_fields, "serp_rank"]
+    assert not hasattr(ResultRecord(*range(len(fields))), "__dict__")
+
+
+def test_struct_rows_match_dict_rows():
+    html = make_serp(3)
+    as_dicts = ws.parse_serp(html)
+    as_structs = ws.parse_serp(html, output="struct")
+    assert all(isinstance(r, ResultRecord) for r in as_structs["results"])
+    assert [r.to_dict() for r in as_structs["results"]] == as_dicts["results"]
+    assert as_structs["features"] == as_dicts["features"]
+    assert orjson.dumps(as_structs) == orjson.dumps(as_dicts)
+
+
+def test_to_dict_shares_values():
+    row = ws.parse_serp(make_serp(1), output="struct")["results"][0]
+    row.details = {"type": "item"}
+    assert row.to_dict()["details"] is row.details
+
+
+def test_cache_hit_returns_records(tmp_path):
+    html = make_serp(2)
+    with ws.ParseCache(tmp_path / "parse.sqlite") as cache:
+        fresh = ws.parse_serp(html, cache=cache, output="struct")
+        hit = ws.parse_serp(html, cache=cache, output="struct")
+        assert hit == fresh
+        assert ws.parse_serp(html, cache=cache) == ws.parse_serp(html)
+
+
+def test_parse_serps_passthrough():
+    out = list(ws.parse_serps([make_serp(2)], workers=1, output="struct"))
+    assert [type(r) for r in out[0]["results"]] == [ResultRecord, ResultRecord]
+    assert pickle.loads(pickle.dumps(out[0]["results"])) == out[0]["results"]
+
+
+def test_unknown_output():
+    with pytest.raises(ValueError, match="unknown output"):
+        ws.parse_serp(make_serp(1), output="tuple")
+    with pytest.raises(ValueError, match="unknown output"):
+        list(ws.parse_serps([make_serp(1)], workers=1, output="tuple"))
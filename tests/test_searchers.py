@@ -1,9 +1,14 @@
 """Tests for SearchEngine record building and saving (to_record / save_record)"""
 
 import logging
+from unittest.mock import ANY
 
 import orjson
+import pytest
 
+from WebSearcher import utils
+from WebSearcher.blobs import BlobStore
+from WebSearcher.models.configs import SearchConfig, WriterConfig
 from WebSearcher.models.data import ParsedSERP
 from WebSearcher.searchers import SearchEngine
 
@@ -34,15 +39,34 @@ PARSED = ParsedSERP(
 )
 
 
-def make_engine(serp: dict, parsed: ParsedSERP) -> SearchEngine:
+ENGINES: list[SearchEngine] = []
+
+
+class FakeSearcher:
+    def cleanup(self) -> bool:
+        return True
+
+
+def make_engine(serp: dict, parsed: ParsedSERP, writer_config: dict = {}) -> SearchEngine:
     """Construct a SearchEngine without starting a driver (bypass __init__)."""
     se = SearchEngine.__new__(SearchEngine)
     se.serp = serp
     se.parsed = parsed
     se.log = logging.getLogger("test_searchers")
+    se.config = SearchConfig(writer=WriterConfig.create(writer_config))
+    se.writers = {}
+    se.searcher = FakeSearcher()
+    ENGINES.append(se)
     return se
 
 
+@pytest.fixture(autouse=True)
+def close_engine_writers():
+    yield
+    while ENGINES:
+        ENGINES.pop().close_writers()
+
+
 # to_record -------------------------------------------------------------------
 
 
@@ -130,3 +154,51 @@ def test_save_record_writes_metadata_only_line_when_unparsed(tmp_path):
     assert loaded["serp_id"] == "abc123"
     assert loaded["features"] == {}
     assert loaded["results"] == []
+
+
+# Buffered writers -------------------------------------------------------------
+
+
+def test_save_methods_share_one_open_writer_per_file(tmp_path):
+    fp = tmp_path / "records.json"
+    se = make_engine(SERP, PARSED, {"flush_every": 10})
+    for _ in range(3):
+        se.save_record(append_to=fp)
+        se.save_record(append_to=str(fp))
+    assert list(se.writers) == [fp.absolute()]
+    assert not fp.exists()  # buffered
+    assert se.close() is True
+    assert se.writers == {}
+    assert utils.read_lines(fp) == [se.to_record()] * 6
+
+
+def test_context_exit_flushes_writers(tmp_path):
+    se = make_engine(SERP, PARSED, {"flush_every": 100})
+    with se:
+        se.save_serp(append_to=tmp_path / "serps.json")
+        se.save_results(save_dir=tmp_path)
+    assert utils.read_lines(tmp_path / "serps.json") == [SERP]
+    assert len(utils.read_lines(tmp_path / "results.json")) == len(PARSED.results)
+
+
+def test_save_to_compressed_files(tmp_path):
+    pytest.importorskip("zstandard")
+    se = make_engine(SERP, PARSED)
+    with se:
+        for _ in range(2):
+            se.save_serp(append_to=tmp_path / "serps.json.zst")
+            se.save_results(append_to=tmp_path / "results.json.gz")
+    assert utils.read_lines(tmp_path / "serps.json.zst") == [SERP, SERP]
+    assert len(utils.read_lines(tmp_path / "results.json.gz")) == 2 * len(PARSED.results)
+
+
+def test_save_serp_to_blob_store(tmp_path):
+    se = make_engine(SERP, PARSED)
+    with se:
+        se.save_serp(append_to=tmp_path / "serps.json", blob_dir=tmp_path / "blobs")
+        se.save_serp(append_to=tmp_path / "serps.json", blob_dir=tmp_path / "blobs")
+    records = utils.read_lines(tmp_path / "serps.json")
+    assert records == [{**{k: v for k, v in SERP.items() if k != "html"}, "html_hash": ANY}] * 2
+    store = BlobStore(tmp_path / "blobs")
+    assert list(store.with_html(records)) == [{**SERP, "html_hash": records[0]["html_hash"]}] * 2
+    assert len(list((tmp_path / "blobs").rglob("*.html.br"))) == 1
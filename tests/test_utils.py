@@ -1,12 +1,21 @@
 """Tests for utility functions"""
 
+import gc
 import hashlib
+import importlib.util
+import sys
 from pathlib import Path
 
+import pytest
 from selectolax.lexbor import LexborNode as Node
 
 from WebSearcher import utils
 
+needs_zstd = pytest.mark.skipif(
+    importlib.util.find_spec("zstandard") is None, reason="zstandard not installed"
+)
+ZST = pytest.param(".zst", marks=needs_zstd)
+
 # hash_id ----------------------------------------------------------------------
 
 
@@ -72,6 +81,20 @@ def test_has_captcha_sorry_fixture():
     assert utils.has_captcha(soup) is True
 
 
+# is_blocked -------------------------------------------------------------------
+
+
+def test_is_blocked():
+    sorry_html = (Path(__file__).parent / "fixtures" / "sorry_index.html").read_text()
+    assert utils.is_blocked(sorry_html) is True
+    assert utils.is_blocked(sorry_html.encode()) is True
+    assert utils.is_blocked("") is True
+    assert utils.is_blocked(b" \n") is True
+    assert utils.is_blocked("<html><body>Solve a CAPTCHA</body></html>") is False
+    assert utils.is_blocked("<html></html>", url="https://www.google.com/sorry/index") is True
+    assert utils.is_blocked("<html></html>", url="https://www.google.com/search?q=x") is False
+
+
 # is_sorry_redirect ------------------------------------------------------------
 
 SORRY_URL = (
@@ -213,6 +236,173 @@ def test_read_lines_accepts_path_object(tmp_path):
     assert result == [{"x": 1}]
 
 
+def test_iter_lines_compressed(tmp_path):
+    import bz2
+    import gzip
+
+    data = [{"a": 1}, {"b": 2}]
+    payload = b'{"a": 1}\n{"b": 2}\n'
+    for suffix, compress in ((".bz2", bz2.compress), (".gz", gzip.compress)):
+        fp = tmp_path / f"data.json{suffix}"
+        fp.write_bytes(compress(payload))
+        assert utils.is_json_lines(fp)
+        assert list(utils.iter_lines(fp)) == data
+
+
+def test_iter_lines_is_lazy(tmp_path):
+    fp = tmp_path / "data.json"
+    utils.write_lines([{"i": i} for i in range(3)], fp)
+    it = utils.iter_lines(fp)
+    assert next(it) == {"i": 0}
+    assert list(it) == [{"i": 1}, {"i": 2}]
+
+
+def test_is_json_lines():
+    assert utils.is_json_lines("serps.json")
+    assert utils.is_json_lines("serps.json.gz")
+    assert utils.is_json_lines("serps.json.zst")
+    assert utils.is_json_lines("serps.json.br")
+    assert not utils.is_json_lines("serps.txt")
+    assert not utils.is_json_lines("serps.txt.bz2")
+
+
+@pytest.mark.parametrize("suffix", [".gz", ZST, ".br", ".bz2"])
+def test_write_lines_compressed_round_trip(tmp_path, suffix):
+    data = [{"html": "<html>" + "x" * 1000 + "</html>", "i": i} for i in range(50)]
+    plain = tmp_path / "serps.json"
+    utils.write_lines(data, plain)
+    fp = tmp_path / f"serps.json{suffix}"
+    utils.write_lines(data, fp)
+    assert utils.read_lines(fp) == data
+    assert fp.stat().st_size < plain.stat().st_size // 10
+    utils.write_lines(["a", "b"], tmp_path / f"lines.txt{suffix}")
+    assert utils.read_lines(tmp_path / f"lines.txt{suffix}") == ["a", "b"]
+
+
+@pytest.mark.parametrize("suffix", [".gz", ZST, ".bz2"])
+def test_write_lines_compressed_append(tmp_path, suffix):
+    fp = tmp_path / f"data.json{suffix}"
+    utils.write_lines([{"a": 1}], fp)
+    utils.write_lines([{"b": 2}], fp)  # a second member / frame / stream
+    assert utils.read_lines(fp) == [{"a": 1}, {"b": 2}]
+    utils.write_lines([{"c": 3}], fp, overwrite=True)
+    assert utils.read_lines(fp) == [{"c": 3}]
+
+
+def test_zstandard_missing(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    with pytest.raises(ImportError, match=r"WebSearcher\[zstd\]"):
+        utils.write_lines([{"a": 1}], tmp_path / "data.json.zst")
+    assert not (tmp_path / "data.json.zst").exists()
+
+
+def test_write_lines_brotli_no_append(tmp_path):
+    fp = tmp_path / "data.json.br"
+    utils.write_lines([{"a": 1}], fp)
+    with pytest.raises(ValueError, match="brotli"):
+        utils.write_lines([{"b": 2}], fp)
+    utils.write_lines([{"b": 2}], fp, overwrite=True)
+    assert utils.read_lines(fp) == [{"b": 2}]
+
+
+def test_read_lines_truncated_brotli(tmp_path):
+    fp = tmp_path / "data.json.br"
+    utils.write_lines([{"i": i} for i in range(100)], fp)
+    fp.write_bytes(fp.read_bytes()[:-4])
+    with pytest.raises(EOFError):
+        utils.read_lines(fp)
+
+
+# RecordWriter ----------------------------------------------------------------
+
+
+def test_record_writer_matches_write_lines(tmp_path):
+    data = [{"a": 1}, {"b": [2, 3]}]
+    utils.write_lines(data, tmp_path / "expected.json")
+    utils.write_lines(["x", "y"], tmp_path / "expected.txt")
+    with utils.RecordWriter(tmp_path / "data.json") as writer:
+        writer.write_many(data)
+    with utils.RecordWriter(tmp_path / "data.txt") as writer:
+        writer.write_many(["x", "y"])
+    for name in ("json", "txt"):
+        expected = (tmp_path / f"expected.{name}").read_bytes()
+        assert (tmp_path / f"data.{name}").read_bytes() == expected
+
+
+def test_record_writer_buffers_by_count(tmp_path):
+    fp = tmp_path / "data.json"
+    writer = utils.RecordWriter(fp, flush_every=3, flush_interval=3600)
+    writer.write({"i": 0})
+    writer.write({"i": 1})
+    assert not fp.exists()  # nothing written (or even opened) yet
+    writer.write({"i": 2})
+    assert utils.read_lines(fp) == [{"i": 0}, {"i": 1}, {"i": 2}]
+    writer.write({"i": 3})
+    writer.close()
+    assert len(utils.read_lines(fp)) == 4
+    writer.write({"i": 4})  # reopens and appends
+    writer.close()
+    assert utils.read_lines(fp)[-1] == {"i": 4}
+
+
+def test_record_writer_flushes_by_interval(tmp_path, monkeypatch):
+    fp = tmp_path / "data.json"
+    now = [100.0]
+    monkeypatch.setattr(utils.time, "monotonic", lambda: now[0])
+    with utils.RecordWriter(fp, flush_every=100, flush_interval=5.0) as writer:
+        writer.write({"i": 0})
+        assert not fp.exists()
+        now[0] += 5.0
+        writer.write({"i": 1})
+        assert len(utils.read_lines(fp)) == 2
+
+
+def test_record_writer_fsync_policy(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(utils.os, "fsync", synced.append)
+    with utils.RecordWriter(tmp_path / "a.json", fsync="flush") as writer:
+        writer.write_many([{"i": 0}, {"i": 1}])
+    assert len(synced) == 2
+    synced.clear()
+    with utils.RecordWriter(tmp_path / "b.json", fsync="close") as writer:
+        writer.write_many([{"i": 0}, {"i": 1}])
+    assert len(synced) == 1
+    with pytest.raises(ValueError, match="fsync"):
+        utils.RecordWriter(tmp_path / "c.json", fsync="always")
+    with pytest.raises(ValueError, match="flush_every"):
+        utils.RecordWriter(tmp_path / "c.json", flush_every=0)
+
+
+@pytest.mark.parametrize("suffix", [".gz", ZST, ".br"])
+def test_record_writer_compressed_stream(tmp_path, suffix):
+    fp = tmp_path / f"data.json{suffix}"
+    writer = utils.RecordWriter(fp)
+    writer.write({"i": 0})
+    writer.write({"i": 1})
+    size = fp.stat().st_size  # flushed, but the stream is still open
+    writer.write({"i": 2})
+    assert fp.stat().st_size > size
+    writer.close()
+    assert utils.read_lines(fp) == [{"i": 0}, {"i": 1}, {"i": 2}]
+
+
+def test_unclosed_record_writer_closed_on_collection(tmp_path, caplog):
+    for suffix in (".gz", ".bz2"):
+        fp = tmp_path / f"data.json{suffix}"
+        writer = utils.RecordWriter(fp, flush_every=2)
+        writer.write_many([{"i": 0}, {"i": 1}, {"i": 2}])  # {"i": 2} still buffered
+        del writer
+        gc.collect()
+        assert utils.read_lines(fp) == [{"i": 0}, {"i": 1}, {"i": 2}]
+    assert "was not closed" in caplog.text
+    caplog.clear()
+    with utils.RecordWriter(tmp_path / "closed.json.gz") as writer:
+        writer.write({"i": 0})
+    del writer
+    gc.collect()
+    assert "was not closed" not in caplog.text
+
+
 # load_html / load_soup -------------------------------------------------------
 
 